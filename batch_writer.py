@@ -0,0 +1,106 @@
+"""
+Streaming batch-file writer.
+
+Batch files are written by the scraping worker as soon as every chapter of a
+batch is resolved (scraped or given up on), instead of building all of them
+from memory at the end. Files are written to a temporary name and renamed into
+place, so a batch file is never left half-written. Only the chapters of batches
+that are still open are held in memory; a batch that has to be rewritten later
+(e.g. a retry filled a gap) is rebuilt from the job journal.
+"""
+import os
+import re
+import threading
+
+# Marks a resolved chapter whose text is read back from the journal at write time
+JOURNALED = object()
+
+
+class BatchFileWriter:
+    """Collects resolved chapters per batch and writes each batch file once it is complete."""
+
+    def __init__(self, start_chapter, end_chapter, batch_size, output_directory, journal):
+        self.start_chapter = start_chapter
+        self.end_chapter = end_chapter
+        self.batch_size = batch_size
+        self.output_directory = output_directory
+        self.journal = journal
+        self._pending = {} # {batch_start: {chapter: (title, content) | JOURNALED | None}}
+        self._written = {} # {batch_start: filepath} of batch files on disk
+        self._lock = threading.Lock()
+
+    def batch_bounds(self, chapter_num):
+        """Returns (batch_start, batch_end) of the batch a chapter belongs to."""
+        batch_start = chapter_num - (chapter_num - self.start_chapter) % self.batch_size
+        return batch_start, min(batch_start + self.batch_size - 1, self.end_chapter)
+
+    def batch_filepath(self, batch_start, batch_end):
+        """Returns the output path of a batch file."""
+        safe_filename = re.sub(r'[\\/:*?"<>|]', '_', f"{batch_start}-{batch_end}.txt")
+        return os.path.join(self.output_directory, safe_filename)
+
+    def resolve(self, chapter_num, title=None, content=None, journaled=False):
+        """
+        Marks a chapter as done: with its content, JOURNALED (read back from the journal), or None for a failure.
+        Writes the batch file when this was the last open chapter of its batch and returns its path, else None.
+        """
+        batch_start, batch_end = self.batch_bounds(chapter_num)
+        entry = JOURNALED if journaled else ((title, content) if content is not None else None)
+        with self._lock:
+            batch = self._pending.setdefault(batch_start, {})
+            batch[chapter_num] = entry
+            if len(batch) < batch_end - batch_start + 1:
+                return None
+            del self._pending[batch_start]
+            return self._write_locked(batch_start, batch_end, batch)
+
+    def update(self, chapter_num, title, content):
+        """Stores late content for a chapter (e.g. a successful retry), rewriting its batch file if it was already written."""
+        batch_start, batch_end = self.batch_bounds(chapter_num)
+        with self._lock:
+            if batch_start in self._pending:
+                self._pending[batch_start][chapter_num] = (title, content)
+                return None
+            # The batch is closed: rebuild it from the journal, which already holds this chapter
+            batch = {n: JOURNALED for n in range(batch_start, batch_end + 1)}
+            batch[chapter_num] = (title, content)
+            return self._write_locked(batch_start, batch_end, batch)
+
+    def finish(self):
+        """Writes the batches that never completed (e.g. after a stop request). Returns the paths written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            written = []
+            for batch_start, batch in sorted(pending.items()):
+                filepath = self._write_locked(batch_start, self.batch_bounds(batch_start)[1], batch)
+                if filepath:
+                    written.append(filepath)
+            return written
+
+    def output_file(self, chapter_num):
+        """Returns the batch file holding a chapter, or None if its batch has not been written."""
+        with self._lock:
+            return self._written.get(self.batch_bounds(chapter_num)[0])
+
+    def _write_locked(self, batch_start, batch_end, batch):
+        """Atomically writes one batch file from its resolved chapters. Caller holds the lock."""
+        chapters_in_this_batch = []
+        for chapter_num in range(batch_start, batch_end + 1):
+            entry = batch.get(chapter_num)
+            if entry is JOURNALED:
+                entry = self.journal.read_chapter(chapter_num)
+            if entry is not None:
+                chapters_in_this_batch.append(entry)
+        if not chapters_in_this_batch:
+            return None # No successful content for this batch, no file
+
+        filepath = self.batch_filepath(batch_start, batch_end)
+        temp_filepath = filepath + ".tmp"
+        with open(temp_filepath, "w", encoding="utf-8") as f:
+            for title, content in chapters_in_this_batch:
+                f.write(f"{title}\n\n{content}\n\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filepath, filepath) # Readers never see a half-written batch file
+        self._written[batch_start] = filepath
+        return filepath
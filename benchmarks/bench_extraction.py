@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: parse + extract time per chapter page for each HTML backend.
+
+Runs every installed backend of page_parsers over the saved fixture pages and
+prints the median time per page, next to the old extraction (two
+BeautifulSoup/html.parser parses of the same page). It also checks that every
+backend extracts exactly what the BeautifulSoup backend does.
+
+    python benchmarks/bench_extraction.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from page_parsers import Bs4Backend, available_backends, get_backend
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def old_double_parse(page_source):
+    """The extraction before the single-parse engine: a second parse of the page for the body text."""
+    soup = BeautifulSoup(page_source, 'html.parser')
+    soup.find('h3', class_='chapter-title')
+    soup.select_one('.breadcrumb-item.active')
+    if soup.find('div', class_='chapter-body'):
+        container = BeautifulSoup(page_source, 'html.parser').find('div', class_='chapter-body')
+        inner_title = container.find('h3')
+        if inner_title:
+            inner_title.extract()
+        container.get_text(separator='\n', strip=True)
+    soup.select_one('.chapter-pager')
+
+
+def time_per_page(extract, page_source, repeat):
+    """Median seconds of `repeat` runs of extract(page_source)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(page_source)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per page and backend (default 20).")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="Directory of saved chapter pages (*.html).")
+    args = parser.parse_args(argv)
+
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(args.fixtures, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            pages[os.path.basename(path)] = f.read()
+    if not pages:
+        print(f"No fixture pages found in {args.fixtures}")
+        return 1
+
+    backends = [get_backend(name) for name in reversed(available_backends())] # bs4 first, as the reference
+    reference = Bs4Backend()
+    columns = ["bs4 x2 (old)"] + [backend.name for backend in backends]
+    print(f"Median parse+extract time per page in ms ({args.repeat} runs each)\n")
+    print(f"{'page':<28} {'KB':>6}  " + "  ".join(f"{column:>13}" for column in columns))
+
+    totals = {column: 0.0 for column in columns}
+    mismatches = []
+    for name, page_source in pages.items():
+        timings = [time_per_page(old_double_parse, page_source, args.repeat)]
+        expected = reference.extract(page_source)
+        for backend in backends:
+            timings.append(time_per_page(backend.extract, page_source, args.repeat))
+            result = backend.extract(page_source)
+            for key, value in expected.items():
+                if result[key] != value:
+                    mismatches.append(f"{backend.name} / {name} / {key}: {str(result[key])[:60]!r} != {str(value)[:60]!r}")
+        for column, seconds in zip(columns, timings):
+            totals[column] += seconds
+        print(f"{name:<28} {len(page_source.encode('utf-8')) / 1024:>6.1f}  " + "  ".join(f"{seconds * 1000:>13.2f}" for seconds in timings))
+
+    print(f"{'total':<28} {'':>6}  " + "  ".join(f"{totals[column] * 1000:>13.2f}" for column in columns))
+    baseline = totals[columns[0]]
+    print(f"{'speed-up vs old':<28} {'':>6}  " + "  ".join(f"{baseline / totals[column]:>12.1f}x" for column in columns))
+
+    if mismatches:
+        print("\nBackends disagree with the BeautifulSoup extraction:")
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+        return 1
+    print("\nAll backends extract the same title, breadcrumb, body text and pager link as BeautifulSoup.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+End-to-end benchmark: a whole scrape run against the local fixture site.
+
+Starts benchmarks/fixture_server.py in a child process (so the scraper's CPU and
+memory figures leave the server out), runs ScrapeEngine over its chapters exactly
+as the GUI worker and scraper_cli do, and prints:
+
+    chapters/sec      chapters resolved per wall-clock second
+    page latency      p50/p95 of the time per page (fetch, waits, parsing), from the run's timing trace
+    CPU               process CPU seconds of the scraper (the browsers run as separate processes)
+    peak RSS          peak resident memory of the scraper process
+
+The page mix, latency and error options are the fixture server's. Placeholder,
+AI-block and missing-body chapters and injected errors all fall back to the
+browser, so without chromedriver they are switched off and only the HTTP path is
+measured.
+
+    python benchmarks/bench_scrape.py [--chapters 60] [--browsers 2] [--fetch-mode auto] [--prefetch] [--latency-ms 50]
+    python benchmarks/bench_scrape.py --server http://127.0.0.1:8765/en/serie-1/fixture-novel/chapter-1
+"""
+import argparse
+import collections
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:
+    resource = None # Windows
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from fixture_server import add_site_arguments
+from page_waits import percentile
+from phase_timings import CHAPTER_PHASE
+from scraper_engine import ScrapeEngine, ScrapeEvents, check_chromedriver
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixture_server.py')
+NOT_PAGE_PHASES = {CHAPTER_PHASE, "throttle", "sleep", "cache_lookup"} # Waits the run chooses, not page latency
+BROWSER_ONLY_OPTIONS = ("placeholder_every", "ai_block_every", "missing_body_every", "error_rate")
+
+
+class BenchEvents(ScrapeEvents):
+    """Prints warnings and errors only, so the per-chapter log does not skew the timing."""
+
+    def log_message(self, message, severity=0):
+        if severity >= 1:
+            print(message.strip(), file=sys.stderr)
+
+
+def start_server(args):
+    """Starts the fixture server on a free port with the site options of args; returns (process, chapter-1 URL)."""
+    site_parser = argparse.ArgumentParser(add_help=False)
+    add_site_arguments(site_parser)
+    command = [sys.executable, SERVER_SCRIPT, "--port", "0"]
+    for action in site_parser._actions:
+        command += [action.option_strings[0], str(getattr(args, action.dest))]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    return process, process.stdout.readline().strip()
+
+
+def page_latencies(trace_path):
+    """Seconds per (chapter, page) from the JSONL trace: the sum of its fetch, wait and parse phases."""
+    pages = collections.defaultdict(float)
+    with open(trace_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["phase"] not in NOT_PAGE_PHASES:
+                pages[(entry["chapter"], entry.get("page") or 1)] += entry["seconds"]
+    return sorted(pages.values())
+
+
+def peak_rss_mb():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1048576 if sys.platform == "darwin" else peak / 1024 # Bytes on macOS, KB elsewhere
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1048576
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", help="Chapter-1 URL of a fixture server that is already running.")
+    parser.add_argument("--chapters", type=int, default=60, help="Number of chapters to scrape (default 60).")
+    parser.add_argument("--browsers", type=int, default=1, help="Parallel browsers / HTTP sessions (default 1).")
+    parser.add_argument("--fetch-mode", choices=["auto", "browser"], default="auto")
+    parser.add_argument("--html-parser", default="auto", help="HTML parser backend (default auto).")
+    parser.add_argument("--delay", type=float, default=0.0, help="Politeness delay between requests (default 0).")
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--prefetch", action="store_true", help="Load the next page in a second tab while one is parsed.")
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+
+    chromedriver_found = check_chromedriver()[0]
+    if not chromedriver_found:
+        if args.fetch_mode == "browser":
+            parser.error("--fetch-mode browser needs chromedriver.")
+        if args.server:
+            print("chromedriver not found: chapters of the server that need the browser will fail.", file=sys.stderr)
+        else:
+            print("chromedriver not found: measuring the HTTP path only (browser-only chapters and errors switched off).", file=sys.stderr)
+            for name in BROWSER_ONLY_OPTIONS:
+                setattr(args, name, 0)
+
+    server = None
+    url = args.server
+    if not url:
+        server, url = start_server(args)
+    base_url_pattern = re.sub(r'\d+$', '', url)
+
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            engine = ScrapeEngine(base_url_pattern, 1, args.chapters, batch_size=args.chapters, base_filename="fixture_bench",
+                                  output_directory=output_dir, max_retries=args.max_retries, delay_between_attempts=args.delay,
+                                  cleaning_patterns=[], num_browsers=args.browsers, fetch_mode=args.fetch_mode,
+                                  html_backend=args.html_parser, prefetch=args.prefetch, events=BenchEvents())
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            engine.run()
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    latencies = page_latencies(engine.timings.path)
+    rss = peak_rss_mb()
+    print(f"chapters          {args.chapters} ({engine.successful_chapters_count} ok, {len(engine.failed_chapters)} failed)")
+    print(f"fetch paths       {engine.fetch_path_stats()}")
+    print(f"wall              {wall:.2f} s")
+    print(f"chapters/sec      {args.chapters / wall:.2f}")
+    if latencies:
+        print(f"page latency      p50 {percentile(latencies, 0.5) * 1000:.1f} ms, p95 {percentile(latencies, 0.95) * 1000:.1f} ms ({len(latencies)} pages)")
+    print(f"CPU               {cpu:.2f} s ({cpu / wall:.0%} of wall)")
+    print(f"peak RSS          {f'{rss:.1f} MB' if rss is not None else 'n/a'}")
+    print(f"trace             {engine.timings.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark: duplicate-title detection.
+
+Compares every distinct line of the title corpus with a set of chapter titles
+taken from it (both normalised as the scraper does), once with the old check
+(thefuzz's token_set_ratio on lower-cased strings, score > threshold) and once
+with TitleMatcher. Reports pairs per second, how many pairs the prefilter
+settled without scoring, and any pair on which the two disagree.
+
+    python benchmarks/bench_title_match.py [--titles 80] [--threshold 85] [--repeat 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thefuzz import fuzz
+
+from title_normalizer import DEFAULT_TITLE_MATCH_THRESHOLD, TitleMatcher, TitleNormalizer
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'titles.txt')
+
+
+def old_match(line, title, threshold):
+    """The check before TitleMatcher, as it ran in the duplicate-title loop."""
+    similarity_ratio = fuzz.token_set_ratio(line.lower(), title.lower())
+    return similarity_ratio if similarity_ratio > threshold else None
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=80, help="Chapter titles to compare every line with (default 80).")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_TITLE_MATCH_THRESHOLD, help="Match threshold (default 85).")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over all pairs per implementation (default 20).")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Title corpus, one title or line per line.")
+    args = parser.parse_args(argv)
+
+    normalizer = TitleNormalizer()
+    with open(args.corpus, 'r', encoding='utf-8') as f:
+        raw_lines = [line.rstrip('\n') for line in f]
+    lines = list(dict.fromkeys(normalizer.normalize(line) for line in raw_lines if normalizer.normalize(line)))
+    titles = list(dict.fromkeys(normalizer.normalize(line) for line in raw_lines
+                                if normalizer.normalize(line) and normalizer.normalize(line) != line.strip()))[:args.titles]
+    pairs = len(lines) * len(titles)
+
+    def run_old():
+        return [[old_match(line, title, args.threshold) for line in lines] for title in titles]
+
+    def run_new():
+        matchers = [TitleMatcher(title, args.threshold) for title in titles] # One per chapter title, as in the scraper
+        return [[matcher.match(line) for line in lines] for matcher in matchers], matchers
+
+    old_results = run_old()
+    new_results, matchers = run_new()
+    old_seconds = statistics.median(timed(run_old) for _ in range(args.repeat))
+    new_seconds = statistics.median(timed(run_new) for _ in range(args.repeat))
+
+    prefiltered = sum(matcher.lines_prefiltered for matcher in matchers)
+    matches = sum(result is not None for row in old_results for result in row)
+    print(f"{len(titles)} titles x {len(lines)} lines = {pairs} pairs, threshold {args.threshold}, {matches} matches\n")
+    print(f"{'thefuzz on lower-cased strings':<32} {pairs / old_seconds:>10.0f} pairs/s")
+    print(f"{'TitleMatcher':<32} {pairs / new_seconds:>10.0f} pairs/s  {old_seconds / new_seconds:.1f}x")
+    print(f"Prefilter settled {prefiltered} pairs ({prefiltered / pairs:.1%}) without running the scorer.")
+
+    disagreements = [(title, line, old, new)
+                     for title, old_row, new_row in zip(titles, old_results, new_results)
+                     for line, old, new in zip(lines, old_row, new_row) if (old is None) != (new is None)]
+    if disagreements:
+        print(f"\n{len(disagreements)} pairs disagree with the old check:")
+        for title, line, old, new in disagreements[:20]:
+            print(f"  {line!r} vs {title!r}: old {old}, new {new}")
+        return 1
+    print(f"\nAll {pairs} pairs agree with the old check.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark: chapter title normalisation.
+
+Normalises every line of a title corpus (chapter titles in the formats seen on
+the site mixed with the body lines the duplicate-title check also compares)
+with the old loop of re.sub calls and with TitleNormalizer, without and with its
+memo. It first checks that every line gives the same result.
+
+    python benchmarks/bench_titles.py [--repeat 20]
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from title_normalizer import TitleNormalizer
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'titles.txt')
+
+
+def old_clean_title_prefix(title_str):
+    """The normalisation before TitleNormalizer: five string patterns, re.sub until nothing changes."""
+    if not title_str: return ""
+    cleaned = title_str.strip()
+    patterns = [
+        r'^#\s*\d+\s*',
+        r'^Chapter\s*\d+\s*[:\-–—]\s*',
+        r'^\d+\s*[:\-–—]\s*',
+        r'^Chapter\s*\d+\s+',
+        r'^\d+\s+',
+    ]
+    while True:
+        previous_cleaned = cleaned
+        for pattern in patterns:
+            cleaned = re.sub(pattern, '', cleaned, count=1, flags=re.IGNORECASE).strip()
+        if cleaned == previous_cleaned:
+            break
+    return cleaned
+
+
+def time_corpus(normalize, lines, repeat):
+    """Median seconds of `repeat` passes of normalize over every line."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            normalize(line)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the corpus per implementation (default 20).")
+    parser.add_argument("--corpus", default=CORPUS_PATH, help="Title corpus, one title or line per line.")
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, 'r', encoding='utf-8') as f:
+        lines = [line.rstrip('\n') for line in f]
+
+    normalizer = TitleNormalizer(cache_size=0)
+    mismatches = [(line, old, new) for line, old, new in
+                  ((line, old_clean_title_prefix(line), normalizer.normalize(line)) for line in lines) if old != new]
+    if mismatches:
+        print("TitleNormalizer disagrees with the old normalisation:")
+        for line, old, new in mismatches[:20]:
+            print(f"  {line!r}: {old!r} != {new!r}")
+        return 1
+
+    memoized = TitleNormalizer()
+    implementations = [
+        ("old re.sub loop", old_clean_title_prefix),
+        ("compiled + prefilter", TitleNormalizer(cache_size=0).normalize),
+        ("compiled + prefilter + memo", memoized.normalize),
+    ]
+    print(f"{len(lines)} lines ({len(set(lines))} distinct), median of {args.repeat} passes\n")
+    baseline = None
+    for name, normalize in implementations:
+        seconds = time_corpus(normalize, lines, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:<30} {seconds * 1000:>8.2f} ms/pass  {seconds / len(lines) * 1e6:>6.2f} us/line  {baseline / seconds:>5.1f}x")
+    info = memoized.cache_info()
+    print(f"\nMemo: {info.hits} hits, {info.misses} misses, {info.currsize} entries. All {len(lines)} lines give the same result.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Local stand-in for wtr-lab.com, for benchmarks that must not touch the live site.
+
+Serves chapter pages built from the recorded pages in benchmarks/fixtures/: the
+page shell of chapter_short.html, with each chapter's title, breadcrumb, text and
+pager filled in (text paragraphs come from chapter_long.html). Which kind of page a
+chapter gets depends on its number:
+
+    multi-page        every --multipage-every-th chapter has 2-3 pages linked by .chapter-pager
+    placeholder       every --placeholder-every-th chapter ships a placeholder-glow skeleton that
+                      a script replaces with the text after --render-delay-ms (browser only)
+    AI block          every --ai-block-every-th chapter shows the AI-registration block
+    missing body      every --missing-body-every-th chapter has no .chapter-body at all
+
+(0 disables a kind; the first matching kind in this order wins.) Every response
+waits --latency-ms plus up to --jitter-ms, and a --error-rate share of them are
+503 errors, drawn from --seed so runs are repeatable.
+
+    python benchmarks/fixture_server.py [--port 8765] [--latency-ms 50] [--error-rate 0.02]
+
+The first line printed is the chapter-1 URL, for scraper_cli --url or bench_scrape.py --server.
+"""
+import argparse
+import html
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SERIES_PATH = "/en/serie-1/fixture-novel"
+CHAPTER_PATH = re.compile(re.escape(SERIES_PATH) + r"/chapter-(\d+)(?:/(\d+))?/?$")
+PARAGRAPHS_PER_PAGE = 40
+
+AI_BLOCK_HTML = ('<div class="ai-block"><h4>AI Translation Requires Registration</h4><p>Sign up for free to read the AI translation.</p>'
+                 '<p>Or switch to Google Translation.</p></div>')
+PLACEHOLDER_HTML = '<div class="placeholder-glow"><span class="placeholder col-12"></span><span class="placeholder col-8"></span></div>'
+# Renders the text the way the site's client code does: the body shows a skeleton until the text arrives
+RENDER_SCRIPT = """<script>setTimeout(function () {{
+    var body = document.querySelector('.chapter-body');
+    body.innerHTML = document.getElementById('chapter-text').innerHTML;
+}}, {delay});</script>"""
+
+
+def _load_fixtures():
+    """Returns (page shell with {title}/{breadcrumb}/{content} slots, body paragraphs) from the recorded pages."""
+    with open(os.path.join(FIXTURE_DIR, 'chapter_short.html'), 'r', encoding='utf-8') as f:
+        shell = f.read().replace('{', '{{').replace('}', '}}')
+    shell = re.sub(r'<title>.*?</title>', '<title>{title} | WTR-LAB</title>', shell, count=1, flags=re.S)
+    shell = re.sub(r'(<li class="breadcrumb-item active" aria-current="page">).*?(</li>)', r'\1{breadcrumb}\2', shell, count=1, flags=re.S)
+    shell = re.sub(r'(<h3 class="chapter-title">).*?(</h3>)', r'\1{breadcrumb}\2', shell, count=1, flags=re.S)
+    shell = re.sub(r'<div class="chapter-body">.*?</div>\s*<div class="chapter-pager">.*?</div>', '{content}', shell, count=1, flags=re.S)
+    with open(os.path.join(FIXTURE_DIR, 'chapter_long.html'), 'r', encoding='utf-8') as f:
+        body = re.search(r'<div class="chapter-body">(.*?)</div>', f.read(), re.S).group(1)
+    paragraphs = re.findall(r'<p>.*?</p>', body, re.S)
+    return shell, paragraphs
+
+
+class FixtureSite:
+    """Builds the pages and decides latency and injected errors."""
+
+    def __init__(self, multipage_every=4, placeholder_every=6, ai_block_every=13, missing_body_every=19,
+                 render_delay_ms=300, latency_ms=50, jitter_ms=20, error_rate=0.0, seed=1):
+        self.kinds = (("multipage", multipage_every), ("placeholder", placeholder_every),
+                      ("ai_block", ai_block_every), ("missing_body", missing_body_every))
+        self.render_delay_ms = render_delay_ms
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.shell, self.paragraphs = _load_fixtures()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def kind(self, chapter):
+        for name, every in self.kinds:
+            if every and chapter % every == 0:
+                return name
+        return "normal"
+
+    def page_count(self, chapter):
+        return 2 + chapter % 2 if self.kind(chapter) == "multipage" else 1
+
+    def delay_and_error(self):
+        """Returns (seconds to wait, whether to fail with 503) for one request."""
+        with self._lock:
+            self.requests += 1
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+            failed = self._random.random() < self.error_rate
+            self.errors += failed
+        return delay, failed
+
+    def render(self, chapter, page):
+        """Returns the HTML of one page, or None if the chapter has no such page."""
+        pages = self.page_count(chapter)
+        if page < 1 or page > pages:
+            return None
+        kind = self.kind(chapter)
+        name = f"The {chapter}th Trial" + (f" ({page}/{pages})" if pages > 1 else "")
+        title = f"Chapter {chapter}: {name}"
+        start = (chapter * 7 + page * 13) % (len(self.paragraphs) - PARAGRAPHS_PER_PAGE)
+        text = f"<h3>{html.escape(title)}</h3>\n<p>#{chapter} {html.escape(name)}</p>\n" + "\n".join(self.paragraphs[start:start + PARAGRAPHS_PER_PAGE])
+
+        links = [f'<a class="btn" href="{SERIES_PATH}/chapter-{chapter - 1}">&lt;&lt; Prev</a>'] if chapter > 1 else []
+        if page < pages:
+            links.append(f'<a class="btn" rel="next" href="{SERIES_PATH}/chapter-{chapter}/{page + 1}">Next &gt;&gt;</a>')
+        pager = f'<div class="chapter-pager">{"".join(links)}</div>'
+
+        if kind == "missing_body":
+            content = '<div class="alert">This chapter is not available.</div>'
+        elif kind == "ai_block":
+            content = f'<div class="chapter-body">\n{AI_BLOCK_HTML}\n</div>\n{pager}'
+        elif kind == "placeholder":
+            content = (f'<div class="chapter-body">\n{PLACEHOLDER_HTML}\n</div>\n{pager}\n'
+                       f'<template id="chapter-text">{text}</template>\n{RENDER_SCRIPT.format(delay=self.render_delay_ms)}')
+        else:
+            content = f'<div class="chapter-body">\n{text}\n</div>\n{pager}'
+        return self.shell.format(title=html.escape(name), breadcrumb=html.escape(title), content=content)
+
+
+def make_handler(site):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # Keep-alive, as the site serves it
+        disable_nagle_algorithm = True # Headers and body go out in separate writes; don't add a delayed-ACK stall to every page
+
+        def do_GET(self):
+            delay, failed = site.delay_and_error()
+            time.sleep(delay)
+            match = CHAPTER_PATH.match(urlparse(self.path).path)
+            page = site.render(int(match.group(1)), int(match.group(2) or 1)) if match and not failed else None
+            status = 503 if failed else (200 if page is not None else 404)
+            body = (page or f"<html><body>{status}</body></html>").encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # One line per request would swamp the benchmark output
+
+    return FixtureHandler
+
+
+def make_server(site, host="127.0.0.1", port=0):
+    """Returns a threading HTTP server for the site (port 0 picks a free port); call serve_forever() on it."""
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    return server
+
+
+def chapter_url(server, chapter=1):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{SERIES_PATH}/chapter-{chapter}"
+
+
+def add_site_arguments(parser):
+    """Adds the page-mix, latency and error options (shared with bench_scrape.py)."""
+    parser.add_argument("--multipage-every", type=int, default=4, help="Every Nth chapter has 2-3 pages (default 4, 0 never).")
+    parser.add_argument("--placeholder-every", type=int, default=6, help="Every Nth chapter renders client-side (default 6, 0 never).")
+    parser.add_argument("--ai-block-every", type=int, default=13, help="Every Nth chapter shows the AI-registration block (default 13, 0 never).")
+    parser.add_argument("--missing-body-every", type=int, default=19, help="Every Nth chapter has no .chapter-body (default 19, 0 never).")
+    parser.add_argument("--render-delay-ms", type=int, default=300, help="Client-side render delay of placeholder chapters (default 300).")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Base response latency (default 50).")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Random extra latency, up to this much (default 20).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of responses that are 503 errors (default 0).")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the latency jitter and injected errors.")
+
+
+def site_from_args(args):
+    return FixtureSite(args.multipage_every, args.placeholder_every, args.ai_block_every, args.missing_body_every,
+                       args.render_delay_ms, args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on, 0 for any free port (default 8765).")
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = make_server(site_from_args(args), args.host, args.port)
+    print(chapter_url(server), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Per-phase report of a timing trace (summary/<prefix>_trace.jsonl), or a comparison of two.
+
+Prints count, total and p50/p95/max per phase, and with a second trace the change of
+each phase's p50 and total between them, so a regression shows which phase moved:
+network (throttle, navigate, http_fetch), DOM waits (ready_wait, transfer) or
+Python work (parse, clean).
+
+    python benchmarks/trace_report.py summary/MyNovel_trace.jsonl [summary/MyNovel_trace_before.jsonl]
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_waits import percentile
+
+
+def load_phases(path):
+    """Returns {phase: sorted durations} from a JSONL trace."""
+    durations = collections.defaultdict(list)
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                durations[entry["phase"]].append(entry["seconds"])
+    return {phase: sorted(values) for phase, values in durations.items()}
+
+
+def phase_stats(values):
+    return {"count": len(values), "total": sum(values), "p50": percentile(values, 0.5),
+            "p95": percentile(values, 0.95), "max": values[-1]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", help="Trace to report on.")
+    parser.add_argument("baseline", nargs="?", help="Earlier trace to compare with.")
+    args = parser.parse_args(argv)
+
+    current = {phase: phase_stats(values) for phase, values in load_phases(args.trace).items()}
+    baseline = {phase: phase_stats(values) for phase, values in load_phases(args.baseline).items()} if args.baseline else {}
+
+    header = f"{'phase':<14} {'count':>6} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"
+    if baseline:
+        header += f" {'p50 vs base':>12} {'total vs base':>14}"
+    print(header)
+    for phase, stats in sorted(current.items(), key=lambda item: -item[1]["total"]):
+        row = (f"{phase:<14} {stats['count']:>6} {stats['total']:>9.2f} {stats['p50'] * 1000:>9.1f} "
+               f"{stats['p95'] * 1000:>9.1f} {stats['max'] * 1000:>9.1f}")
+        base = baseline.get(phase)
+        if base:
+            p50_change = f"{(stats['p50'] - base['p50']) / base['p50']:+.0%}" if base["p50"] else "n/a"
+            total_change = f"{(stats['total'] - base['total']) / base['total']:+.0%}" if base["total"] else "n/a"
+            row += f" {p50_change:>12} {total_change:>14}"
+        elif baseline:
+            row += f" {'new':>12} {'new':>14}"
+        print(row)
+    for phase in sorted(set(baseline) - set(current)):
+        print(f"{phase:<14} (only in the baseline)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Long-lived headless Chrome browsers that scrape runs attach to.
+
+Starting Chrome takes seconds and a fresh browser starts with an empty cache, so
+BrowserService keeps browsers running between runs: a run acquires browsers,
+returns them when it finishes, and the next run (the next click on Start, or the
+next job of the queue) picks them up already warm. Each browser has a numbered
+user-data-dir under cache/browser_profiles, reused by whichever browser takes the
+number next, so the HTTP cache and cookies also survive a browser restart.
+
+A browser is health-checked before it is handed out and before every chapter,
+and recycled (quit and replaced) after a number of page loads or once Chrome's
+memory passes a limit, since long-running Chrome sessions keep growing. Memory is
+the resident size of the browser's processes with the optional 'psutil' package,
+else the page's JavaScript heap.
+"""
+import collections
+import os
+import threading
+import time
+
+from selenium import webdriver
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_PROFILE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'browser_profiles')
+DEFAULT_RECYCLE_PAGES = 300 # Page loads after which a browser is replaced, 0 never
+DEFAULT_MEMORY_LIMIT_MB = 1500 # Memory above which a browser is replaced, 0 never
+MEMORY_CHECK_PAGES = 20 # Page loads between memory readings
+
+JS_HEAP_JS = "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : null;"
+
+
+def build_chrome_options(profile_dir=None):
+    """Creates the headless Chrome options shared by every browser; profile_dir keeps cache and cookies on disk."""
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu') # Add this line to disable GPU acceleration
+    chrome_options.add_argument('--log-level=3') # Suppress INFO/WARNING messages from Chrome
+    chrome_options.add_argument('--disable-software-rasterizer') # Add this
+    chrome_options.add_argument('--disable-features=VizDisplayCompositor') # Add this
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+    if profile_dir:
+        chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+    return chrome_options
+
+
+class PooledBrowser:
+    """One running Chrome and what the service knows about it."""
+
+    def __init__(self, driver, number, profile_dir):
+        self.driver = driver
+        self.number = number # Selects the profile directory; None for a throwaway profile
+        self.profile_dir = profile_dir
+        self.pages = 0 # Page loads since the browser started
+        self.memory_mb = None # Last reading
+        self.reused = False # True when it served an earlier run (or chapter slot) before this lease
+        self._pages_at_memory_check = 0
+
+
+class BrowserService:
+    """Pool of idle and leased browsers. Safe to share between runs and between the pool threads of a run."""
+
+    def __init__(self, profile_root=DEFAULT_PROFILE_ROOT):
+        self.profile_root = profile_root # None or "" starts every browser with a throwaway profile
+        self._idle = []
+        self._leased = {} # id(driver) -> PooledBrowser
+        self._numbers_in_use = set()
+        self._lock = threading.Lock()
+        self.stats = collections.Counter() # started, reused, recycled_<reason>, start_seconds
+
+    @property
+    def persistent_profiles(self):
+        return bool(self.profile_root)
+
+    def _take_number(self):
+        with self._lock:
+            number = 1
+            while number in self._numbers_in_use:
+                number += 1
+            self._numbers_in_use.add(number)
+            return number
+
+    def _start(self):
+        """Starts a browser on the lowest free profile number; falls back to a throwaway profile if Chrome rejects it."""
+        number = self._take_number() if self.persistent_profiles else None
+        profile_dir = os.path.join(self.profile_root, f"browser-{number}") if number else None
+        start = time.monotonic()
+        try:
+            if profile_dir:
+                os.makedirs(profile_dir, exist_ok=True)
+            driver = webdriver.Chrome(options=build_chrome_options(profile_dir))
+        except Exception:
+            if not profile_dir:
+                raise
+            # Usually the profile is locked by a Chrome of another process (e.g. the GUI and the CLI at once)
+            with self._lock:
+                self._numbers_in_use.discard(number)
+            number = profile_dir = None
+            driver = webdriver.Chrome(options=build_chrome_options())
+        with self._lock:
+            self.stats["started"] += 1
+            self.stats["start_seconds"] += time.monotonic() - start
+        return PooledBrowser(driver, number, profile_dir)
+
+    def acquire(self):
+        """Returns a healthy browser, idle or newly started, leased to the caller. Raises if Chrome cannot start."""
+        while True:
+            with self._lock:
+                browser = self._idle.pop() if self._idle else None
+            if browser is None:
+                browser = self._start()
+                break
+            if self.is_healthy(browser):
+                browser.reused = True
+                with self._lock:
+                    self.stats["reused"] += 1
+                break
+            self._quit(browser, "unhealthy")
+        with self._lock:
+            self._leased[id(browser.driver)] = browser
+        return browser
+
+    def release(self, browser):
+        """Hands a leased browser back; it stays running for the next run."""
+        with self._lock:
+            self._leased.pop(id(browser.driver), None)
+            self._idle.append(browser)
+
+    def retire(self, browser, reason):
+        """Quits a leased browser for good (see recycle_reason); its profile number is freed for the replacement."""
+        with self._lock:
+            self._leased.pop(id(browser.driver), None)
+        self._quit(browser, reason)
+
+    def _quit(self, browser, reason):
+        try:
+            browser.driver.quit()
+        except Exception:
+            pass # Already gone, which is often why it is being retired
+        with self._lock:
+            self._numbers_in_use.discard(browser.number)
+            self.stats[f"recycled_{reason}"] += 1
+
+    def page_loaded(self, driver):
+        """Counts a page load of a leased browser (unknown drivers are ignored)."""
+        browser = self._leased.get(id(driver))
+        if browser is not None:
+            browser.pages += 1
+
+    def is_healthy(self, browser):
+        """One cheap WebDriver round trip: fails when Chrome crashed, hung up or the session expired."""
+        try:
+            browser.driver.execute_script("return document.readyState;")
+            return True
+        except Exception:
+            return False
+
+    def memory_mb(self, browser):
+        """Chrome's memory in MB: resident size of all its processes with psutil, else the page's JS heap."""
+        if psutil is not None:
+            try:
+                root = psutil.Process(browser.driver.service.process.pid) # chromedriver; Chrome runs as its children
+                return round(sum(child.memory_info().rss for child in root.children(recursive=True)) / 1048576, 1)
+            except Exception:
+                pass
+        try:
+            heap = browser.driver.execute_script(JS_HEAP_JS)
+            return round(heap / 1048576, 1) if heap else None
+        except Exception:
+            return None
+
+    def recycle_reason(self, browser, max_pages, max_memory_mb):
+        """Returns why a browser should be replaced ('pages', 'memory' or 'unhealthy'), or None to keep using it."""
+        if max_pages and browser.pages >= max_pages:
+            return "pages"
+        if max_memory_mb and browser.pages - browser._pages_at_memory_check >= MEMORY_CHECK_PAGES:
+            browser._pages_at_memory_check = browser.pages
+            browser.memory_mb = self.memory_mb(browser)
+            if browser.memory_mb and browser.memory_mb > max_memory_mb:
+                return "memory"
+        if not self.is_healthy(browser):
+            return "unhealthy"
+        return None
+
+    def summary(self):
+        """Counters for the summary JSON (since the service started, so across runs in the GUI)."""
+        with self._lock:
+            started = self.stats["started"]
+            return {
+                "persistent_profiles": self.persistent_profiles,
+                "memory_source": "process rss" if psutil is not None else "js heap",
+                "started": started,
+                "reused": self.stats["reused"],
+                "recycled": {reason[len("recycled_"):]: count for reason, count in self.stats.items() if reason.startswith("recycled_")},
+                "avg_start_seconds": round(self.stats["start_seconds"] / started, 2) if started else None,
+                "idle": len(self._idle),
+            }
+
+    def shutdown(self):
+        """Quits every browser, idle or leased."""
+        with self._lock:
+            browsers = self._idle + list(self._leased.values())
+            self._idle, self._leased = [], {}
+        for browser in browsers:
+            try:
+                browser.driver.quit()
+            except Exception:
+                pass
+        with self._lock:
+            self._numbers_in_use.clear()
+        return len(browsers)
@@ -0,0 +1,145 @@
+"""
+Persistent on-disk chapter cache.
+
+Each chapter URL maps to the raw HTML of its first page (stored zlib-compressed
+and addressed by its SHA-256), the extracted (title, content), the time it was
+fetched and the ETag/Last-Modified validators needed for conditional requests.
+The cache is capped in size and evicts the least recently used chapters first.
+
+The stored content is already cleaned and its title normalised, so entries are
+keyed by the URL together with a digest of the settings that shaped the text
+(cleaning rules, title patterns, content source). Changing those settings
+misses the cache instead of serving text cleaned the old way.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+CONTENT_VERSION = 1 # Part of every settings key: bump it when a code change alters the text the same settings produce
+
+
+class ChapterCache:
+    """SQLite-backed chapter cache shared by all scraping threads."""
+
+    def __init__(self, db_path, max_bytes, settings_key=""):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.settings_key = settings_key # Digest of the extraction settings, see settings_digest()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False) # Access is serialised by self._lock
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(chapters)")]
+        if columns and "settings_key" not in columns:
+            self._conn.execute("DROP TABLE chapters") # Made before settings keys: nothing says how its entries were cleaned
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chapters (
+                url TEXT NOT NULL,
+                settings_key TEXT NOT NULL,
+                html_sha256 TEXT,
+                html BLOB,
+                title TEXT,
+                content TEXT,
+                extractor TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                size INTEGER,
+                PRIMARY KEY (url, settings_key)
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chapters_accessed ON chapters (accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM chapters").fetchone()[0]
+
+    @staticmethod
+    def html_digest(html):
+        """Returns the content address (SHA-256 hex digest) of a page's raw HTML."""
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def settings_digest(settings):
+        """Returns the settings key for a dict of the settings that shape the cached text (JSON-serialisable values)."""
+        settings = dict(settings, content_version=CONTENT_VERSION)
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def get(self, url):
+        """Returns the entry cached for a url under this cache's settings key as a dict, or None if it is not cached."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, content, extractor, etag, last_modified, fetched_at, html_sha256 FROM chapters "
+                "WHERE url = ? AND settings_key = ?", (url, self.settings_key)).fetchone()
+        if row is None:
+            return None
+        title, content, extractor, etag, last_modified, fetched_at, html_sha256 = row
+        return {"title": title, "content": content, "extractor": extractor, "etag": etag,
+                "last_modified": last_modified, "fetched_at": fetched_at, "html_sha256": html_sha256}
+
+    def record_hit(self, url, revalidated=False):
+        """Counts a cache hit and marks the entry as recently used (and freshly validated if it was revalidated)."""
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._conn.execute("UPDATE chapters SET accessed_at = ?, fetched_at = ? WHERE url = ? AND settings_key = ?",
+                                   (now, now, url, self.settings_key))
+                self.stats["revalidated"] += 1
+            else:
+                self._conn.execute("UPDATE chapters SET accessed_at = ? WHERE url = ? AND settings_key = ?",
+                                   (now, url, self.settings_key))
+            self._conn.commit()
+            self.stats["hits"] += 1
+
+    def record_miss(self):
+        """Counts a chapter that had to be fetched from the network."""
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def put(self, url, title, content, extractor, html=None, etag=None, last_modified=None):
+        """Stores (or replaces) a successfully scraped chapter and evicts old entries if over the size cap."""
+        html_blob = zlib.compress(html.encode('utf-8')) if html else None
+        html_sha256 = self.html_digest(html) if html else None
+        size = len(html_blob or b"") + len(content.encode('utf-8')) + len((title or "").encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM chapters WHERE url = ? AND settings_key = ?",
+                                     (url, self.settings_key)).fetchone()
+            if old:
+                self._total_bytes -= old[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chapters (url, settings_key, html_sha256, html, title, content, extractor, etag, last_modified, fetched_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, self.settings_key, html_sha256, html_blob, title, content, extractor, etag, last_modified, now, now, size))
+            self._total_bytes += size
+            self.stats["stored"] += 1
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self):
+        """Deletes least recently used entries until the cache fits its size cap. Caller holds the lock."""
+        while self._total_bytes > self.max_bytes:
+            row = self._conn.execute("SELECT rowid, size FROM chapters ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                self._total_bytes = 0
+                break
+            self._conn.execute("DELETE FROM chapters WHERE rowid = ?", (row[0],))
+            self._total_bytes -= row[1]
+            self.stats["evictions"] += 1
+
+    def summary(self):
+        """Returns the hit/miss counters and current size for the summary JSON."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {**self.stats,
+                    "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                    "size_bytes": self._total_bytes,
+                    "max_bytes": self.max_bytes,
+                    "settings_key": self.settings_key}
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,65 @@
+"""
+Typed outcome of scraping one chapter.
+
+Scraping used to report how a chapter went inside its text: failed pages as
+"Content Not Found (...)" strings, partial chapters with a trailing "--- Incomplete
+Chapter ---" line, so every check for real content first copied the whole chapter
+through a chain of replace() calls. A ChapterResult keeps the page bodies as a list
+with the status, the failure class (from retry_policy) and the byte count beside
+them: checking a result is an attribute read, and the text is joined once, when it
+is stored or written.
+"""
+import enum
+from dataclasses import dataclass, field
+
+from retry_policy import INCOMPLETE, UNKNOWN
+
+PAGE_BREAK = "\n\n--- Page Break ---\n\n" # Between the pages of a chapter in the batch files
+INCOMPLETE_MARKER = "\n\n--- Incomplete Chapter ---\n\n" # Ends the text of a partial chapter
+
+
+class ChapterStatus(enum.Enum):
+    COMPLETE = "complete" # Every page was scraped
+    INCOMPLETE = "incomplete" # Some pages were scraped, then one failed; the text is kept but the chapter is retried
+    FAILED = "failed" # No usable text
+
+
+@dataclass(slots=True)
+class ChapterResult:
+    title: str
+    status: ChapterStatus
+    pages: list = field(default_factory=list) # Cleaned text of each scraped page
+    failure: str | None = None # Failure class (retry_policy) unless complete
+    extractor: str = "dom" # "payload" or "dom", for the first page
+    fetch_path: str | None = None # "http", "browser" or "cache", set by the engine
+    content_bytes: int = 0 # UTF-8 size of the page texts
+
+    @classmethod
+    def from_pages(cls, title, pages, failure=None, extractor="dom"):
+        """
+        The result of a chapter scrape: complete when pages hold text and no page failed, incomplete when
+        some text was scraped before a failure, else failed with the class of the failure (or UNKNOWN).
+        """
+        has_text = any(page and not page.isspace() for page in pages)
+        content_bytes = sum(len(page.encode('utf-8')) for page in pages) if has_text else 0
+        if content_bytes and failure is None:
+            return cls(title, ChapterStatus.COMPLETE, pages, None, extractor, content_bytes=content_bytes)
+        if content_bytes:
+            return cls(title, ChapterStatus.INCOMPLETE, pages, INCOMPLETE, extractor, content_bytes=content_bytes)
+        return cls(title, ChapterStatus.FAILED, [], failure or UNKNOWN, extractor)
+
+    @property
+    def complete(self):
+        return self.status is ChapterStatus.COMPLETE
+
+    @property
+    def has_text(self):
+        """True for complete and incomplete chapters, whose text is saved."""
+        return self.status is not ChapterStatus.FAILED
+
+    def text(self):
+        """The chapter text as written to the batch file: the pages joined by page breaks, partial chapters marked."""
+        if not self.has_text:
+            return ""
+        text = PAGE_BREAK.join(self.pages)
+        return text + INCOMPLETE_MARKER if self.status is ChapterStatus.INCOMPLETE else text
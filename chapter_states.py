@@ -0,0 +1,110 @@
+"""
+Per-chapter state of a scrape job, indexed by chapter number.
+
+Every chapter of the range has one record, found in O(1) by its number, that
+moves through the statuses below as it is scraped and retried. Attempt counts
+and scrape times are kept on the record, the failed chapters in a set and the
+status totals in counters, so recording a result or a retry never scans the
+job. The records are written out as the summary's "results" list in chapter
+order without sorting.
+"""
+import collections
+import threading
+
+PENDING = "pending" # Not scraped yet
+RUNNING = "running" # A browser or the HTTP path is on it
+SUCCESS = "success"
+FAILED = "failed" # No usable content (partial chapters count as failed, so they are retried)
+RETRIED_SUCCESS = "retried_success" # Failed first, then scraped by a later retry
+
+# Allowed status changes; anything else is a bug in the caller
+_TRANSITIONS = {
+    PENDING: {RUNNING, SUCCESS}, # SUCCESS directly when a resumed job restores the chapter from its journal
+    RUNNING: {SUCCESS, FAILED, RETRIED_SUCCESS, PENDING}, # PENDING when the chapter is handed back unscraped
+    FAILED: {RUNNING},
+    SUCCESS: set(),
+    RETRIED_SUCCESS: set(),
+}
+
+
+class ChapterStates:
+    """The chapter records of one job. Safe to update from several pool threads."""
+
+    def __init__(self, start_chapter, end_chapter):
+        self.start_chapter = start_chapter
+        self.end_chapter = end_chapter
+        self._records = {chapter: {"chapter": chapter, "status": PENDING, "attempts": 0, "seconds": 0.0}
+                         for chapter in range(start_chapter, end_chapter + 1)}
+        self._counts = collections.Counter({PENDING: len(self._records)})
+        self._failed = set()
+        self._started_at = {} # Chapter -> monotonic time its current attempt began
+        self._status_before = {} # Chapter -> status before its current attempt, for abandon()
+        self._lock = threading.Lock()
+
+    def _set_status(self, record, status):
+        if status not in _TRANSITIONS[record["status"]]:
+            raise ValueError(f"Chapter {record['chapter']} cannot go from '{record['status']}' to '{status}'")
+        self._counts[record["status"]] -= 1
+        self._counts[status] += 1
+        record["status"] = status
+        if status == FAILED:
+            self._failed.add(record["chapter"])
+        else:
+            self._failed.discard(record["chapter"])
+
+    def begin(self, chapter, now):
+        """Marks a chapter as being scraped and counts the attempt."""
+        with self._lock:
+            record = self._records[chapter]
+            self._status_before[chapter] = record["status"]
+            self._set_status(record, RUNNING)
+            record["attempts"] += 1
+            self._started_at[chapter] = now
+
+    def abandon(self, chapter):
+        """Returns a chapter that could not be scraped (no browser started) to its previous status."""
+        with self._lock:
+            record = self._records[chapter]
+            self._started_at.pop(chapter, None)
+            record["attempts"] -= 1
+            self._set_status(record, self._status_before.pop(chapter, PENDING))
+
+    def finish(self, chapter, status, now=None, **fields):
+        """
+        Records the outcome of an attempt (or a chapter restored from the journal) and any result fields.
+        Returns a copy of the updated record.
+        """
+        with self._lock:
+            record = self._records[chapter]
+            self._set_status(record, status)
+            self._status_before.pop(chapter, None)
+            started = self._started_at.pop(chapter, None)
+            if started is not None and now is not None:
+                record["seconds"] = round(record["seconds"] + now - started, 3)
+            record.update(fields)
+            return dict(record)
+
+    def status(self, chapter):
+        return self._records[chapter]["status"]
+
+    def count(self, *statuses):
+        """Number of chapters currently in any of the given statuses."""
+        with self._lock:
+            return sum(self._counts[status] for status in statuses)
+
+    def failed_chapters(self):
+        """The failed chapters in chapter order."""
+        with self._lock:
+            return sorted(self._failed)
+
+    def set_output_files(self, output_file):
+        """Fills in each scraped chapter's batch file from output_file(chapter)."""
+        with self._lock:
+            for record in self._records.values():
+                if record["status"] in (SUCCESS, RETRIED_SUCCESS):
+                    record["output_file"] = output_file(record["chapter"])
+
+    def results(self):
+        """The summary's per-chapter results in chapter order; chapters never reached are left out."""
+        with self._lock:
+            return [dict(record) for record in self._records.values() if record["status"] not in (PENDING, RUNNING)]
@@ -0,0 +1,196 @@
+"""
+Content cleaning rules for scraped chapter text.
+
+Each cleaning pattern is one rule:
+
+    Translated by XYZ          an exact line: the whole line is removed (case-sensitive)
+    contains:wtr-lab.com       a substring: removed wherever it appears inside a line
+    re:\\s*\\(Visit .*?\\)        a regular expression: every match is removed from the line
+
+A line left empty by substring or regex removal is dropped. All substring rules
+are searched in one pass over each line with an Aho-Corasick automaton (the
+optional 'pyahocorasick' package) or, without it, one alternation of the escaped
+substrings. Regex rules are indexed by the literal text their matches must start
+with; the same one-pass search over those literals picks the few rules worth
+running on a line, and only regexes without such a literal run on every line.
+So the cost per line does not grow with the number of rules. Every rule counts
+how many times it removed something, for the scrape summary.
+"""
+import collections
+import re
+import threading
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+CONTAINS_PREFIX = "contains:"
+REGEX_PREFIX = "re:"
+
+
+def parse_cleaning_rules(patterns):
+    """
+    Sorts cleaning patterns into exact lines, substrings and regexes.
+    Returns (exact, substrings, regexes, errors); invalid regexes are reported in errors and left out.
+    """
+    exact, substrings, regexes, errors = set(), [], [], []
+    for pattern in patterns:
+        if pattern.startswith(CONTAINS_PREFIX):
+            if pattern[len(CONTAINS_PREFIX):]:
+                substrings.append(pattern[len(CONTAINS_PREFIX):])
+        elif pattern.startswith(REGEX_PREFIX):
+            try:
+                re.compile(pattern[len(REGEX_PREFIX):])
+            except re.error as e:
+                errors.append(f"'{pattern}': {e}")
+                continue
+            regexes.append(pattern[len(REGEX_PREFIX):])
+        else:
+            exact.add(pattern)
+    return exact, sorted(set(substrings)), sorted(set(regexes)), errors
+
+
+def _literal_prefix(pattern):
+    """Returns the literal text every match of a regex starts with, or '' when it cannot tell."""
+    if '|' in pattern or pattern.startswith('(?'):
+        return '' # Alternatives or inline flags (e.g. case-insensitive): no single literal
+    i = 0
+    while True: # Zero-width anchors do not consume text
+        anchor = next((a for a in ('^', '\\A', '\\b', '\\B') if pattern.startswith(a, i)), None)
+        if anchor is None:
+            break
+        i += len(anchor)
+    chars = []
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 < len(pattern) and not pattern[i + 1].isalnum(): # An escaped punctuation character
+                chars.append(pattern[i + 1])
+                i += 2
+                continue
+            break # A class like \\d or \\s, or a backreference
+        if char in '.^$*+?{}[]()':
+            break
+        chars.append(char)
+        i += 1
+    if i < len(pattern) and pattern[i] in '*?{':
+        chars = chars[:-1] # The last character is optional or repeated a variable number of times
+    return ''.join(chars)
+
+
+class _LiteralMatcher:
+    """Finds many literal strings in one pass over a line: Aho-Corasick when installed, else one regex alternation."""
+
+    def __init__(self, literals):
+        self.literals = literals
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for index, text in enumerate(literals):
+                self._automaton.add_word(text, (index, len(text)))
+            self._automaton.make_automaton()
+        else:
+            # Longest first, so the alternation finds the leftmost-longest match like the automaton does.
+            # No groups: capturing groups would switch off the re module's first-character skipping
+            self._index = {text: index for index, text in enumerate(literals)}
+            self._alternation = re.compile('|'.join(re.escape(text) for text in sorted(literals, key=len, reverse=True)))
+
+    def spans(self, line):
+        """Non-overlapping leftmost-longest matches as (start, end, literal index)."""
+        if self._automaton is not None:
+            return [(end - length + 1, end + 1, index) for end, (index, length) in self._automaton.iter_long(line)]
+        return [(match.start(), match.end(), self._index[match.group()]) for match in self._alternation.finditer(line)]
+
+    def present(self, line):
+        """Indexes of every literal that occurs in the line, overlapping ones included."""
+        if self._automaton is not None:
+            return {index for _, (index, _) in self._automaton.iter(line)}
+        if not self._alternation.search(line):
+            return set()
+        return {index for index, text in enumerate(self.literals) if text in line}
+
+
+class ContentCleaner:
+    """Applies a profile's cleaning rules to page text and counts the hits per rule. Safe to share between threads."""
+
+    def __init__(self, patterns=()):
+        self.exact, substrings, regexes, self.errors = parse_cleaning_rules(patterns)
+        self._substring_rules = [CONTAINS_PREFIX + text for text in substrings]
+        self._regex_rules = [REGEX_PREFIX + pattern for pattern in regexes]
+        self._substrings = _LiteralMatcher(substrings) if substrings else None
+        self._regexes = [re.compile(pattern) for pattern in regexes]
+        # Regexes whose matches start with a known literal only run on lines containing it
+        prefixes = [_literal_prefix(pattern) for pattern in regexes]
+        literals = sorted(set(prefix for prefix in prefixes if prefix))
+        self._regex_literals = _LiteralMatcher(literals) if literals else None
+        self._regexes_by_literal = [[index for index, prefix in enumerate(prefixes) if prefix == literal] for literal in literals]
+        self._always_run = [index for index, prefix in enumerate(prefixes) if not prefix]
+        self.hits = collections.Counter() # Rule -> number of removals
+        self.lines_removed = 0
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.exact or self._substring_rules or self._regex_rules)
+
+    def _remove_substrings(self, line, hits):
+        spans = self._substrings.spans(line)
+        if not spans:
+            return line
+        pieces, position = [], 0
+        for start, end, index in spans:
+            pieces.append(line[position:start])
+            position = end
+            hits[self._substring_rules[index]] += 1
+        pieces.append(line[position:])
+        return ''.join(pieces)
+
+    def _remove_regexes(self, line, hits):
+        indexes = self._always_run
+        if self._regex_literals is not None:
+            candidates = [index for literal in self._regex_literals.present(line) for index in self._regexes_by_literal[literal]]
+            if candidates:
+                indexes = sorted(set(candidates).union(self._always_run)) # Rules run in their sorted order
+        for index in indexes:
+            line, count = self._regexes[index].subn('', line)
+            if count:
+                hits[self._regex_rules[index]] += count
+        return line
+
+    def clean(self, page_content):
+        """Returns the page text with the rules applied. Untouched lines keep their original whitespace."""
+        if not page_content or not self:
+            return page_content
+        hits = collections.Counter()
+        lines_removed = 0
+        cleaned_lines = []
+        for line in page_content.split('\n'):
+            line_stripped = line.strip()
+            if line_stripped in self.exact:
+                hits[line_stripped] += 1
+                lines_removed += 1
+                continue
+            if self._substrings is not None:
+                line = self._remove_substrings(line, hits)
+            if self._regexes:
+                line = self._remove_regexes(line, hits)
+            if line_stripped and not line.strip(): # Nothing left once the matches were removed
+                lines_removed += 1
+                continue
+            cleaned_lines.append(line)
+        if hits:
+            with self._lock:
+                self.hits.update(hits)
+                self.lines_removed += lines_removed
+        return '\n'.join(cleaned_lines)
+
+    def summary(self):
+        """Returns the rule counts and per-rule hits for the summary JSON."""
+        with self._lock:
+            return {
+                "rules": {"exact": len(self.exact), "contains": len(self._substring_rules), "regex": len(self._regex_rules),
+                          "regex_always_run": len(self._always_run)},
+                "literal_matcher": "aho-corasick" if ahocorasick is not None else "regex",
+                "lines_removed": self.lines_removed,
+                "hits": dict(self.hits.most_common()),
+            }
@@ -0,0 +1,108 @@
+"""
+Content extractors that do not depend on the GUI.
+
+The embedded-payload extractor reads chapter text from JSON that the site ships
+inside <script> tags (a Next.js __NEXT_DATA__ blob or JSON-LD), so no DOM wait,
+HTML parse or title heuristics are needed when such a payload is present.
+
+Only chapter-scoped objects count: the object must sit directly under a key
+naming a chapter (props.pageProps.chapter, chapter_data, ...), carry its text
+in a chapter key (chapter_body) or be a JSON-LD Chapter. Comments, reviews and
+related-novel blurbs can be just as long and appear elsewhere in the same
+payload, even inside the chapter object, and must never be taken for the text.
+"""
+import html
+import json
+import re
+
+# Keys that hold chapter text/title in the payloads we know about
+BODY_KEYS = ("body", "content", "text", "chapter_body", "articleBody")
+TITLE_KEYS = ("title", "chapter_title", "name", "headline")
+MIN_PAYLOAD_CHARS = 200 # Smaller text blobs are descriptions/teasers, not chapter bodies
+JSON_LD_CHAPTER_TYPES = ("Chapter",) # schema.org types of a JSON-LD object that is the chapter itself
+
+_NEXT_DATA_RE = re.compile(r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+_LD_JSON_RE = re.compile(r'<script[^>]*\btype=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+_BLOCK_TAG_RE = re.compile(r'<\s*(?:br\s*/?|/p|/div|/h\d)\s*>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Runs in the browser and returns only the payload script texts, so the full page_source never crosses the WebDriver wire
+PAYLOAD_SCRIPTS_JS = """
+var scripts = document.querySelectorAll('script#__NEXT_DATA__, script[type="application/ld+json"]');
+var texts = [];
+for (var i = 0; i < scripts.length; i++) { texts.push(scripts[i].textContent); }
+return texts;
+"""
+
+
+def find_payload_scripts(page_source):
+    """Returns the raw text of every JSON payload script found in an HTML document."""
+    if '__NEXT_DATA__' not in page_source and 'application/ld+json' not in page_source:
+        return [] # Cheap substring check before running the regexes
+    return _NEXT_DATA_RE.findall(page_source) + _LD_JSON_RE.findall(page_source)
+
+
+def _text_to_paragraphs(text):
+    """Splits a payload string (plain text or an HTML fragment) into paragraphs."""
+    if '<' in text:
+        text = _TAG_RE.sub('', _BLOCK_TAG_RE.sub('\n', text))
+    text = html.unescape(text)
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+
+def _body_paragraphs(value):
+    """Returns paragraphs for a body-like payload value, or None if it is not chapter text."""
+    if isinstance(value, str):
+        return _text_to_paragraphs(value)
+    if isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+        paragraphs = []
+        for item in value:
+            paragraphs.extend(_text_to_paragraphs(item))
+        return paragraphs
+    return None
+
+
+def _is_chapter_scoped(node, path, body_key):
+    """True if a dict is the chapter itself: under a chapter key, with a chapter body key, or a JSON-LD Chapter."""
+    if path and 'chapter' in path[-1].lower():
+        return True
+    if 'chapter' in body_key.lower():
+        return True
+    types = node.get("@type")
+    return any(t in JSON_LD_CHAPTER_TYPES for t in (types if isinstance(types, list) else [types]))
+
+
+def _find_chapter_candidates(node, path, candidates):
+    """Walks a decoded payload and collects every chapter-scoped dict that carries a chapter-sized body."""
+    if isinstance(node, dict):
+        for key in BODY_KEYS:
+            if key in node and _is_chapter_scoped(node, path, key):
+                paragraphs = _body_paragraphs(node[key])
+                if paragraphs and sum(len(p) for p in paragraphs) >= MIN_PAYLOAD_CHARS:
+                    title = next((node[k] for k in TITLE_KEYS if isinstance(node.get(k), str)), None)
+                    candidates.append((path, title, paragraphs))
+                    break
+        for key, value in node.items():
+            _find_chapter_candidates(value, path + (str(key),), candidates)
+    elif isinstance(node, list):
+        for value in node:
+            _find_chapter_candidates(value, path, candidates)
+
+
+def extract_chapter_payload(script_texts):
+    """
+    Decodes payload scripts and picks the chapter text from them.
+    Returns {'title': str or None, 'paragraphs': [str, ...]} or None if no payload carries a chapter.
+    """
+    candidates = []
+    for script_text in script_texts:
+        try:
+            data = json.loads(script_text)
+        except ValueError:
+            continue # Not JSON (or truncated), ignore this script
+        _find_chapter_candidates(data, (), candidates)
+    if not candidates:
+        return None
+
+    _, title, paragraphs = max(candidates, key=lambda candidate: sum(len(p) for p in candidate[2])) # The longest body
+    return {"title": title, "paragraphs": paragraphs}
@@ -0,0 +1,383 @@
+"""
+Persistent multi-novel job queue.
+
+Each job is one scrape (URL pattern, chapter range, output directory, cleaning
+patterns, ...) stored with a priority and a status in a JSON state file, so the
+queue survives restarts and can be edited from another process while it runs.
+JobScheduler runs queued jobs by priority with a global browser budget shared
+by all running jobs, and every job takes its page loads from one shared
+per-host token bucket, so running several series at once raises throughput
+without raising the request rate to the site.
+"""
+import contextlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+from browser_service import BrowserService
+from scraper_engine import ERROR, INFO, WARNING, ScrapeEngine, ScrapeEvents
+from throttle import RateMeter
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'queue', 'jobs.json')
+
+# Job statuses: "queued" waits for the scheduler, "running" has an engine (its scheduler is the job's "owner"),
+# "paused" is skipped until resumed, "done" finished (possibly with failed chapters) and "failed" could not run
+JOB_STATUSES = ("queued", "running", "paused", "done", "failed")
+
+
+# --- Shared Per-Host Rate Limit ---
+
+class TokenBucketLimiter:
+    """
+    Per-host token bucket shared by every job and browser. Allows short bursts of up to
+    `burst` page loads, then `rate` loads per second. Drop-in replacement for HostThrottle.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets = {} # {host: (tokens, monotonic time of the last update)}
+        self._lock = threading.Lock()
+        self.rate_meter = RateMeter()
+
+    def interval(self, host):
+        """Seconds between page loads to host once the burst is used up."""
+        return 1 / self.rate if self.rate > 0 else 0.0
+
+    def wait(self, url, should_continue=lambda: True):
+        """Takes a token for the url's host, sleeping until one is available."""
+        if self.rate <= 0:
+            self.rate_meter.add(time.monotonic())
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate) - 1
+            self._buckets[host] = (tokens, now) # Going negative reserves a future token, keeping waiters in order
+            slot_time = now + (-tokens / self.rate if tokens < 0 else 0.0)
+        self.rate_meter.add(slot_time)
+        # Sleep in short steps so a stop request is not delayed by a long wait
+        while should_continue():
+            remaining = slot_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 0.25))
+
+    def record(self, url, seconds, failure=None):
+        """The queue's rate is fixed, so page outcomes do not change it."""
+
+    def summary(self):
+        return {"mode": "token_bucket", "rate_per_second": self.rate, "burst": self.burst,
+                "pages_per_minute": round(self.rate_meter.per_minute(), 1)}
+
+
+# --- Persistent Queue State ---
+
+def _try_lock_file(lock_file):
+    """Takes an exclusive lock on the open file unless another handle holds one. Returns whether it did."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _lock_file(lock_file):
+    """Blocks until this process holds an exclusive lock on the open file. The OS releases it if the process dies."""
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        return
+    while not _try_lock_file(lock_file):
+        time.sleep(0.05)
+
+
+def _unlock_file(lock_file):
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JobQueue:
+    """Reads and edits the queue state file. Every change is a locked read-modify-write, so several processes can share it."""
+
+    def __init__(self, state_path=DEFAULT_STATE_PATH):
+        self.state_path = state_path
+        self._lock_path = state_path + ".lock"
+        self._thread_lock = threading.Lock()
+        self._owner_files = {} # {owner id: open owner file, locked while its scheduler runs}
+        os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Holds an OS lock on the lock file while the state is read and rewritten. A process that dies while
+        holding it loses the lock with its file handle, so a slow writer is never mistaken for a dead one.
+        """
+        with self._thread_lock, open(self._lock_path, 'a+b') as lock_file: # The file stays; deleting it would race other processes
+            _lock_file(lock_file)
+            try:
+                yield
+            finally:
+                _unlock_file(lock_file)
+
+    def _read(self):
+        if not os.path.exists(self.state_path):
+            return {"next_id": 1, "jobs": []}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write(self, state):
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.state_path)
+
+    def jobs(self):
+        """Returns all jobs, highest priority first, then in the order they were added."""
+        with self._locked():
+            jobs = self._read()["jobs"]
+        return sorted(jobs, key=lambda job: (-job["priority"], job["id"]))
+
+    def get(self, job_id):
+        return next((job for job in self.jobs() if job["id"] == job_id), None)
+
+    def add(self, name, options, priority=0):
+        """Adds a job from ScrapeEngine keyword arguments and returns its id."""
+        options = dict(options)
+        options["cleaning_patterns"] = sorted(options.get("cleaning_patterns") or []) # Sets are not JSON
+        options.pop("resume", None) # The scheduler decides when a job resumes its journal
+        with self._locked():
+            state = self._read()
+            job_id = state["next_id"]
+            state["next_id"] += 1
+            state["jobs"].append({"id": job_id, "name": name, "priority": priority, "status": "queued",
+                                  "options": options, "owner": None, "started_before": False, "added_at": time.time(),
+                                  "started_at": None, "finished_at": None, "result": None})
+            self._write(state)
+        return job_id
+
+    def update(self, job_id, expected_status=None, **changes):
+        """
+        Changes fields of a job and returns the updated job, or None if it does not exist. With expected_status,
+        the job is only changed if it still has that status, so a pause made meanwhile by another process is kept.
+        """
+        with self._locked():
+            state = self._read()
+            job = next((job for job in state["jobs"] if job["id"] == job_id), None)
+            if job is None or (expected_status is not None and job["status"] != expected_status):
+                return None
+            job.update(changes)
+            self._write(state)
+        return job
+
+    def claim(self, job_id, owner):
+        """Marks a queued job running for owner (see open_owner). Returns the job, or None if it is no longer queued."""
+        return self.update(job_id, expected_status="queued", status="running", owner=owner, started_at=time.time())
+
+    def remove(self, job_id):
+        """Deletes a job that is not running. Returns False if it is running or does not exist."""
+        with self._locked():
+            state = self._read()
+            job = next((job for job in state["jobs"] if job["id"] == job_id), None)
+            if job is None or job["status"] == "running":
+                return False
+            state["jobs"].remove(job)
+            self._write(state)
+        return True
+
+    def pause(self, job_id):
+        """Pauses a job; a running job is stopped by its scheduler and resumes from its journal later."""
+        return self.update(job_id, status="paused")
+
+    def resume(self, job_id):
+        """Puts a paused (or finished) job back in the queue."""
+        return self.update(job_id, status="queued")
+
+    def set_priority(self, job_id, priority):
+        return self.update(job_id, priority=priority)
+
+    def recover(self):
+        """
+        Requeues jobs left "running" by a scheduler that did not shut down cleanly. Jobs whose owner
+        still holds its owner lock belong to a scheduler running in another process and are left alone.
+        """
+        with self._locked():
+            state = self._read()
+            for job in state["jobs"]:
+                if job["status"] == "running" and not self._owner_alive(job.get("owner")):
+                    job["status"] = "queued"
+                    job["owner"] = None
+            self._write(state)
+
+    # --- Scheduler Ownership ---
+
+    def _owner_path(self, owner_id):
+        return f"{self.state_path}.{owner_id}.owner"
+
+    def open_owner(self):
+        """
+        Registers a scheduler and returns the owner record it stamps on the jobs it claims. Its owner file
+        stays locked until close_owner(); the OS drops that lock if the process dies, which is how
+        recover() tells a crashed scheduler from one that is still running (even one on another host).
+        """
+        owner = {"id": uuid.uuid4().hex[:12], "pid": os.getpid(), "host": socket.gethostname()}
+        owner_file = open(self._owner_path(owner["id"]), 'a+b')
+        _lock_file(owner_file)
+        self._owner_files[owner["id"]] = owner_file
+        return owner
+
+    def close_owner(self, owner):
+        """Releases an owner registered by open_owner()."""
+        owner_file = self._owner_files.pop(owner["id"], None)
+        if owner_file is None:
+            return
+        _unlock_file(owner_file)
+        owner_file.close()
+        with contextlib.suppress(OSError):
+            os.remove(self._owner_path(owner["id"]))
+
+    def _owner_alive(self, owner):
+        """True while the owner's scheduler holds its owner lock. Jobs from before owners were recorded have none."""
+        if not owner:
+            return False
+        if owner["id"] in self._owner_files:
+            return True # This process
+        owner_path = self._owner_path(owner["id"])
+        if not os.path.exists(owner_path):
+            return False
+        with open(owner_path, 'a+b') as owner_file:
+            if not _try_lock_file(owner_file):
+                return True
+            _unlock_file(owner_file)
+        with contextlib.suppress(OSError):
+            os.remove(owner_path) # Left behind by a scheduler that died
+        return False
+
+
+# --- Scheduler ---
+
+class JobScheduler:
+    """
+    Runs the queue: starts the highest-priority queued jobs while browsers are left in the
+    global budget, and polls the state file so pauses, priority changes and new jobs made
+    by other processes take effect while it runs.
+    """
+
+    def __init__(self, job_queue, max_browsers, rate_limiter, events_factory=None, poll_interval=1.0, exit_when_idle=True,
+                 browser_service=None):
+        self.job_queue = job_queue
+        self.max_browsers = max(1, max_browsers)
+        self.browser_service = browser_service or BrowserService() # Browsers outlive each job, so the next job starts warm
+        self.rate_limiter = rate_limiter
+        self.events_factory = events_factory or (lambda job: ScrapeEvents()) # Builds the ScrapeEvents of each job
+        self.poll_interval = poll_interval
+        self.exit_when_idle = exit_when_idle
+        self.log = lambda message, severity=INFO: None # Scheduler-level messages
+        self.owner = None # Owner record of this scheduler's running jobs, set by run()
+        self._running = {} # {job id: (engine, thread, browsers, events)}
+        self._is_running = True
+
+    def stop(self):
+        """Stops every running job; they stay queued and resume from their journals next time."""
+        self._is_running = False
+        for engine, _, _, _ in list(self._running.values()):
+            engine.stop()
+
+    def browsers_in_use(self):
+        return sum(browsers for _, _, browsers, _ in self._running.values())
+
+    def run(self):
+        """Schedules jobs until the queue is empty (or until stop() when exit_when_idle is False)."""
+        self.owner = self.job_queue.open_owner()
+        try:
+            self.job_queue.recover()
+            while True:
+                self._reap_finished()
+                jobs = self.job_queue.jobs()
+                # Pause requests from the state file stop the running engine; its journal keeps the progress
+                for job in jobs:
+                    if job["id"] in self._running and job["status"] == "paused":
+                        self.log(f"Pausing job {job['id']} ({job['name']})...", INFO)
+                        self._running[job["id"]][0].stop()
+                if self._is_running:
+                    self._start_jobs(job for job in jobs if job["status"] == "queued" and job["id"] not in self._running)
+                if not self._running and (not self._is_running or
+                                          (self.exit_when_idle and not any(job["status"] == "queued" for job in jobs))):
+                    break
+                time.sleep(self.poll_interval)
+        finally:
+            self.job_queue.close_owner(self.owner)
+        self.browser_service.shutdown()
+
+    def _start_jobs(self, queued_jobs):
+        """Starts queued jobs in priority order while the browser budget allows."""
+        for job in queued_jobs:
+            available = self.max_browsers - self.browsers_in_use()
+            if available <= 0:
+                break
+            job = self.job_queue.claim(job["id"], self.owner)
+            if job is None:
+                continue # Paused, removed or started by another scheduler since the queue was read
+            options = dict(job["options"])
+            browsers = min(options.get("num_browsers", 1), available)
+            options.update(num_browsers=browsers, cleaning_patterns=set(options["cleaning_patterns"]),
+                           resume=job["started_before"]) # A job that ran before continues from its journal
+            try:
+                events = self.events_factory(job)
+                engine = ScrapeEngine(events=events, throttle=self.rate_limiter, browser_service=self.browser_service, **options)
+            except Exception as e:
+                self.job_queue.update(job["id"], expected_status="running", status="failed", owner=None,
+                                      result={"error": str(e)}, finished_at=time.time())
+                self.log(f"Job {job['id']} ({job['name']}) failed to start: {e}", ERROR)
+                continue
+            thread = threading.Thread(target=engine.run, name=f"ScrapeJob-{job['id']}", daemon=True)
+            self.job_queue.update(job["id"], started_before=True)
+            self._running[job["id"]] = (engine, thread, browsers, events)
+            self.log(f"Starting job {job['id']} ({job['name']}) with {browsers} browser(s).", INFO)
+            thread.start()
+
+    def _reap_finished(self):
+        """Records the outcome of jobs whose engine has returned."""
+        for job_id, (engine, thread, _, _) in list(self._running.items()):
+            if thread.is_alive():
+                continue
+            del self._running[job_id]
+            job = self.job_queue.get(job_id)
+            if job is None:
+                continue # Removed while running
+            result = {"successful": engine.successful_chapters_count, "failed": sorted(engine.failed_chapters),
+                      "total": engine.total_chapters}
+            if not self._is_running:
+                status, changes = "queued", {} # Interrupted, resumes next run
+            else:
+                # An engine that scraped nothing and failed nothing could not start at all
+                processed = result["successful"] + len(result["failed"])
+                status = "done" if processed else "failed"
+                changes = {"finished_at": time.time()}
+            if self.job_queue.update(job_id, expected_status="running", status=status, owner=None, result=result,
+                                     **changes) is None:
+                # Paused (or removed) by another process while the engine was finishing: keep that status
+                if self.job_queue.update(job_id, owner=None, result=result) is not None:
+                    self.log(f"Job {job_id} ({job['name']}) paused.", INFO)
+            elif status != "queued":
+                self.log(f"Job {job_id} ({job['name']}) {status}: {result['successful']}/{result['total']} chapters scraped.",
+                         INFO if status == "done" and not result["failed"] else WARNING)
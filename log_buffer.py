@@ -0,0 +1,65 @@
+"""
+Log plumbing between the scrape threads and whatever shows the log.
+
+The engine logs several lines per page. Sending each one to the GUI as its own
+cross-thread signal, and inserting it into the log view on its own, makes the
+window lag on long runs. LogBuffer instead collects records from any thread in
+a bounded deque; the GUI drains it on a timer and inserts a whole batch at once.
+If the GUI falls behind, the oldest records are dropped and counted rather than
+letting the buffer grow.
+
+DEBUG records (per-page detail: attempts, titles, pager links) never reach the
+log view. They go to a size-rotated file under logs/ instead, see debug_logger().
+"""
+import collections
+import logging
+import logging.handlers
+import os
+import threading
+
+DEBUG_LOG_MAX_BYTES = 5 * 1024 * 1024 # Rotate the debug log at 5 MB
+DEBUG_LOG_BACKUPS = 3 # Keep scraper_debug.log.1 .. .3
+
+
+class LogBuffer:
+    """Thread-safe, bounded buffer of (timestamp, message, severity) records."""
+
+    def __init__(self, max_records=2000):
+        self._records = collections.deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self.dropped = 0 # Records pushed out before they were drained, since the last drain
+
+    def append(self, timestamp, message, severity):
+        with self._lock:
+            if len(self._records) == self._records.maxlen:
+                self.dropped += 1
+            self._records.append((timestamp, message, severity))
+
+    def drain(self):
+        """Returns (records, dropped) and empties the buffer."""
+        with self._lock:
+            records = list(self._records)
+            self._records.clear()
+            dropped, self.dropped = self.dropped, 0
+        return records, dropped
+
+
+def debug_logger(log_dir=None):
+    """
+    Returns the logger that DEBUG records are written to: logs/scraper_debug.log next to
+    the scripts unless log_dir is given, rotated by size. The handler is added only once.
+    """
+    logger = logging.getLogger("wtr_scraper.debug")
+    if not logger.handlers:
+        log_dir = log_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(os.path.join(log_dir, 'scraper_debug.log'), maxBytes=DEBUG_LOG_MAX_BYTES,
+                                                           backupCount=DEBUG_LOG_BACKUPS, encoding='utf-8', delay=True)
+            handler.setFormatter(logging.Formatter("[%(asctime)s] %(threadName)s: %(message)s", "%Y-%m-%d %H:%M:%S"))
+        except Exception:
+            handler = logging.NullHandler() # No writable logs folder: drop debug records rather than fail the job
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False # Keep per-page detail out of the root logger
+    return logger
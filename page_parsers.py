@@ -0,0 +1,309 @@
+"""
+Single-parse chapter page extraction with interchangeable HTML backends.
+
+Every backend parses a page once and returns the parts the scraper needs from
+that one tree: the chapter title, the breadcrumb fallback, the chapter body text
+(with the duplicated inner <h3> title removed), whether the body still shows the
+loading skeleton and the pager's next link. The
+BeautifulSoup backend is always available; lxml and selectolax are used when
+installed ("auto" picks the fastest one present). All backends produce the same
+text as BeautifulSoup's get_text(separator='\\n', strip=True): one line per text
+node, stripped, empty nodes and script/style/template/comment text skipped.
+
+In the browser the same parts can be read without transferring page_source at
+all: PAGE_PARTS_JS runs in the page and returns them as one small JSON object.
+"""
+import re
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+# Text inside these elements is not page text (matches what BeautifulSoup's get_text skips)
+_SKIPPED_TEXT_TAGS = frozenset(("script", "style", "template"))
+_NEXT_TEXT_RE = re.compile(r'next', re.IGNORECASE)
+_ARROW_TEXT_RE = re.compile(r'>>?')
+
+
+# Runs in the browser through execute_script and returns the same dict as Backend.extract(page_source), read
+# from the live DOM. Only the four elements the scraper uses are touched and nothing in the page is modified.
+PAGE_PARTS_JS = """
+var skipped = {SCRIPT: 1, STYLE: 1, TEMPLATE: 1};
+function textNodes(root, exclude) {
+    var out = [];
+    var walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT, {acceptNode: function (node) {
+        for (var el = node.parentNode; el && el !== root.parentNode; el = el.parentNode) {
+            if (skipped[el.nodeName] || el === exclude) { return NodeFilter.FILTER_REJECT; }
+        }
+        return NodeFilter.FILTER_ACCEPT;
+    }});
+    while (walker.nextNode()) {
+        var text = walker.currentNode.nodeValue.trim();
+        if (text) { out.push(text); }
+    }
+    return out;
+}
+function singleString(link) {
+    var node = link;
+    while (node.nodeType === 1) {
+        if (node.childNodes.length !== 1) { return null; }
+        node = node.childNodes[0];
+    }
+    return node.nodeType === 3 ? node.nodeValue : null;
+}
+var parts = {title: null, breadcrumb: null, has_body: false, has_placeholder: false, inner_title: null, body_text: '',
+             has_pager: false, next_href: null};
+var title = document.querySelector('h3.chapter-title');
+if (title) { parts.title = textNodes(title, null).join(''); }
+var breadcrumb = document.querySelector('.breadcrumb-item.active');
+if (breadcrumb) { parts.breadcrumb = textNodes(breadcrumb, null).join(''); }
+var body = document.querySelector('div.chapter-body');
+if (body) {
+    parts.has_body = true;
+    parts.has_placeholder = body.querySelector('.placeholder-glow') !== null;
+    var innerTitle = body.querySelector('h3');
+    if (innerTitle) { parts.inner_title = textNodes(innerTitle, null).join(''); }
+    parts.body_text = textNodes(body, innerTitle).join('\\n');
+}
+var pager = document.querySelector('.chapter-pager');
+if (pager) {
+    parts.has_pager = true;
+    var links = Array.prototype.slice.call(pager.querySelectorAll('a'));
+    var tests = [
+        function (a) { return (a.getAttribute('rel') || '').split(/\\s+/).indexOf('next') !== -1; },
+        function (a) { var s = singleString(a); return s !== null && /next/i.test(s); },
+        function (a) { return a.classList.contains('pager-next'); },
+        function (a) { var s = singleString(a); return s !== null && />>?/.test(s); }
+    ];
+    var nextLink = null;
+    for (var t = 0; t < tests.length && !nextLink; t++) {
+        for (var i = 0; i < links.length && !nextLink; i++) {
+            if (tests[t](links[i])) { nextLink = links[i]; }
+        }
+    }
+    if (nextLink) { parts.next_href = nextLink.getAttribute('href'); }
+}
+return parts;
+"""
+
+
+def _empty_parts():
+    return {"title": None, "breadcrumb": None, "has_body": False, "has_placeholder": False, "inner_title": None,
+            "body_text": "", "has_pager": False, "next_href": None}
+
+
+def _join_text(strings, separator='\n'):
+    """Joins text nodes the way get_text(separator, strip=True) does."""
+    return separator.join(text for text in (string.strip() for string in strings) if text)
+
+
+class Bs4Backend:
+    """BeautifulSoup with Python's html.parser (or lxml's parser when parser='lxml')."""
+
+    def __init__(self, parser='html.parser'):
+        self.parser = parser
+        self.name = "bs4" if parser == 'html.parser' else f"bs4-{parser}"
+
+    def extract(self, page_source):
+        parts = _empty_parts()
+        soup = BeautifulSoup(page_source, self.parser)
+
+        title_element = soup.find('h3', class_='chapter-title')
+        if title_element:
+            parts["title"] = title_element.get_text(strip=True)
+        breadcrumb_element = soup.select_one('.breadcrumb-item.active')
+        if breadcrumb_element:
+            parts["breadcrumb"] = breadcrumb_element.get_text(strip=True)
+
+        container = soup.find('div', class_='chapter-body')
+        if container:
+            parts["has_body"] = True
+            parts["has_placeholder"] = container.select_one('.placeholder-glow') is not None
+            inner_title_element = container.find('h3')
+            if inner_title_element:
+                parts["inner_title"] = inner_title_element.get_text(strip=True)
+                inner_title_element.extract()
+            parts["body_text"] = container.get_text(separator='\n', strip=True)
+
+        pager = soup.select_one('.chapter-pager')
+        if pager:
+            parts["has_pager"] = True
+            next_link = (pager.find('a', rel='next')
+                         or pager.find('a', string=_NEXT_TEXT_RE)
+                         or pager.find('a', class_='pager-next')
+                         or pager.find('a', string=_ARROW_TEXT_RE))
+            if next_link and 'href' in next_link.attrs:
+                parts["next_href"] = next_link['href']
+        return parts
+
+
+def _first_match(links, tests):
+    """Returns the first link passing the first test that any link passes (the pager's fallback order), or None."""
+    for test in tests:
+        for link in links:
+            if test(link):
+                return link
+    return None
+
+
+def _class_xpath(tag, *classes):
+    """XPath matching elements that carry every given class token."""
+    tests = " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in classes)
+    return f".//{tag}[{tests}]"
+
+
+class LxmlBackend:
+    """lxml.html (libxml2). Needs the optional 'lxml' package."""
+
+    name = "lxml"
+
+    def _text_nodes(self, element):
+        """Yields the text nodes under an element in document order, skipping non-text content."""
+        if isinstance(element.tag, str) and element.tag in _SKIPPED_TEXT_TAGS:
+            return
+        if isinstance(element.tag, str) and element.text: # Comments/PIs have a non-str tag
+            yield element.text
+        for child in element:
+            yield from self._text_nodes(child)
+            if child.tail:
+                yield child.tail
+
+    def extract(self, page_source):
+        parts = _empty_parts()
+        try:
+            root = lxml_html.fromstring(page_source)
+        except ValueError: # A str with an XML encoding declaration
+            root = lxml_html.fromstring(page_source.encode('utf-8'))
+
+        title_elements = root.xpath(_class_xpath("h3", "chapter-title"))
+        if title_elements:
+            parts["title"] = _join_text(self._text_nodes(title_elements[0]), '')
+        breadcrumb_elements = root.xpath(_class_xpath("*", "breadcrumb-item", "active"))
+        if breadcrumb_elements:
+            parts["breadcrumb"] = _join_text(self._text_nodes(breadcrumb_elements[0]), '')
+
+        containers = root.xpath(_class_xpath("div", "chapter-body"))
+        if containers:
+            container = containers[0]
+            parts["has_body"] = True
+            parts["has_placeholder"] = bool(container.xpath(_class_xpath("*", "placeholder-glow")))
+            inner_titles = container.xpath(".//h3")
+            if inner_titles:
+                inner_title = inner_titles[0]
+                parts["inner_title"] = _join_text(self._text_nodes(inner_title), '')
+                inner_title.drop_tree() # Keeps the tail text, like BeautifulSoup's extract()
+            parts["body_text"] = _join_text(self._text_nodes(container))
+
+        pagers = root.xpath(_class_xpath("*", "chapter-pager"))
+        if pagers:
+            parts["has_pager"] = True
+            links = pagers[0].xpath(".//a")
+            next_link = _first_match(links, (lambda a: 'next' in (a.get('rel') or '').split(),
+                                              lambda a: _single_string_matches(a, _NEXT_TEXT_RE),
+                                              lambda a: 'pager-next' in (a.get('class') or '').split(),
+                                              lambda a: _single_string_matches(a, _ARROW_TEXT_RE)))
+            if next_link is not None and next_link.get('href') is not None:
+                parts["next_href"] = next_link.get('href')
+        return parts
+
+
+def _single_string_matches(link, pattern):
+    """BeautifulSoup's string= filter: the link's .string (its only text, through single-child wrappers) matches."""
+    element = link
+    while len(element):
+        if len(element) > 1 or element.text or element[0].tail or not isinstance(element[0].tag, str):
+            return False # More than one child, so there is no single .string
+        element = element[0]
+    return element.text is not None and bool(pattern.search(element.text))
+
+
+class SelectolaxBackend:
+    """selectolax's Lexbor parser. Needs the optional 'selectolax' package."""
+
+    name = "selectolax"
+
+    def _text_nodes(self, node):
+        """Yields the text nodes under a node in document order, skipping non-text content."""
+        for child in node.iter(include_text=True):
+            if child.tag == '-text':
+                yield child.text_content
+            elif child.tag not in _SKIPPED_TEXT_TAGS and child.tag != '-comment':
+                yield from self._text_nodes(child)
+
+    def extract(self, page_source):
+        parts = _empty_parts()
+        tree = SelectolaxParser(page_source)
+
+        title_element = tree.css_first('h3.chapter-title')
+        if title_element is not None:
+            parts["title"] = _join_text(self._text_nodes(title_element), '')
+        breadcrumb_element = tree.css_first('.breadcrumb-item.active')
+        if breadcrumb_element is not None:
+            parts["breadcrumb"] = _join_text(self._text_nodes(breadcrumb_element), '')
+
+        container = tree.css_first('div.chapter-body')
+        if container is not None:
+            parts["has_body"] = True
+            parts["has_placeholder"] = container.css_first('.placeholder-glow') is not None
+            inner_title = container.css_first('h3')
+            if inner_title is not None:
+                parts["inner_title"] = _join_text(self._text_nodes(inner_title), '')
+                inner_title.decompose()
+            parts["body_text"] = _join_text(self._text_nodes(container))
+
+        pager = tree.css_first('.chapter-pager')
+        if pager is not None:
+            parts["has_pager"] = True
+            links = pager.css('a')
+
+            def single_string_matches(link, pattern):
+                node = link
+                while True: # Follow single-child wrappers down to the only text, like BeautifulSoup's .string
+                    children = list(node.iter(include_text=True))
+                    if len(children) != 1:
+                        return False
+                    node = children[0]
+                    if node.tag == '-text':
+                        return bool(pattern.search(node.text_content))
+
+            next_link = _first_match(links, (lambda a: 'next' in (a.attributes.get('rel') or '').split(),
+                                              lambda a: single_string_matches(a, _NEXT_TEXT_RE),
+                                              lambda a: 'pager-next' in (a.attributes.get('class') or '').split(),
+                                              lambda a: single_string_matches(a, _ARROW_TEXT_RE)))
+            if next_link is not None and 'href' in next_link.attributes:
+                parts["next_href"] = next_link.attributes['href']
+        return parts
+
+
+def available_backends():
+    """Returns the names of the backends that can be used in this environment, fastest first."""
+    names = []
+    if SelectolaxParser is not None:
+        names.append("selectolax")
+    if lxml_html is not None:
+        names.extend(["lxml", "bs4-lxml"])
+    names.append("bs4")
+    return names
+
+
+def get_backend(name="auto"):
+    """Returns a backend instance by name ("auto" picks the fastest installed one). Raises ValueError if unavailable."""
+    if name == "auto":
+        name = available_backends()[0]
+    if name not in available_backends():
+        raise ValueError(f"HTML backend '{name}' is not available (installed: {', '.join(available_backends())})")
+    if name == "selectolax":
+        return SelectolaxBackend()
+    if name == "lxml":
+        return LxmlBackend()
+    if name == "bs4-lxml":
+        return Bs4Backend('lxml')
+    return Bs4Backend()
@@ -0,0 +1,138 @@
+"""
+Pipelined page loads: the next page starts loading in a second tab while the current one is parsed.
+
+Without it a browser sits idle while Python parses, cleans and title-matches a
+page, and only then navigates to the next one. The URL to load next is known as
+soon as a page's parts are read (its pager link, or the next chapter's URL), so
+TabPrefetcher starts that navigation in the browser's other tab from a helper
+thread and the network wait overlaps the parsing. The helper first waits on the
+host throttle like any other page load, so the politeness delay still spaces
+the requests to the site.
+
+When the scraper gets to the prefetched URL it takes the tab over instead of
+calling driver.get(); the two tabs swap roles page by page. A prefetch of any
+other URL is dropped and the page is loaded normally.
+"""
+import threading
+import time
+
+# Marks the document a prefetch navigates away from, so take() can tell when the new one has replaced it
+MARK_STALE_AND_NAVIGATE_JS = "document.wtrPrefetchStale = true; window.location.replace(arguments[0]);"
+IS_NEW_DOCUMENT_JS = "return document.wtrPrefetchStale !== true;"
+COMMIT_POLL_SECONDS = 0.02
+
+
+class TabPrefetcher:
+    """Loads one URL ahead in the other tab of a driver. Used by the pool thread that owns the driver."""
+
+    def __init__(self, driver, throttle, should_continue, on_page_load=None, on_new_tab=None):
+        self.driver = driver
+        self._throttle = throttle
+        self._should_continue = should_continue
+        self._on_page_load = on_page_load # Called with the driver when a prefetch navigation starts
+        self._on_new_tab = on_new_tab # Called with the driver switched to the new tab, for per-tab DevTools settings
+        self._other_tab = None # Handle of the tab not being read
+        self._thread = None
+        self._url = None
+        self._error = None
+        self.started_at = None # Monotonic time the pending navigation started, for page load metrics
+        self.stats = {"started": 0, "used": 0, "wasted": 0, "failed": 0}
+
+    @property
+    def pending(self):
+        """True while a prefetch has been started and not taken or cancelled."""
+        return self._thread is not None
+
+    def start(self, url):
+        """Starts loading url in the other tab without waiting for it. The driver must not be used until take() or settle()."""
+        self.cancel()
+        try:
+            current = self.driver.current_window_handle
+            if self._other_tab is None:
+                self.driver.switch_to.new_window('tab')
+                self._other_tab = current # new_window() already switched to the new tab
+                if self._on_new_tab:
+                    self._on_new_tab(self.driver)
+            else:
+                self.driver.switch_to.window(self._other_tab)
+                self._other_tab = current
+        except Exception:
+            self.stats["failed"] += 1
+            return False
+        self._url, self._error, self.started_at = url, None, None
+        self._thread = threading.Thread(target=self._navigate, args=(url,), name=f"{threading.current_thread().name}-prefetch", daemon=True)
+        self._thread.start()
+        self.stats["started"] += 1
+        return True
+
+    def _navigate(self, url):
+        try:
+            self._throttle.wait(url, self._should_continue)
+            if not self._should_continue():
+                raise RuntimeError("stop requested")
+            self.started_at = time.monotonic()
+            self.driver.execute_script(MARK_STALE_AND_NAVIGATE_JS, url)
+            if self._on_page_load:
+                self._on_page_load(self.driver)
+        except Exception as e:
+            self._error = e
+
+    def settle(self):
+        """
+        Waits until the helper thread is done sending the navigation, so the driver can take other commands
+        (a health check) while the page loads. The prefetch stays pending for take().
+        """
+        if self._thread is not None:
+            self._thread.join()
+
+    def take(self, url, timeout):
+        """
+        Returns True once the prefetched page for url has replaced the previous document in the current tab,
+        so it can be read like a page loaded with driver.get(). False (and the page must be loaded normally)
+        when nothing, or something else, was prefetched, or the navigation failed.
+        """
+        if self._thread is None:
+            return False
+        self._thread.join()
+        self._thread = None
+        prefetched, self._url = self._url, None
+        if prefetched != url:
+            self.stats["wasted"] += 1
+            return False
+        if self._error is not None:
+            self.stats["failed"] += 1
+            return False
+        deadline = time.monotonic() + timeout
+        try:
+            while not self.driver.execute_script(IS_NEW_DOCUMENT_JS):
+                if time.monotonic() > deadline or not self._should_continue():
+                    self.stats["failed"] += 1
+                    return False
+                time.sleep(COMMIT_POLL_SECONDS)
+        except Exception:
+            self.stats["failed"] += 1
+            return False
+        self.stats["used"] += 1
+        return True
+
+    def cancel(self):
+        """Drops a pending prefetch (waiting for its helper thread, which never blocks longer than the throttle)."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._url = None
+            self.stats["wasted"] += 1
+
+    def close(self):
+        """Cancels any prefetch and closes the extra tab, leaving the driver with the tab it is on."""
+        self.cancel()
+        if self._other_tab is None:
+            return
+        try:
+            current = self.driver.current_window_handle
+            self.driver.switch_to.window(self._other_tab)
+            self.driver.close()
+            self.driver.switch_to.window(current)
+        except Exception:
+            pass # The browser is gone or being recycled; nothing left to tidy
+        self._other_tab = None
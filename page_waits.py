@@ -0,0 +1,127 @@
+"""
+Event-driven page readiness detection with adaptive timeouts.
+
+Instead of polling the chapter container over WebDriver, one asynchronous
+script is injected per page. It resolves as soon as the chapter body exists,
+contains text and no longer shows the loading placeholder, using a
+MutationObserver, so the wait costs a single WebDriver round-trip and returns
+the moment the page is ready. The time budget handed to the script follows the
+p95 of recently observed load times, and every wait is recorded in a histogram
+for the scrape summary.
+"""
+import collections
+import math
+import threading
+
+# Stages a page goes through; a timeout reports the stage it was stuck in
+STAGE_CONTAINER = "container" # .chapter-body not in the DOM yet
+STAGE_TEXT = "text" # Container present but no text yet
+STAGE_PLACEHOLDER = "placeholder" # Text present but the placeholder-glow skeleton is still shown
+
+# Runs in the browser through execute_async_script(READY_JS, timeout_ms); calls back with
+# {state: "ready" | "timeout", stage, elapsed_ms} without any further WebDriver round-trips
+READY_JS = """
+var timeoutMs = arguments[0];
+var done = arguments[arguments.length - 1];
+var start = performance.now();
+var observer = null;
+var timer = null;
+function stage() {
+    var body = document.querySelector('.chapter-body');
+    if (!body) { return 'container'; }
+    if ((body.textContent || '').indexOf('.') === -1) { return 'text'; }
+    if (body.querySelector('.placeholder-glow') || body.innerHTML.indexOf('placeholder-glow') !== -1) { return 'placeholder'; }
+    return 'ready';
+}
+function finish(state, currentStage) {
+    if (observer) { observer.disconnect(); }
+    if (timer) { clearTimeout(timer); }
+    done({state: state, stage: currentStage, elapsed_ms: performance.now() - start});
+}
+var current = stage();
+if (current === 'ready') {
+    finish('ready', current);
+} else {
+    observer = new MutationObserver(function () {
+        var now = stage();
+        if (now === 'ready') { finish('ready', now); }
+    });
+    observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true, attributeFilter: ['class']});
+    timer = setTimeout(function () { finish('timeout', stage()); }, timeoutMs);
+}
+"""
+
+# Histogram bucket upper bounds in seconds; the last bucket catches everything slower
+HISTOGRAM_BOUNDS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class AdaptiveWaitPolicy:
+    """
+    Picks the readiness timeout from the p95 of recent successful page waits and records every
+    wait. Until enough pages have been seen, or while too many pages time out, the initial
+    timeout (the old fixed 20 s) is used.
+    """
+
+    def __init__(self, initial_timeout=20.0, min_timeout=3.0, max_timeout=30.0, headroom=2.0,
+                 min_samples=10, window=200, max_timeout_rate=0.05):
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.headroom = headroom # Multiplier on the p95 so normal variation does not time out
+        self.min_samples = min_samples
+        self.max_timeout_rate = max_timeout_rate # Share of timed-out pages above which the estimate is not trusted
+        self._recent = collections.deque(maxlen=window) # (seconds, timed_out) of the latest waits
+        self._all_waits = [] # Every wait of the job, for the summary percentiles
+        self._buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self._outcomes = collections.Counter() # "ready" or "timeout_<stage>"
+        self._lock = threading.Lock()
+
+    def current_timeout(self):
+        """Returns the timeout in seconds to use for the next page."""
+        with self._lock:
+            ready_waits = sorted(seconds for seconds, timed_out in self._recent if not timed_out)
+            timeouts = len(self._recent) - len(ready_waits)
+        if len(ready_waits) < self.min_samples:
+            return self.initial_timeout
+        timeout = percentile(ready_waits, 0.95) * self.headroom
+        if timeouts > self.max_timeout_rate * (len(ready_waits) + timeouts):
+            # Too many recent pages ran out of time, so the estimate is too tight (or the site slowed down)
+            timeout = max(timeout, self.initial_timeout)
+        return min(self.max_timeout, max(self.min_timeout, timeout))
+
+    def record(self, seconds, outcome):
+        """Records one page wait; outcome is "ready" or "timeout_<stage>"."""
+        with self._lock:
+            self._recent.append((seconds, outcome != "ready"))
+            self._all_waits.append(seconds)
+            self._outcomes[outcome] += 1
+            for index, bound in enumerate(HISTOGRAM_BOUNDS):
+                if seconds <= bound:
+                    self._buckets[index] += 1
+                    break
+            else:
+                self._buckets[-1] += 1
+
+    def summary(self):
+        """Returns the wait histogram, percentiles and the current timeout for the summary JSON."""
+        timeout = self.current_timeout()
+        with self._lock:
+            waits = sorted(self._all_waits)
+            labels = [f"<={bound}s" for bound in HISTOGRAM_BOUNDS] + [f">{HISTOGRAM_BOUNDS[-1]}s"]
+            return {
+                "pages": len(waits),
+                "outcomes": dict(self._outcomes),
+                "p50_seconds": round(percentile(waits, 0.5), 3) if waits else None,
+                "p95_seconds": round(percentile(waits, 0.95), 3) if waits else None,
+                "max_seconds": round(waits[-1], 3) if waits else None,
+                "current_timeout_seconds": round(timeout, 2),
+                "histogram": dict(zip(labels, self._buckets)),
+            }
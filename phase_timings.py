@@ -0,0 +1,109 @@
+"""
+Per-phase timings of every chapter and page, for finding where a run spends its time.
+
+Each pool thread wraps the steps of a page in PhaseTrace.timed(phase): politeness
+wait, navigation, payload check, readiness wait, DOM transfer, parsing, cleaning,
+retry/pagination sleeps, and the HTTP fetch of the fast path. Phases can nest (cleaning
+runs inside parsing); each records its own time without its children, so the phases
+of a chapter add up to the chapter's total. The chapter and page come from a
+per-thread context, since a pool thread works on one chapter at a time.
+
+Every record is appended to a JSONL trace next to the summary, one object per line:
+
+    {"t": 12.482, "chapter": 41, "page": 1, "phase": "ready_wait", "seconds": 0.734, "stage": "ready"}
+
+and the summary gets count, total and p50/p90/p95/p99/max per phase. Comparing those
+between versions (or running benchmarks/trace_report.py on two traces) shows
+whether a change moved time between network, DOM waits and Python parsing.
+"""
+import collections
+import contextlib
+import json
+import threading
+import time
+
+from page_waits import percentile
+
+CHAPTER_PHASE = "chapter" # Whole-chapter wall time; not part of the per-page phases
+
+
+class PhaseTrace:
+    """Collects phase timings from the pool threads and streams them to a JSONL file (when a path is given)."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8') if path else None
+        self._start = time.monotonic()
+        self._durations = collections.defaultdict(list) # Phase -> every recorded duration
+        self._local = threading.local() # Per-thread chapter, page and stack of open phases
+        self._lock = threading.Lock()
+
+    def _context(self):
+        local = self._local
+        if not hasattr(local, "stack"):
+            local.chapter, local.page, local.stack = None, None, []
+        return local
+
+    def record(self, phase, seconds, chapter=None, page=None, **extra):
+        """Records one duration; chapter and page default to the calling thread's context."""
+        local = self._context()
+        entry = {"t": round(time.monotonic() - self._start, 3),
+                 "chapter": local.chapter if chapter is None else chapter,
+                 "page": local.page if page is None else page,
+                 "phase": phase, "seconds": round(seconds, 4), **extra}
+        with self._lock:
+            self._durations[phase].append(seconds)
+            if self._file:
+                self._file.write(json.dumps(entry) + "\n")
+
+    @contextlib.contextmanager
+    def chapter(self, chapter_num, **extra):
+        """Sets the thread's chapter for the phases inside and records the chapter's wall time."""
+        local = self._context()
+        local.chapter, local.page = chapter_num, None
+        start = time.monotonic()
+        try:
+            yield extra # The caller may add fields (fetch path, status) before the block ends
+        finally:
+            self.record(CHAPTER_PHASE, time.monotonic() - start, **extra)
+            local.chapter = local.page = None
+
+    def set_page(self, page_number):
+        self._context().page = page_number
+
+    @contextlib.contextmanager
+    def timed(self, phase, **extra):
+        """Times the block as `phase`, excluding phases nested inside it. Yields a dict for extra fields."""
+        stack = self._context().stack
+        frame = [0.0] # Seconds spent in nested phases
+        stack.append(frame)
+        start = time.monotonic()
+        try:
+            yield extra
+        finally:
+            elapsed = time.monotonic() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += elapsed
+            self.record(phase, elapsed - frame[0], **extra)
+
+    def summary(self):
+        """Count, total and percentiles per phase for the summary JSON, slowest total first."""
+        with self._lock:
+            durations = {phase: sorted(values) for phase, values in self._durations.items()}
+        phases = {}
+        for phase, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+            phases[phase] = {
+                "count": len(values),
+                "total_seconds": round(sum(values), 3),
+                **{f"p{int(fraction * 100)}_seconds": round(percentile(values, fraction), 4) for fraction in (0.5, 0.9, 0.95, 0.99)},
+                "max_seconds": round(values[-1], 4),
+            }
+        page_total = sum(stats["total_seconds"] for phase, stats in phases.items() if phase != CHAPTER_PHASE)
+        return {"trace_file": self.path, "page_phase_seconds": round(page_total, 3), "phases": phases}
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,188 @@
+"""
+Read-only access to the configuration profiles saved by the GUI, without Qt.
+
+The window stores its settings with QSettings (organization "YourCompanyName",
+application "WTRScraper"), which uses the registry on Windows, a property list
+on macOS and an INI file elsewhere. Each profile is a "ConfigProfile_<name>"
+group of string values. This module reads those stores directly so the
+headless command line can load a profile on machines without PySide6.
+"""
+import os
+import re
+import sys
+
+ORGANIZATION = "YourCompanyName"
+APPLICATION = "WTRScraper"
+PROFILE_PREFIX = "ConfigProfile_"
+
+DEFAULT_NUM_BROWSERS = "2" # Browser pool size of a new window, a profile saved without it and the command line
+
+# Profile keys and the values used when an (older) profile does not have them, as in MainWindow.load_config_profile
+PROFILE_DEFAULTS = {
+    "url": "", "start_chapter": "", "end_chapter": "", "batch_size": "",
+    "max_retries": "", "delay_between_attempts": "", "num_browsers": DEFAULT_NUM_BROWSERS,
+    "fetch_mode": "auto", "extractor_mode": "auto",
+    "cache_size_mb": "500", "cache_max_age_hours": "168", "block_mode": "all", "block_rules": "",
+    "title_match_threshold": "85",
+    "browser_recycle_pages": "300",
+    "browser_memory_mb": "1500",
+    "delay_mode": "fixed", "min_delay": "1.0", "max_delay": "15.0",
+    "base_filename": "", "output_directory": "", "cleaning_patterns": "", "title_patterns": "",
+}
+
+_INI_ESCAPES = {'a': '\a', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v',
+                '\\': '\\', '"': '"', "'": "'", '?': '?', ';': ';', ',': ',', '=': '='}
+
+
+def default_settings_path():
+    """Returns the INI file QSettings uses on Linux and other Unix systems."""
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(config_home, ORGANIZATION, f"{APPLICATION}.conf")
+
+
+def _decode_ini_key(key):
+    """Undoes QSettings' percent-encoding of group and key names (%XX and %UXXXX)."""
+    def replace(match):
+        return chr(int(match.group(1) or match.group(2), 16))
+    return re.sub(r'%U([0-9A-Fa-f]{4})|%([0-9A-Fa-f]{2})', replace, key)
+
+
+def _decode_ini_value(raw):
+    """Parses a QSettings INI value: quoted sections, backslash escapes and unquoted commas (string lists)."""
+    parts = []
+    current = []
+    in_quotes = False
+    i = 0
+    while i < len(raw):
+        char = raw[i]
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == '\\' and i + 1 < len(raw):
+            i += 1
+            escape = raw[i]
+            if escape == 'x':
+                hex_digits = re.match(r'[0-9A-Fa-f]{1,4}', raw[i + 1:])
+                if hex_digits:
+                    current.append(chr(int(hex_digits.group(0), 16)))
+                    i += len(hex_digits.group(0))
+            elif escape in '01234567':
+                oct_digits = re.match(r'[0-7]{1,3}', raw[i:]).group(0)
+                current.append(chr(int(oct_digits, 8)))
+                i += len(oct_digits) - 1
+            else:
+                current.append(_INI_ESCAPES.get(escape, escape))
+        elif char == ',' and not in_quotes:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    value = ''.join(current)
+    if parts:
+        return parts + [value.strip()]
+    if value.startswith('@@'):
+        value = value[1:] # QSettings doubles a leading '@' so it is not read as a variant type
+    return value
+
+
+def read_ini_settings(path):
+    """Returns {group: {key: value}} from a QSettings INI file. Top-level keys are in the "General" group."""
+    groups = {}
+    group = "General"
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(';'):
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                group = _decode_ini_key(line[1:-1])
+                continue
+            key, sep, value = line.partition('=')
+            if not sep:
+                continue
+            key = _decode_ini_key(key.strip())
+            if '/' in key: # Nested group written as a key path
+                sub_group, _, key = key.rpartition('/')
+                target = groups.setdefault(sub_group if group == "General" else f"{group}/{sub_group}", {})
+            else:
+                target = groups.setdefault(group, {})
+            target[key] = _decode_ini_value(value.strip())
+    return groups
+
+
+def _read_registry_settings():
+    """Returns {group: {key: value}} from the QSettings registry key on Windows."""
+    import winreg
+    groups = {}
+    root_path = rf"Software\{ORGANIZATION}\{APPLICATION}"
+    try:
+        root = winreg.OpenKey(winreg.HKEY_CURRENT_USER, root_path)
+    except OSError:
+        return groups
+    with root:
+        index = 0
+        while True:
+            try:
+                group = winreg.EnumKey(root, index)
+            except OSError:
+                break
+            index += 1
+            values = {}
+            with winreg.OpenKey(root, group) as group_key:
+                value_index = 0
+                while True:
+                    try:
+                        name, value, _ = winreg.EnumValue(group_key, value_index)
+                    except OSError:
+                        break
+                    value_index += 1
+                    values[name] = value
+            groups[group] = values
+    return groups
+
+
+def _read_plist_settings():
+    """Returns {group: {key: value}} from the QSettings property list on macOS (keys are stored as "group.key")."""
+    import plistlib
+    path = os.path.join(os.path.expanduser("~"), "Library", "Preferences",
+                        f"com.{ORGANIZATION.lower()}.{APPLICATION}.plist")
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'rb') as f:
+        data = plistlib.load(f)
+    groups = {}
+    for full_key, value in data.items():
+        group, sep, key = full_key.rpartition('.')
+        if sep:
+            groups.setdefault(group, {})[key] = value
+    return groups
+
+
+def read_settings(path=None):
+    """Returns every settings group of the GUI, from an explicit INI file or the platform's QSettings store."""
+    if path:
+        return read_ini_settings(path)
+    if sys.platform.startswith('win'):
+        return _read_registry_settings()
+    if sys.platform == 'darwin':
+        return _read_plist_settings()
+    ini_path = default_settings_path()
+    return read_ini_settings(ini_path) if os.path.exists(ini_path) else {}
+
+
+def list_profiles(path=None):
+    """Returns the sorted names of the saved configuration profiles."""
+    return sorted(group[len(PROFILE_PREFIX):] for group in read_settings(path) if group.startswith(PROFILE_PREFIX))
+
+
+def load_profile(profile_name, path=None):
+    """Returns a profile's values as strings (missing keys filled with their defaults), or None if it does not exist."""
+    group = read_settings(path).get(PROFILE_PREFIX + profile_name)
+    if group is None:
+        return None
+    profile = dict(PROFILE_DEFAULTS)
+    for key, value in group.items():
+        if isinstance(value, list):
+            value = ", ".join(value) # A string list means the value had unquoted commas; rejoin it
+        profile[key] = str(value)
+    return profile
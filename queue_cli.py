@@ -0,0 +1,144 @@
+"""
+Command line for the multi-novel job queue (see job_queue.py).
+
+    python -m queue_cli add --profile "Novel A" --priority 5
+    python -m queue_cli add --profile "Novel B"
+    python -m queue_cli list
+    python -m queue_cli run --max-browsers 4 --rate 0.5 --burst 2
+    python -m queue_cli pause 2        (from another terminal while "run" is going)
+    python -m queue_cli resume 2
+
+"add" takes the same job options as scraper_cli. Jobs live in a JSON state file
+(queue/jobs.json next to the scripts unless --state is given), so the queue
+survives restarts and a stopped or paused job continues from its journal.
+"""
+import argparse
+import signal
+import sys
+import threading
+
+from job_queue import DEFAULT_STATE_PATH, JobQueue, JobScheduler, TokenBucketLimiter
+from scraper_cli import ConsoleEvents, add_job_arguments, resolve_options
+from scraper_engine import WARNING
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m queue_cli", description="Manage and run the scrape job queue.")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="Queue state file (default: %(default)s).")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = commands.add_parser("add", help="Add a job (same options as scraper_cli).")
+    add_job_arguments(add_parser)
+    add_parser.add_argument("--name", help="Job name shown in the queue (default: the profile name or output prefix).")
+    add_parser.add_argument("--priority", type=int, default=0, help="Higher priorities run first (default 0).")
+
+    commands.add_parser("list", help="Show the jobs in the queue.")
+    for command, help_text in (("pause", "Pause a job; a running job stops after its current chapters."),
+                               ("resume", "Put a paused or finished job back in the queue."),
+                               ("remove", "Delete a job that is not running.")):
+        command_parser = commands.add_parser(command, help=help_text)
+        command_parser.add_argument("job_id", type=int)
+    priority_parser = commands.add_parser("priority", help="Change a job's priority.")
+    priority_parser.add_argument("job_id", type=int)
+    priority_parser.add_argument("priority", type=int)
+
+    run_parser = commands.add_parser("run", help="Run queued jobs until the queue is empty.")
+    run_parser.add_argument("--max-browsers", type=int, default=4, help="Browsers shared by all running jobs (default 4).")
+    run_parser.add_argument("--rate", type=float, default=0.5,
+                            help="Page loads per second allowed to each host, across all jobs (default 0.5).")
+    run_parser.add_argument("--burst", type=int, default=2, help="Page loads a host may get back to back (default 2).")
+    run_parser.add_argument("--watch", action="store_true", help="Keep waiting for new jobs when the queue is empty.")
+    run_parser.add_argument("--quiet", action="store_true", help="Only print warnings, errors and job progress.")
+    return parser
+
+
+def print_jobs(jobs):
+    if not jobs:
+        print("The queue is empty.")
+        return
+    print(f"{'ID':>4}  {'PRI':>4}  {'STATUS':<8}  {'CHAPTERS':<13}  {'RESULT':<14}  NAME")
+    for job in jobs:
+        options = job["options"]
+        chapters = f"{options['overall_start_chapter']}-{options['overall_end_chapter']}"
+        result = job.get("result")
+        if result and "error" in result:
+            result_text = "not started" # The engine could not be built from the job's options
+        else:
+            result_text = f"{result['successful']}/{result['total']} ok" if result else ""
+        if result and result.get("failed"):
+            result_text += f", {len(result['failed'])} failed"
+        print(f"{job['id']:>4}  {job['priority']:>4}  {job['status']:<8}  {chapters:<13}  {result_text:<14}  {job['name']}")
+
+
+def run_queue(args, job_queue):
+    limiter = TokenBucketLimiter(args.rate, args.burst)
+
+    def events_factory(job):
+        options = job["options"]
+        total = options["overall_end_chapter"] - options["overall_start_chapter"] + 1
+        return ConsoleEvents(total, quiet=args.quiet, prefix=f"[{job['name']}] ")
+
+    scheduler = JobScheduler(job_queue, args.max_browsers, limiter, events_factory=events_factory,
+                             exit_when_idle=not args.watch)
+    scheduler_events = ConsoleEvents(0, quiet=args.quiet, prefix="[queue] ")
+    scheduler.log = scheduler_events.log_message
+
+    # The scheduler runs in a thread so Ctrl+C reaches the main thread promptly; the first one stops gracefully
+    def handle_interrupt(signum, frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler) # A second Ctrl+C aborts immediately
+        scheduler.log("Interrupted. Stopping all jobs; they will resume on the next run (Ctrl+C again to abort)...", WARNING)
+        scheduler.stop()
+
+    signal.signal(signal.SIGINT, handle_interrupt)
+    scheduler_thread = threading.Thread(target=scheduler.run, name="JobScheduler")
+    scheduler_thread.start()
+    while scheduler_thread.is_alive():
+        scheduler_thread.join(0.5)
+    print_jobs(job_queue.jobs())
+    return 1 if any(job["status"] == "failed" or (job.get("result") or {}).get("failed")
+                    for job in job_queue.jobs() if job["status"] in ("done", "failed")) else 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    job_queue = JobQueue(args.state)
+
+    if args.command == "add":
+        options = resolve_options(args, parser)
+        name = args.name or args.profile or options["base_filename"]
+        job_id = job_queue.add(name, options, priority=args.priority)
+        print(f"Added job {job_id} ({name}), chapters {options['overall_start_chapter']}-{options['overall_end_chapter']}.")
+        return 0
+    if args.command == "list":
+        print_jobs(job_queue.jobs())
+        return 0
+    if args.command == "run":
+        return run_queue(args, job_queue)
+
+    job = job_queue.get(args.job_id)
+    if job is None:
+        print(f"No job with id {args.job_id}.", file=sys.stderr)
+        return 2
+    if args.command == "pause":
+        job_queue.pause(args.job_id)
+        print(f"Job {args.job_id} paused." + (" The running scheduler will stop it shortly." if job["status"] == "running" else ""))
+    elif args.command == "resume":
+        if job["status"] == "running":
+            print(f"Job {args.job_id} is already running.")
+        else:
+            job_queue.resume(args.job_id)
+            print(f"Job {args.job_id} queued.")
+    elif args.command == "remove":
+        if not job_queue.remove(args.job_id):
+            print(f"Job {args.job_id} is running; pause it first.", file=sys.stderr)
+            return 2
+        print(f"Job {args.job_id} removed.")
+    elif args.command == "priority":
+        job_queue.set_priority(args.job_id, args.priority)
+        print(f"Job {args.job_id} priority set to {args.priority}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Resource blocking for the headless browsers.
+
+Chapter text only needs the page's HTML and scripts, so images, web fonts,
+media, ad networks and analytics are blocked with the DevTools protocol
+(Network.setBlockedURLs). The block list is built from categories plus user
+rules: a rule is a URL pattern ('*' wildcards) that is added to the block list,
+or, prefixed with '!', a pattern that must never be blocked (it removes every
+block pattern it matches). To report what blocking saves, the first page of a
+run is loaded once without blocking as a calibration sample.
+"""
+import fnmatch
+import threading
+
+BLOCK_CATEGORIES = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m3u8"],
+    "ads": ["*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+            "*amazon-adsystem.com*", "*adnxs.com*", "*taboola.com*", "*outbrain.com*", "*popads.net*",
+            "*propellerads*", "*adsterra*", "*pubmatic.com*", "*rubiconproject.com*", "*criteo.*"],
+    "analytics": ["*google-analytics.com*", "*googletagmanager.com*", "*analytics.google.com*",
+                  "*facebook.net*", "*connect.facebook.*", "*hotjar.com*", "*clarity.ms*",
+                  "*cloudflareinsights.com*", "*scorecardresearch.com*", "*quantserve.com*", "*yandex.ru/metrika*"],
+}
+# Block modes offered in the GUI and on the command line
+BLOCK_MODES = {
+    "off": (),
+    "media": ("images", "fonts", "media"),
+    "all": ("images", "fonts", "media", "ads", "analytics"),
+}
+
+# Bytes and timings of the resources a page loaded, read from the Performance API after the page is ready
+PAGE_METRICS_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var total = nav ? (nav.transferSize || 0) : 0;
+var resources = performance.getEntriesByType('resource');
+for (var i = 0; i < resources.length; i++) { total += resources[i].transferSize || 0; }
+return {transfer_bytes: total, resources: resources.length, load_ms: nav ? nav.loadEventEnd - nav.startTime : null};
+"""
+
+
+def parse_block_rules(rules_text):
+    """Splits a rules string into (extra block patterns, never-block patterns)."""
+    blocked, allowed = [], []
+    for rule in (rules_text or "").replace(",", " ").split():
+        if rule.startswith("!"):
+            if len(rule) > 1:
+                allowed.append(rule[1:])
+        else:
+            blocked.append(rule)
+    return blocked, allowed
+
+
+def build_block_list(mode, rules_text=""):
+    """Returns the URL patterns to hand to Network.setBlockedURLs for a block mode and user rules."""
+    patterns = []
+    for category in BLOCK_MODES.get(mode, ()):
+        patterns.extend(BLOCK_CATEGORIES[category])
+    extra_blocked, allowed = parse_block_rules(rules_text)
+    patterns.extend(extra_blocked)
+    # An allow rule removes every block pattern it covers, e.g. "!*.svg" or "!*fonts.gstatic.com*"
+    patterns = [pattern for pattern in patterns
+                if not any(pattern == allow or fnmatch.fnmatchcase(pattern, allow) for allow in allowed)]
+    return list(dict.fromkeys(patterns)) # Drop duplicates, keep order
+
+
+def apply_block_list(driver, patterns):
+    """Enables (or, with an empty list, clears) URL blocking in a Chrome driver through the DevTools protocol."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+class BlockingStats:
+    """Collects per-page transfer sizes and load times of blocked pages and the unblocked calibration page."""
+
+    def __init__(self, mode, patterns):
+        self.mode = mode
+        self.patterns = patterns
+        self.calibration = None # {"transfer_bytes", "resources", "load_seconds"} of the unblocked sample
+        self._calibration_claimed = False
+        self._pages = 0
+        self._bytes = 0
+        self._resources = 0
+        self._load_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def claim_calibration(self):
+        """Returns True exactly once, for the browser that should load the unblocked calibration page."""
+        with self._lock:
+            if self._calibration_claimed or not self.patterns:
+                return False
+            self._calibration_claimed = True
+            return True
+
+    def record_calibration(self, metrics, load_seconds):
+        with self._lock:
+            self.calibration = {"transfer_bytes": metrics.get("transfer_bytes", 0),
+                                "resources": metrics.get("resources", 0),
+                                "load_seconds": round(load_seconds, 3)}
+
+    def record_page(self, metrics, load_seconds):
+        with self._lock:
+            self._pages += 1
+            self._bytes += metrics.get("transfer_bytes", 0)
+            self._resources += metrics.get("resources", 0)
+            self._load_seconds += load_seconds
+
+    def summary(self):
+        """Returns the blocking settings, per-page averages and the savings estimated from the calibration page."""
+        with self._lock:
+            data = {"mode": self.mode, "blocked_patterns": len(self.patterns), "pages_measured": self._pages}
+            if not self._pages:
+                return data
+            avg_bytes = self._bytes / self._pages
+            avg_load = self._load_seconds / self._pages
+            data.update(avg_transfer_bytes=round(avg_bytes), avg_resources=round(self._resources / self._pages, 1),
+                        avg_load_seconds=round(avg_load, 3))
+            if self.calibration and self.patterns:
+                saved_per_page = self.calibration["transfer_bytes"] - avg_bytes
+                data.update(calibration=self.calibration,
+                            est_bytes_saved_per_page=round(saved_per_page),
+                            est_bytes_saved_total=round(saved_per_page * self._pages),
+                            est_load_seconds_saved_per_page=round(self.calibration["load_seconds"] - avg_load, 3))
+            return data
@@ -0,0 +1,132 @@
+"""
+Retry scheduling for failed chapters: failure classes, per-class backoff with jitter, deferred retries.
+
+A failed chapter carries the failure class of its ChapterResult (a page that
+timed out, an empty chapter container and so on), and each class has its own
+number of retries and backoff. A slow site calls for patience, a crashed browser
+for a quick retry in a fresh browser, and an AI-registration wall for at most one
+late look. Instead of sleeping in the pool thread, or waiting for a
+retry pass at the end of the job, the retry goes into RetryScheduler with the time
+it becomes due. The pool threads take due retries between new chapters, so
+healthy chapters keep flowing while failed ones wait out their backoff.
+
+Backoff doubles with every retry of a chapter, up to the class's cap, with "equal
+jitter": half the delay is fixed and half random, so chapters that failed
+together (a site hiccup) do not all come back at the same moment.
+"""
+import collections
+import heapq
+import itertools
+import random
+import threading
+import time
+
+# --- Failure classes ---
+TIMEOUT = "timeout" # The page never became ready
+DRIVER_ERROR = "driver_error" # WebDriver raised, usually a crashed or hung browser
+EMPTY_BODY = "empty_body" # The chapter container rendered without text
+MISSING_BODY = "missing_body" # No chapter container: often a chapter that does not exist (yet)
+AI_BLOCK = "ai_block" # The AI-translation registration wall instead of the text
+NO_PAYLOAD = "no_payload" # "Embedded JSON only" on a page without a payload
+INCOMPLETE = "incomplete" # Some pages of the chapter were scraped, a later one failed
+BROWSER_UNAVAILABLE = "browser_unavailable" # Plain HTTP was not enough and the slot's Chrome could not be started
+UNKNOWN = "unknown"
+
+# Failure class -> (retries, first backoff as a multiple of the job's delay, longest backoff in seconds)
+DEFAULT_RETRY_CLASSES = {
+    TIMEOUT: (3, 2, 120), # Slow site or network: back off harder each time
+    DRIVER_ERROR: (2, 1, 30), # The health check gives the retry a fresh browser
+    EMPTY_BODY: (3, 1, 60), # The text usually arrives on a later load
+    INCOMPLETE: (2, 1, 60), # Retried as a whole chapter
+    MISSING_BODY: (1, 4, 300), # One late retry in case the chapter was being published
+    AI_BLOCK: (1, 8, 600), # Only a late retry can help, if the site serves the Google translation again
+    NO_PAYLOAD: (0, 0, 0), # Retrying cannot make a payload appear
+    BROWSER_UNAVAILABLE: (0, 0, 0), # Chrome failing to start (no chromedriver, usually) lasts the whole run
+    UNKNOWN: (1, 1, 60),
+}
+MIN_BASE_DELAY = 1.0 # Backoff base when the job runs without a delay
+PAGE_BACKOFF_CAP = 30.0 # Longest wait between attempts at one page inside a chapter
+
+
+def _equal_jitter(delay, rng):
+    return delay / 2 + rng.uniform(0, delay / 2)
+
+
+class RetryPolicy:
+    """How often and after how long each failure class is retried."""
+
+    def __init__(self, base_delay, classes=None, seed=None):
+        self.base_delay = max(base_delay, MIN_BASE_DELAY)
+        self.classes = dict(DEFAULT_RETRY_CLASSES, **(classes or {}))
+        self._random = random.Random(seed)
+
+    def max_retries(self, failure):
+        return self.classes.get(failure, self.classes[UNKNOWN])[0]
+
+    def backoff(self, failure, retry):
+        """Seconds before retry number `retry` (1 for the first) of a chapter that failed with `failure`."""
+        _, factor, cap = self.classes.get(failure, self.classes[UNKNOWN])
+        return _equal_jitter(min(cap, self.base_delay * factor * 2 ** (retry - 1)), self._random)
+
+    def page_backoff(self, attempt, delay):
+        """Seconds between attempt `attempt` and the next at one page: the job's delay doubled per attempt, with jitter."""
+        return _equal_jitter(min(PAGE_BACKOFF_CAP, max(delay, 0) * 2 ** (attempt - 1)), self._random)
+
+    def summary(self):
+        return {failure: {"retries": retries, "first_backoff_seconds": round(self.base_delay * factor, 1), "max_backoff_seconds": cap}
+                for failure, (retries, factor, cap) in self.classes.items()}
+
+
+class RetryScheduler:
+    """Failed chapters waiting for their retry, ordered by due time. Shared by the pool threads."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self._heap = [] # (due monotonic time, tie-breaker, chapter, failure, retry number)
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self.scheduled = collections.Counter() # Per failure class
+        self.recovered = collections.Counter()
+        self.gave_up = collections.Counter()
+
+    def schedule(self, chapter, failure, retry):
+        """
+        Defers retry number `retry` of a failed chapter. Returns the backoff in seconds,
+        or None when the failure class has no retries left (the chapter stays failed).
+        """
+        if retry > self.policy.max_retries(failure):
+            with self._lock:
+                self.gave_up[failure] += 1
+            return None
+        delay = self.policy.backoff(failure, retry)
+        with self._lock:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._order), chapter, failure, retry))
+            self.scheduled[failure] += 1
+        return delay
+
+    def requeue(self, chapter, failure, retry):
+        """Puts back a retry that was taken but could not run (no browser), due at once and not counted again."""
+        with self._lock:
+            heapq.heappush(self._heap, (time.monotonic(), next(self._order), chapter, failure, retry))
+
+    def pop_due(self):
+        """Returns (chapter, failure, retry number) of the earliest retry that is due, or None."""
+        with self._lock:
+            if self._heap and self._heap[0][0] <= time.monotonic():
+                return heapq.heappop(self._heap)[2:]
+        return None
+
+    def next_due_in(self):
+        """Seconds until the earliest waiting retry is due (0 if it already is), or None when none is waiting."""
+        with self._lock:
+            return max(0.0, self._heap[0][0] - time.monotonic()) if self._heap else None
+
+    def record_recovered(self, failure):
+        with self._lock:
+            self.recovered[failure] += 1
+
+    def summary(self):
+        """Retries per failure class for the summary JSON."""
+        with self._lock:
+            return {"policy": self.policy.summary(), "scheduled": dict(self.scheduled), "recovered": dict(self.recovered),
+                    "gave_up": dict(self.gave_up), "still_waiting": len(self._heap)}
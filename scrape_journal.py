@@ -0,0 +1,147 @@
+"""
+Crash-safe checkpoint journal for scrape jobs.
+
+The journal is an append-only JSON Lines file in the output directory. The first
+record describes the job; every finished chapter appends one record with its
+title and content. Records are flushed immediately and fsync'd in batches, so a
+crash loses at most the last few chapters, and a torn final line is ignored when
+the journal is loaded again. The byte offset of each chapter's best record is
+indexed, so single chapters can be read back without loading the whole journal.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+# Rank used when a chapter has several records: a success beats partial content, which beats a failure
+_STATUS_RANK = {"failed": 0, "partial": 1, "success": 2}
+
+
+def journal_path(output_directory, base_filename):
+    """Returns the journal file path for a job's output directory and file prefix."""
+    safe_name = re.sub(r'[\\/:*?"<>|]', '_', f"{base_filename}_journal.jsonl")
+    return os.path.join(output_directory, safe_name)
+
+
+def load_journal(path, include_content=True):
+    """
+    Reads a journal and returns (job_info, chapters), where chapters maps each chapter
+    number to its best record. Returns (None, {}) if the journal does not exist.
+    With include_content=False the chapter text is dropped so only statuses are kept in memory.
+    """
+    job_info = None
+    chapters = {}
+    if not os.path.exists(path):
+        return job_info, chapters
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue # Torn write from a crash, skip it
+            if record.get("type") == "job":
+                job_info = record
+            elif record.get("type") == "chapter":
+                if not include_content:
+                    record["has_content"] = record.pop("content", None) is not None
+                chapter_num = record["chapter"]
+                previous = chapters.get(chapter_num)
+                if previous is None or _STATUS_RANK[record["status"]] >= _STATUS_RANK[previous["status"]]:
+                    chapters[chapter_num] = record
+    return job_info, chapters
+
+
+class ScrapeJournal:
+    """Appends chapter records for a running job, fsync'ing every few records."""
+
+    def __init__(self, path, job_info, resume=False, fsync_every=10):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        self._content_offsets = {} # {chapter: (status rank, byte offset)} of the best record that has content
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Binary mode keeps tell() a true byte offset on every platform
+        if resume and os.path.exists(path):
+            self._index_existing()
+            self._file = open(path, 'ab')
+            if self._file.tell() > 0 and not self._ends_with_newline(path):
+                self._file.write(b"\n") # Keep the next record off a torn final line
+            self._append({"type": "resume", "time": time.time()})
+        else:
+            self._file = open(path, 'wb')
+            self._append({"type": "job", "time": time.time(), **job_info})
+        self.sync()
+
+    @staticmethod
+    def _ends_with_newline(path):
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _index_existing(self):
+        """Builds the chapter offset index from the records already in the journal."""
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None # Torn write from a crash
+                if record and record.get("type") == "chapter":
+                    self._index_record(record, offset)
+                offset += len(line)
+
+    def _index_record(self, record, offset):
+        if record.get("content") is None:
+            return
+        rank = _STATUS_RANK[record["status"]]
+        previous = self._content_offsets.get(record["chapter"])
+        if previous is None or rank >= previous[0]:
+            self._content_offsets[record["chapter"]] = (rank, offset)
+
+    def _append(self, record):
+        offset = self._file.tell()
+        self._file.write((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+        self._file.flush()
+        self._unsynced += 1
+        return offset
+
+    def record_chapter(self, chapter_num, status, title, content=None, **extra):
+        """Appends one finished chapter ("success", "partial" or "failed")."""
+        record = {"type": "chapter", "chapter": chapter_num, "status": status, "title": title,
+                  "content": content, "time": time.time(), **extra}
+        with self._lock:
+            offset = self._append(record)
+            self._index_record(record, offset)
+            if self._unsynced >= self.fsync_every:
+                self._sync_locked()
+
+    def read_chapter(self, chapter_num):
+        """Returns (title, content) of a chapter's best record with content, or None."""
+        with self._lock:
+            entry = self._content_offsets.get(chapter_num)
+            if entry is None:
+                return None
+            self._file.flush()
+        with open(self.path, 'rb') as f:
+            f.seek(entry[1])
+            record = json.loads(f.readline())
+        return record["title"], record["content"]
+
+    def _sync_locked(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def sync(self):
+        """Forces buffered records to disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self):
+        """Syncs and closes the journal file."""
+        with self._lock:
+            if not self._file.closed:
+                self._sync_locked()
+                self._file.close()
@@ -1,20 +1,8 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-import time
 import os
 import sys
-import shutil
 import subprocess
 import datetime
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-# --- Import StaleElementReferenceException ---
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
-
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QHBoxLayout, QGridLayout, QLabel, QLineEdit,
                                QPushButton, QTextEdit, QProgressBar, QGroupBox, QSplitter,
@@ -27,615 +15,65 @@ from PySide6.QtCore import QThread, Signal, Slot, QSettings, QCoreApplication, Q
 from PySide6.QtGui import QTextCursor
 import re
 
-from thefuzz import fuzz # Import fuzzy matching
-# --- Severity Levels for Logging ---
-INFO = 0
-WARNING = 1
-ERROR = 2
-CRITICAL = 3
+from browser_service import BrowserService
+from log_buffer import LogBuffer, debug_logger
+from profile_store import DEFAULT_NUM_BROWSERS
+from scrape_journal import journal_path, load_journal
+# The scraping itself lives in scraper_engine so it can also run headless (see scraper_cli.py)
+from scraper_engine import DEBUG, INFO, WARNING, ERROR, CRITICAL, ScrapeEngine, ScrapeEvents, check_chromedriver
 
+LOG_FLUSH_INTERVAL_MS = 150 # How often buffered log records are written to the log view
+LOG_MAX_LINES = 5000 # The log view drops its oldest lines beyond this
 
 # --- Worker Thread for Scraping ---
 
+class _SignalEvents(ScrapeEvents):
+    """Forwards ScrapeEngine callbacks to the worker's Qt signals."""
+
+    def __init__(self, worker):
+        self.worker = worker
+
+    def log_message(self, message, severity):
+        # No signal per message: records wait in the shared buffer until the window's flush timer drains them
+        if severity == DEBUG:
+            self.worker.debug_log.debug(message.strip())
+        else:
+            self.worker.log_buffer.append(datetime.datetime.now(), message, severity)
+    def progress_updated(self, chapters_processed): self.worker.progress_updated.emit(chapters_processed)
+    def saving_error(self, message): self.worker.saving_error.emit(message)
+    def critical_error(self, message): self.worker.critical_error.emit(message)
+    def finished(self): self.worker.finished.emit()
+    def current_chapter_status(self, status): self.worker.current_chapter_status.emit(status)
+    def scrape_summary(self, successful_count, failed_chapters): self.worker.scrape_summary.emit(successful_count, failed_chapters)
+    def estimated_time_updated(self, text): self.worker.estimated_time_updated.emit(text)
+    def request_rate_updated(self, pages_per_minute, delay_seconds): self.worker.request_rate_updated.emit(pages_per_minute, delay_seconds)
+
+
 class ScrapingWorker(QThread):
-    # Modified signal to include severity level (int)
-    log_message = Signal(str, int)
     progress_updated = Signal(int)
-    chapter_scraped = Signal(str, str, int)
     saving_error = Signal(str)
     critical_error = Signal(str)
     finished = Signal()
     current_chapter_status = Signal(str) # Signal for detailed status updates
     scrape_summary = Signal(int, list) # Signal to send summary data
     estimated_time_updated = Signal(str)
+    request_rate_updated = Signal(float, float) # Pages per minute and the current politeness delay
 
 
-    def __init__(self, base_url_pattern, overall_start_chapter, overall_end_chapter, batch_size, base_filename, output_directory, max_retries, delay_between_attempts, cleaning_patterns):
+    def __init__(self, *args, log_buffer=None, **kwargs):
+        """Takes the ScrapeEngine arguments; the engine does the work, this class only bridges it to Qt."""
         super().__init__()
-        self.base_url_pattern = base_url_pattern
-        self.overall_start_chapter = overall_start_chapter
-        self.overall_end_chapter = overall_end_chapter
-        self.batch_size = batch_size
-        self.base_filename = base_filename
-        self.output_directory = output_directory
-        self.max_retries = max_retries
-        self.delay_between_attempts = delay_between_attempts
-        self.cleaning_patterns = cleaning_patterns # Store cleaning patterns
-        self._is_running = True
-        self.failed_chapters = []
-        self.successful_chapters_count = 0
-        self._start_time = None
-        self.successful_content = {} # Store {chapter_num: (title, content)}
-        self.scrape_results = [] # List to store detailed results
-
+        self.log_buffer = log_buffer or LogBuffer() # Log records for the window, drained on its timer
+        self.debug_log = debug_logger() # DEBUG records go to logs/scraper_debug.log, not the window
+        self.engine = ScrapeEngine(*args, events=_SignalEvents(self), **kwargs)
 
     def run(self):
-        """The main logic that runs in the separate thread."""
-        self._start_time = time.time()
-        driver = None
-        try:
-            self.log_message.emit(f"Scraping chapters {self.overall_start_chapter} to {self.overall_end_chapter} in batches of {self.batch_size}...", INFO)
-
-            chrome_options = webdriver.ChromeOptions()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu') # Add this line to disable GPU acceleration
-            chrome_options.add_argument('--log-level=3') # Suppress INFO/WARNING messages from Chrome
-            chrome_options.add_argument('--disable-software-rasterizer') # Add this
-            chrome_options.add_argument('--disable-features=VizDisplayCompositor') # Add this
-            chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-
-            self.log_message.emit("Starting Chrome browser...", INFO)
-            driver = webdriver.Chrome(options=chrome_options)
-
-            chapters_processed_count = 0
-            total_chapters_to_scrape = self.overall_end_chapter - self.overall_start_chapter + 1
-
-
-            for batch_index, batch_start_chapter in enumerate(range(self.overall_start_chapter, self.overall_end_chapter + 1, self.batch_size)):
-                if not self._is_running: break
-
-                batch_end_chapter = min(batch_start_chapter + self.batch_size - 1, self.overall_end_chapter)
-                chapters_in_batch = batch_end_chapter - batch_start_chapter + 1
-                current_batch_number = batch_index + 1
-                total_batches = (total_chapters_to_scrape + self.batch_size - 1) // self.batch_size
-
-
-                self.log_message.emit(f"\n--- Scraping batch {current_batch_number} of {total_batches}: Chapters {batch_start_chapter} to {batch_end_chapter} ---", INFO)
-
-                batch_content = []
-
-
-                for i, chapter_num in enumerate(range(batch_start_chapter, batch_end_chapter + 1)):
-                    if not self._is_running: break
-
-                    self.current_chapter_status.emit(f"Batch {current_batch_number} of {total_batches}, Chapter {chapter_num} ({i + 1} of {chapters_in_batch} in batch)...")
-
-                    # --- Append Google Translate parameter ---
-                    chapter_url = f"{self.base_url_pattern}{chapter_num}?service=google"
-                    title, content = self.scrape_single_chapter(driver, chapter_url, chapter_num,
-                                                                max_retries=self.max_retries,
-                                                                delay_between_attempts=self.delay_between_attempts,
-                                                                cleaning_patterns=self.cleaning_patterns) # Pass patterns
-
-                    # Check if substantial content was actually scraped
-                    # Check includes handling potential None return, "Content Not Found" marker, and empty strings after stripping markers/whitespace.
-                    is_content_found = content and \
-                                       "Content Not Found" not in content and \
-                                       len(content.replace("\n\n--- Page Break ---\n\n", "").replace("\n\n--- Incomplete Chapter ---\n\n", "").strip()) > 0
-
-                    if is_content_found:
-                        self.log_message.emit(f"  Successfully scraped: {title}", INFO)
-                        # Add full content including title
-                        # batch_content.append(f"{title}\n\n{content}\n\n") # Don't append here
-                        self.successful_content[chapter_num] = (title, content) # Store content
-                        self.chapter_scraped.emit(title, content, chapter_num) # Signal might be used for detailed GUI updates later
-                        self.scrape_results.append({"chapter": chapter_num, "status": "success", "title": title, "output_file": None}) # Placeholder for filename
-                        self.successful_chapters_count += 1
-                    else:
-                        # Handle cases where content wasn't found or was marked incomplete/empty
-                        if "Content Not Found" in content:
-                            log_msg = f"  Content not found for chapter {chapter_num} ({title}). Adding to failed list."
-                            log_level = WARNING
-                        elif "Incomplete Chapter" in content: # Check for the marker added by scrape_single_chapter
-                             log_msg = f"  Scraping incomplete for chapter {chapter_num} ({title}). Adding to failed list, saving partial content."
-                             log_level = WARNING
-                             # Still add the partial content to the batch file
-                             # batch_content.append(f"{title}\n\n{content}\n\n") # Don't append here
-                             self.successful_content[chapter_num] = (title, content) # Store partial content too
-                        else: # General failure or empty content after scraping attempts
-                            log_msg = f"  Failed to scrape substantial content for chapter {chapter_num} ({title}). Adding to failed list."
-                            log_level = ERROR
-
-                        self.log_message.emit(log_msg, log_level)
-                        # Add placeholder to batch file only if it wasn't partial content that got saved above
-                        if "Incomplete Chapter" not in content:
-                             pass # Don't add placeholder content here
-                        self.scrape_results.append({"chapter": chapter_num, "status": "failed", "title": title, "url": chapter_url})
-                        self.failed_chapters.append(chapter_num)
-
-
-                    chapters_processed_count += 1
-                    self.progress_updated.emit(chapters_processed_count)
-
-
-
-                # Update estimated time after each chapter is processed
-                elapsed_time = time.time() - self._start_time
-                if chapters_processed_count > 0:
-                    time_per_chapter = elapsed_time / chapters_processed_count
-                    remaining_chapters = total_chapters_to_scrape - chapters_processed_count
-                    estimated_remaining_time = time_per_chapter * remaining_chapters
-                    self.estimated_time_updated.emit(f"Estimated Time Remaining: {self.format_time(estimated_remaining_time)}")
-
-
-                # Add a small delay between scraping chapters within a batch if needed
-                # time.sleep(0.5) # Already have delay_between_attempts after the batch save
-
-                if not self._is_running: break # Check again after saving batch
-                time.sleep(self.delay_between_attempts)
-
-            # --- Automatic Retry Phase ---
-            if self.failed_chapters and self._is_running:
-                self.log_message.emit(f"\n--- Starting retry phase for {len(self.failed_chapters)} failed chapters ---", INFO)
-                chapters_to_retry = list(self.failed_chapters) # Create a copy to iterate over
-                retried_count = 0
-
-                for chapter_num in chapters_to_retry:
-                    if not self._is_running:
-                        self.log_message.emit("Stop requested during retry phase.", WARNING)
-                        break
-
-                    self.current_chapter_status.emit(f"Retrying Chapter {chapter_num}...")
-                    self.log_message.emit(f"  Retrying chapter {chapter_num}...", INFO)
-
-                    chapter_url = f"{self.base_url_pattern}{chapter_num}?service=google"
-                    title, content = self.scrape_single_chapter(driver, chapter_url, chapter_num,
-                                                                max_retries=self.max_retries, # Use the same retry settings
-                                                                delay_between_attempts=self.delay_between_attempts,
-                                                                cleaning_patterns=self.cleaning_patterns) # Pass patterns
-
-                    is_content_found = content and \
-                                       "Content Not Found" not in content and \
-                                       len(content.replace("\n\n--- Page Break ---\n\n", "").replace("\n\n--- Incomplete Chapter ---\n\n", "").strip()) > 0
-
-                    if is_content_found:
-                        self.log_message.emit(f"    Successfully retried: {title}", INFO)
-                        self.successful_content[chapter_num] = (title, content) # Store retried content
-                        if chapter_num in self.failed_chapters: # Check if still present before removing
-                            self.failed_chapters.remove(chapter_num)
-
-                        # Update the result status for this chapter
-                        target_filepath = None # Output file will be determined later
-                        for result in self.scrape_results:
-                            if result["chapter"] == chapter_num:
-                                result["status"] = "retried_success" # Mark as retried
-                                result["output_file"] = target_filepath # Point to the batch file it was appended to
-                        self.successful_chapters_count += 1 # Increment overall success count
-                        retried_count += 1
-                        # Optionally update progress bar slightly? Or just log.
-                        # self.progress_updated.emit(chapters_processed_count + retried_count) # This might exceed max value, maybe better not to update progress here
-                    else:
-                        # Log failure again, maybe with less detail
-                        self.log_message.emit(f"    Retry failed for chapter {chapter_num} ({title}).", WARNING)
-
-                    time.sleep(self.delay_between_attempts) # Delay between retries
-
-
-            # --- End of Automatic Retry Phase ---
-
-
-        except Exception as e:
-            self.log_message.emit(f"\nAn unexpected error occurred during the scraping process: {e}", CRITICAL)
-            self.critical_error.emit(f"An unexpected error occurred during scraping: {e}. See log for details.")
-
-        finally:
-            if driver:
-                self.log_message.emit("Entering finally block, attempting to close driver...", INFO)
-                self.log_message.emit("\nClosing Chrome browser...", INFO)
-                driver.quit()
-                self.log_message.emit("Driver quit successfully.", INFO)
-            else:
-                self.log_message.emit("Entering finally block, driver was not active.", INFO)
-
-            # --- Save Summary JSON ---
-            self.log_message.emit("Attempting to save summary JSON...", INFO)
-            # --- Define and create summary directory ---
-            script_dir = os.path.dirname(__file__) # Get directory of the script
-            summary_dir = os.path.join(script_dir, 'summary')
-            os.makedirs(summary_dir, exist_ok=True)
-            summary_filename = f"{self.base_filename}_summary.json"
-            safe_summary_filename = re.sub(r'[\\/:*?"<>|]', '_', summary_filename) # Use base_filename from input for summary
-            summary_filepath = os.path.join(summary_dir, safe_summary_filename) # Save in summary_dir
-            summary_data = {
-                "total_chapters_attempted": self.overall_end_chapter - self.overall_start_chapter + 1,
-                "successful_count": self.successful_chapters_count,
-                "failed_count": len(self.failed_chapters),
-                "results": sorted(self.scrape_results, key=lambda x: x['chapter']) # Sort results by chapter number
-            }
-            try:
-                with open(summary_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(summary_data, f, indent=4)
-                self.log_message.emit(f"Saved scrape summary to {summary_filepath}", INFO)
-            except Exception as e:
-                self.log_message.emit(f"Error saving summary JSON to {summary_filepath}: {e}", ERROR)
-            self.log_message.emit("Finished saving summary JSON.", INFO)
-            # --- End Save Summary JSON ---
-
-            # Emit scrape summary data
-            self.log_message.emit("Emitting scrape_summary signal...", INFO)
-            self.scrape_summary.emit(self.successful_chapters_count, self.failed_chapters) # Keep summary signal
-            self.estimated_time_updated.emit("Estimated Time Remaining: N/A")
-
-            self.log_message.emit("Emitting finished signal...", INFO)
-            self.log_message.emit("\n--- Scraping process finished ---", INFO)
-            self.finished.emit()
-
+        self.engine.run()
 
     @Slot()
     def stop(self):
         """Slot to be called from the main thread to stop the worker."""
-        self.log_message.emit("Stop signal received. Attempting graceful shutdown...", INFO)
-        self._is_running = False
-
-    def _clean_title_prefix(self, title_str):
-        """Removes common prefixes like 'Chapter X:', '#X', etc. for comparison."""
-        if not title_str: return ""
-        cleaned = title_str.strip()
-        # Define patterns once
-        patterns = [
-            r'^#\s*\d+\s*',                 # Matches #123 at the start
-            r'^Chapter\s*\d+\s*[:\-–—]\s*', # Matches Chapter 123: or Chapter 123 -
-            r'^\d+\s*[:\-–—]\s*',           # Matches 123 -
-            r'^Chapter\s*\d+\s+',           # Matches Chapter 123 followed by space
-            r'^\d+\s+',                     # Matches 123 followed by space (e.g., "21 Title")
-        ]
-        # Loop until no pattern makes a change in a full pass
-        while True:
-            previous_cleaned = cleaned
-            for pattern in patterns:
-                # Apply each pattern once per outer loop iteration
-                cleaned = re.sub(pattern, '', cleaned, count=1, flags=re.IGNORECASE).strip()
-            # If no changes were made in this full pass, break
-            if cleaned == previous_cleaned:
-                break
-        return cleaned
-
-    # --- Corrected scrape_single_chapter with pagination handling ---
-    def scrape_single_chapter(self, driver, url, chapter_num, max_retries, delay_between_attempts, cleaning_patterns):
-        """
-        Scrapes a single chapter, including handling pagination within the chapter.
-        Returns the chapter title and concatenated content.
-        """
-        chapter_title_text = "Title Not Found"
-        all_chapter_content = []
-        current_url = url # Start with the initial chapter URL
-        page_number = 1 # Track page number within the chapter
-        chapter_fully_scraped = False # Flag to indicate if all pages were successfully scraped
-
-
-        while self._is_running: # Outer loop for iterating through pages
-            page_content = None # Content for the current page
-            page_successfully_loaded = False # Flag to indicate if the current page was loaded successfully after retries
-            next_page_link = None # Reset for each page iteration
-
-
-            for attempt in range(1, max_retries + 1): # Inner loop for retrying the current page load
-                if not self._is_running: break # Stop if requested during retries
-
-                try:
-                    self.log_message.emit(f"  Attempt {attempt}/{max_retries} for chapter {chapter_num} (Page {page_number}: {current_url})...", INFO)
-                    driver.get(current_url)
-
-                    try:
-                        # Wait for chapter body to load
-                        chapter_body_container = WebDriverWait(driver, 20).until(
-                            EC.presence_of_element_located((By.CLASS_NAME, 'chapter-body'))
-                        )
-
-                        # --- Wait for actual content (e.g., a paragraph) to appear ---
-                        try:
-                            # --- Wait for ANY text to be present in the container ---
-                            WebDriverWait(driver, 20).until( # Increased wait slightly to 20s
-                                EC.text_to_be_present_in_element((By.CLASS_NAME, 'chapter-body'), '.') # Wait for any char '.'
-                            )
-                            self.log_message.emit(f"    Content paragraph appeared for chapter {chapter_num} (Page {page_number}).", INFO)
-
-                            # --- Explicitly wait for placeholder HTML to disappear (Loop Check) ---
-                            max_placeholder_checks = 12 # Check up to 12 times (e.g., 12 * 0.25s = 3 seconds)
-                            for check_count in range(max_placeholder_checks):
-                                try:
-                                    # --- Re-find the element inside the loop to avoid staleness ---
-                                    current_container = driver.find_element(By.CLASS_NAME, 'chapter-body')
-                                    inner_html = current_container.get_attribute('innerHTML')
-                                # --- Add specific handling for StaleElementReferenceException ---
-                                except StaleElementReferenceException:
-                                    self.log_message.emit(f"    StaleElementReferenceException during placeholder check loop. Assuming element changed.", WARNING)
-                                    break # Exit the placeholder check loop
-                                except NoSuchElementException: # Keep existing NoSuchElementException handling
-                                    self.log_message.emit(f"    Chapter body container disappeared during placeholder check loop.", WARNING); break
-                                if 'placeholder-glow' not in inner_html:
-                                    break
-                                time.sleep(0.25) # Wait a bit before checking again
-                            else: # If loop finishes without break
-                                self.log_message.emit(f"    Placeholder HTML might still be present after extra wait for chapter {chapter_num} (Page {page_number}).", WARNING)
-                            # --- End Placeholder Loop Check ---
-
-                        except TimeoutException:
-                            self.log_message.emit(f"    Timed out waiting for content paragraph to appear for chapter {chapter_num} (Page {page_number}). Content might be missing or still loading.", WARNING)
-                        page_successfully_loaded = True # Mark page as loaded even if placeholder didn't disappear (might still have content)
-                    except TimeoutException:
-                        self.log_message.emit(f"  Timed out waiting for chapter-body container on {current_url} for chapter {chapter_num}.", WARNING)
-                        page_successfully_loaded = False # Failed to find the main container
-                    except Exception as e:
-                         self.log_message.emit(f"  Error loading page {page_number} on attempt {attempt}: {e}", ERROR)
-                         page_successfully_loaded = False
-
-
-                    if page_successfully_loaded:
-                         page_source = driver.page_source
-                         soup = BeautifulSoup(page_source, 'html.parser')
-
-                         # Extract Title (only need this from the first page)
-                         # --- Prioritize H3 title, then breadcrumb, clean immediately ---
-                         if page_number == 1:
-                             title_element = soup.find('h3', class_='chapter-title')
-                             if title_element:
-                                 # Clean the H3 title immediately
-                                 chapter_title_text = self._clean_title_prefix(title_element.get_text(strip=True))
-                             elif chapter_title_text == "Title Not Found": # Check if still not found
-                                 # Fallback to breadcrumb if H3 not found
-                                 breadcrumb_title_element = soup.select_one('.breadcrumb-item.active')
-                                 if breadcrumb_title_element:
-                                     breadcrumb_text = breadcrumb_title_element.get_text(strip=True)
-                                     # Try cleaning the breadcrumb text too
-                                     chapter_title_text = self._clean_title_prefix(breadcrumb_text)
-                             # If still not found after both, it remains "Title Not Found"
-
-                             self.log_message.emit(f"    Extracted/Cleaned Title (Page 1): '{chapter_title_text}'", INFO) # Log the final title used
-
-
-                         # Extract Content for the current page
-                         # --- Find container initially for checks ---
-                         content_container_initial = soup.find('div', class_='chapter-body')
-
-                         if content_container_initial:
-                             # --- Re-find container right before text extraction ---
-                             soup_refind = BeautifulSoup(page_source, 'html.parser') # Re-parse (quick)
-                             content_container = soup_refind.find('div', class_='chapter-body')
-                             if not content_container: # If it disappeared between checks
-                                 self.log_message.emit(f"    Content container disappeared between initial check and text extraction on Page {page_number}.", WARNING)
-                                 page_content = "Content Not Found (Container Vanished)"
-                             else:
-                                 # --- Attempt to remove duplicated title element from within content ---
-                                 inner_title_element = content_container.find('h3') # Try finding h3 first
-                                 if inner_title_element:
-                                     # Optional: Check if its text roughly matches the extracted title for more safety
-                                     # if chapter_title_text != "Title Not Found" and chapter_title_text in inner_title_element.get_text(strip=True):
-                                     self.log_message.emit(f"    Found and removing inner title element: {inner_title_element.get_text(strip=True)}", INFO)
-                                     inner_title_element.extract() # Remove the element from the container
-                                 # --- End removal attempt ---
-
-                                 # Get all text nodes, preserving some structure with separators
-                                 page_content = content_container.get_text(separator='\n', strip=True) # Use re-found container
-
-                                 # --- Attempt to remove duplicated title from first line of content ---
-                                 # Use a loop to remove potentially multiple title lines at the start
-                                 if page_content and chapter_title_text != "Title Not Found":
-                                     lines = page_content.split('\n')
-                                     # Clean the main chapter title ONCE before the loop
-                                     core_chapter_title = self._clean_title_prefix(chapter_title_text)
-                                     removed_count = 0
-                                     while lines: # Loop while there are lines left
-                                         current_first_line_cleaned = lines[0].strip()
-                                         if not current_first_line_cleaned: # Skip empty lines at the start
-                                             lines.pop(0); continue
-
-                                         # Remove potential prefix like '#21' before comparison
-                                         # Use the helper function for cleaning
-                                         core_first_line = self._clean_title_prefix(current_first_line_cleaned)
-
-                                         # Compare core text: Use fuzzy matching after cleaning
-                                         match_found = False
-                                         if core_first_line and core_chapter_title:
-                                             cl_lower = core_first_line.lower()
-                                             ct_lower = core_chapter_title.lower()
-
-                                             # Use token_set_ratio for flexibility with word order/minor diffs
-                                             similarity_ratio = fuzz.token_set_ratio(cl_lower, ct_lower)
-
-                                             # Set a threshold (e.g., 85). Adjust as needed.
-                                             if similarity_ratio > 85: # Threshold for considering it a match
-                                                 match_found = True
-                                                 self.log_message.emit(f"    Fuzzy Match Success (Ratio: {similarity_ratio}): Line='{core_first_line}' | Title='{core_chapter_title}'", INFO)
-                                         if match_found:
-                                             self.log_message.emit(f"    Found and removing duplicated title line: {lines[0]}", INFO)
-                                             lines.pop(0) # Remove the first line
-                                             removed_count += 1
-                                         else:
-                                             break # Stop if the first line doesn't match
-                                     if removed_count > 0:
-                                         page_content = '\n'.join(lines) # Reassemble content only if lines were removed
-                                 # --- End duplicated title removal loop ---
-                                 # --- Check for AI Translation/Registration Block ---
-                                 ai_block_keywords = ["AI Translation Requires Registration", "Sign up for free", "Google Translation"]
-                                 if page_content and all(keyword in page_content for keyword in ai_block_keywords):
-                                     self.log_message.emit(f"    Detected 'AI Translation Requires Registration' block on Page {page_number} ({current_url}). Treating as content not found.", WARNING)
-                                     page_content = "Content Not Found (AI Translation Block)" # Specific marker
-                                 # --- End AI Block Check ---
-
-                                 if page_content: # Check if get_text actually returned something
-                                     # Avoid logging success if it's the AI block marker
-                                     if page_content != "Content Not Found (AI Translation Block)":
-                                         self.log_message.emit(f"    Scraped content from Page {page_number} using get_text()", INFO)
-                                     # No else needed here, the AI block case logs its own message above
-                                 else:
-                                     self.log_message.emit(f"    Content container found, but get_text() returned empty content on Page {page_number} ({current_url}).", WARNING)
-                                     page_content = "Content Not Found (Container Empty)" # Explicitly mark as empty
-
-                                 # --- Apply Cleaning Patterns ---
-                                 if page_content and cleaning_patterns:
-                                     lines = page_content.split('\n')
-                                     cleaned_lines = []
-                                     for line in lines:
-                                         line_stripped = line.strip()
-                                         if line_stripped not in cleaning_patterns: # Simple exact match (case-sensitive)
-                                             cleaned_lines.append(line) # Keep original line with original whitespace
-                                     page_content = '\n'.join(cleaned_lines)
-                                 # --- End Apply Cleaning Patterns ---
-
-                         else:
-                             self.log_message.emit(f"    Content container not found on Page {page_number} ({current_url}).", WARNING)
-                             page_content = "Content Not Found (Container Missing)"
-
-
-                         # --- Check for Pagination Links ---
-                         pagination_container = soup.select_one('.chapter-pager')
-                         if pagination_container:
-                             next_link_element = None
-                             next_link_element = pagination_container.find('a', rel='next')
-                             if not next_link_element:
-                                  next_link_element = pagination_container.find('a', string=re.compile(r'next', re.IGNORECASE))
-                             if not next_link_element:
-                                 next_link_element = pagination_container.find('a', class_='pager-next')
-                             if not next_link_element:
-                                 next_link_element = pagination_container.find('a', string=re.compile(r'>>?'))
-
-
-                             if next_link_element and 'href' in next_link_element.attrs:
-                                 next_page_url_relative = next_link_element['href']
-                                 if not next_page_url_relative.startswith('http'):
-                                      scheme_netloc_match = re.match(r"(https?://[^/]+)", url)
-                                      base_url_parts = scheme_netloc_match.group(1) if scheme_netloc_match else ""
-
-                                      if base_url_parts and next_page_url_relative.startswith('/'):
-                                           next_page_link = base_url_parts + next_page_url_relative
-                                      else:
-                                           base_path = url.rsplit('/', 1)[0]
-                                           next_page_link = base_path + '/' + next_page_url_relative.lstrip('/')
-
-                                 else:
-                                      next_page_link = next_page_url_relative
-
-                                 # --- Ensure Google Translate parameter is on next page link ---
-                                 if 'service=google' not in next_page_link:
-                                     if '?' in next_page_link:
-                                         next_page_link += '&service=google'
-                                     else:
-                                         next_page_link += '?service=google'
-                                 self.log_message.emit(f"    Found/Adjusted next page link: {next_page_link}", INFO)
-                             else:
-                                 self.log_message.emit(f"    No next page link found in pagination container on Page {page_number}. Assuming end of chapter.", INFO)
-                         else:
-                             self.log_message.emit(f"    No pagination container found on Page {page_number}. Assuming end of chapter.", INFO)
-
-
-                         break # Break the retry loop if page loaded successfully
-
-
-                    else:
-                         self.log_message.emit(f"  Page {page_number} failed to load successfully after {attempt} attempts.", ERROR)
-                         page_content = "Content Not Found (Page failed to load)"
-                         next_page_link = None
-                         if attempt == max_retries or not self._is_running:
-                              break
-                         else:
-                              time.sleep(delay_between_attempts)
-                              continue
-
-
-                except Exception as e:
-                    # Format the error message string first
-                    error_msg = f"  Error scraping page {page_number} on attempt {attempt} for chapter {chapter_num}: {e}"
-                    # --- Re-enable emit, root cause should be fixed ---
-                    self.log_message.emit(error_msg, ERROR)
-                    # --- End wrap ---
-                    if attempt < max_retries and self._is_running:
-                        time.sleep(delay_between_attempts)
-                        continue
-                    else:
-                        self.log_message.emit(f"  Max retries reached or stop requested for chapter {chapter_num} (Page {page_number}: {current_url}). Could not scrape page content.", ERROR)
-                        page_content = "Content Not Found (Scraping error)"
-                        page_successfully_loaded = False
-                        next_page_link = None
-                        break
-
-
-            if not self._is_running:
-                 self.log_message.emit(f"  Stop requested. Stopping pagination for chapter {chapter_num}.", INFO)
-                 break
-
-
-            if page_content is not None:
-                 all_chapter_content.append(page_content)
-            else:
-                 # This case should ideally not happen if page_content is always assigned a value
-                 # but adding a log just in case.
-                 self.log_message.emit(f"  Warning: page_content was None after retry loop for chapter {chapter_num}, page {page_number}.", WARNING)
-                 pass # Don't append None
-
-
-            if next_page_link and page_successfully_loaded:
-                current_url = next_page_link
-                page_number += 1
-                time.sleep(delay_between_attempts) # Add delay between page loads within a chapter
-            else:
-                # Determine if the chapter scrape was fully successful
-                if not page_successfully_loaded and not all_chapter_content:
-                     # Failed to load even the first page
-                     self.log_message.emit(f"  Could not load the first page ({url}) for chapter {chapter_num}. Chapter scrape failed.", ERROR)
-                     chapter_fully_scraped = False
-                elif page_successfully_loaded and next_page_link is None:
-                     # Last page loaded successfully, and no 'next' link was found
-                     self.log_message.emit(f"  Finished scraping chapter {chapter_num} (last page was {page_number}).", INFO)
-                     chapter_fully_scraped = True
-                else: # page_successfully_loaded is False OR next_page_link existed but we stopped (e.g., error, stop request)
-                     self.log_message.emit(f"  Finished scraping chapter {chapter_num}, but the last page ({page_number}) had issues loading or finding the next link. Chapter scrape incomplete.", WARNING)
-                     chapter_fully_scraped = False
-
-                break # Exit the while loop (pagination loop)
-
-
-        final_chapter_title = f"Chapter {chapter_num} - {chapter_title_text}"
-
-        if all_chapter_content:
-            full_content = "\n\n--- Page Break ---\n\n".join(all_chapter_content)
-            # Check if the *combined* content (minus markers) is substantial
-            # Added more markers to replace for the check
-            if len(full_content.replace("\n\n--- Page Break ---\n\n", "")
-                             .replace("Content Not Found (Container Empty)","")
-                             .replace("Content Not Found (Container Missing)","")
-                             .replace("Content Not Found (AI Translation Block)","")
-                             .replace("Content Not Found (Page failed to load)","")
-                             .replace("Content Not Found (Scraping error)","")
-                             .strip()) > 0:
-                 if chapter_fully_scraped:
-                     return final_chapter_title, full_content
-                 else:
-                      # Append incomplete marker if not fully scraped but has some content
-                      self.log_message.emit(f"  Returning partial content for chapter {chapter_num} due to incomplete scrape.", WARNING)
-                      return final_chapter_title, full_content + "\n\n--- Incomplete Chapter ---\n\n"
-            else:
-                 # Scraped pages, but all were empty or had only markers
-                 self.log_message.emit(f"  Scraped pages for chapter {chapter_num}, but no substantial content was found.", WARNING)
-                 return final_chapter_title, "Content Not Found"
-        else:
-             # No pages were successfully scraped at all
-             self.log_message.emit(f"  Could not scrape any content for chapter {chapter_num}.", ERROR)
-             return final_chapter_title, "Content Not Found"
-
-
-    def format_time(self, seconds):
-        """Helper to format time in H:M:S."""
-        if seconds is None:
-            return "N/A"
-        if seconds < 0:
-             seconds = 0
-        m, s = divmod(seconds, 60)
-        h, m = divmod(m, 60)
-        return f"{int(h):02d}h {int(m):02d}m {int(s):02d}s"
-
+        self.engine.stop()
 
 # --- Main Application Window ---
 
@@ -653,6 +91,7 @@ class MainWindow(QMainWindow):
 
         self.worker_thread = None
         self.worker = None
+        self.browser_service = None # Started on the first run; its browsers stay open between runs until the window closes
 
         self.input_widgets = []
         self.numeric_input_widgets = [] # Specific list for numeric fields
@@ -664,6 +103,11 @@ class MainWindow(QMainWindow):
             ERROR: QColor("#ff6600"),    # Orange/Red for errors
             CRITICAL: QColor("#ff3300")  # Bright Red for critical errors
         }
+        self.log_formats = {}
+        for severity, color in self.log_colors.items():
+            self.log_formats[severity] = QTextCharFormat()
+            self.log_formats[severity].setForeground(color)
+        self.log_buffer = LogBuffer() # Shared with the worker; flush_log() writes it to the log view
 
         # --- Style constants ---
         self.valid_style = "border: 1px solid #454545;"
@@ -813,6 +257,139 @@ class MainWindow(QMainWindow):
         self.input_widgets.append(self.delay_entry)
         self.numeric_input_widgets.append(self.delay_entry)
 
+        # Parallel Browsers
+        self.num_browsers_entry = QLineEdit()
+        self.num_browsers_entry.setFixedWidth(100)
+        self.num_browsers_entry.setToolTip("Number of headless Chrome browsers scraping chapters in parallel.\nThe delay is still applied per host across all browsers.")
+        self.num_browsers_entry.setValidator(QIntValidator(1, 16)) # Set validator
+        self.num_browsers_entry.textChanged.connect(lambda: self.validate_numeric_input(self.num_browsers_entry, min_val=1)) # Connect validation
+        advanced_layout.addWidget(QLabel("Browsers:"), 1, 0, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.num_browsers_entry, 1, 1)
+        self.input_widgets.append(self.num_browsers_entry)
+        self.numeric_input_widgets.append(self.num_browsers_entry)
+
+        # Fetch Mode
+        self.fetch_mode_combo = QComboBox()
+        self.fetch_mode_combo.addItem("Auto (plain HTTP first)", "auto")
+        self.fetch_mode_combo.addItem("Browser only", "browser")
+        self.fetch_mode_combo.setToolTip("Auto fetches each chapter with a plain HTTP request first and only uses\nthe browser when the page is not server-rendered.")
+        advanced_layout.addWidget(QLabel("Fetch Mode:"), 1, 2, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.fetch_mode_combo, 1, 3)
+        self.input_widgets.append(self.fetch_mode_combo)
+
+        # Content Source (extractor)
+        self.extractor_combo = QComboBox()
+        self.extractor_combo.addItem("Auto (embedded JSON, then page)", "auto")
+        self.extractor_combo.addItem("Page HTML only", "dom")
+        self.extractor_combo.addItem("Embedded JSON only", "payload")
+        self.extractor_combo.setToolTip("Where chapter text is taken from. Embedded JSON payloads (e.g. __NEXT_DATA__)\nare read without waiting for the page to render.")
+        advanced_layout.addWidget(QLabel("Content Source:"), 2, 0, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.extractor_combo, 2, 1, 1, 3)
+        self.input_widgets.append(self.extractor_combo)
+
+        # Chapter Cache
+        self.cache_size_entry = QLineEdit()
+        self.cache_size_entry.setFixedWidth(100)
+        self.cache_size_entry.setToolTip("Size limit of the on-disk chapter cache in MB (0 disables it).\nUnchanged chapters are served from the cache instead of the network.")
+        self.cache_size_entry.setValidator(QIntValidator(0, 100000)) # Set validator (allow 0)
+        self.cache_size_entry.textChanged.connect(lambda: self.validate_numeric_input(self.cache_size_entry, min_val=0)) # Connect validation
+        advanced_layout.addWidget(QLabel("Cache (MB):"), 3, 0, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.cache_size_entry, 3, 1)
+        self.input_widgets.append(self.cache_size_entry)
+        self.numeric_input_widgets.append(self.cache_size_entry)
+
+        self.cache_age_entry = QLineEdit()
+        self.cache_age_entry.setFixedWidth(100)
+        self.cache_age_entry.setToolTip("Hours a cached chapter is used without asking the server.\nOlder entries are revalidated with a conditional request.")
+        self.cache_age_entry.setValidator(QIntValidator(0, 100000)) # Set validator (allow 0)
+        self.cache_age_entry.textChanged.connect(lambda: self.validate_numeric_input(self.cache_age_entry, min_val=0)) # Connect validation
+        advanced_layout.addWidget(QLabel("Cache Max Age (h):"), 3, 2, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.cache_age_entry, 3, 3)
+        self.input_widgets.append(self.cache_age_entry)
+        self.numeric_input_widgets.append(self.cache_age_entry)
+
+        # Resource Blocking
+        self.block_mode_combo = QComboBox()
+        self.block_mode_combo.addItem("Images, fonts, ads & trackers", "all")
+        self.block_mode_combo.addItem("Images & fonts only", "media")
+        self.block_mode_combo.addItem("Off", "off")
+        self.block_mode_combo.setToolTip("Resources the browsers never download. Chapter text does not need them,\nso blocking them saves bandwidth and page-load time.")
+        advanced_layout.addWidget(QLabel("Block Resources:"), 4, 0, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.block_mode_combo, 4, 1)
+        self.input_widgets.append(self.block_mode_combo)
+
+        self.block_rules_entry = QLineEdit()
+        self.block_rules_entry.setPlaceholderText("e.g. *.css !*.svg")
+        self.block_rules_entry.setToolTip("Extra URL patterns to block, separated by spaces ('*' is a wildcard).\nPrefix a pattern with '!' to never block URLs it matches.")
+        advanced_layout.addWidget(QLabel("Block Rules:"), 4, 2, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.block_rules_entry, 4, 3)
+        self.input_widgets.append(self.block_rules_entry)
+
+        # Duplicate-title detection
+        self.title_threshold_entry = QLineEdit()
+        self.title_threshold_entry.setFixedWidth(100)
+        self.title_threshold_entry.setToolTip("How similar (0-100) a leading line of the text must be to the chapter title\nto be removed as a repeated title. Lower removes more, higher removes less.")
+        self.title_threshold_entry.setValidator(QIntValidator(0, 100)) # Set validator
+        self.title_threshold_entry.textChanged.connect(lambda: self.validate_numeric_input(self.title_threshold_entry, min_val=0)) # Connect validation
+        advanced_layout.addWidget(QLabel("Title Match (%):"), 5, 0, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.title_threshold_entry, 5, 1)
+        self.input_widgets.append(self.title_threshold_entry)
+        self.numeric_input_widgets.append(self.title_threshold_entry)
+
+        # Adaptive politeness delay
+        self.delay_mode_combo = QComboBox()
+        self.delay_mode_combo.addItem("Fixed", "fixed")
+        self.delay_mode_combo.addItem("Adaptive", "adaptive")
+        self.delay_mode_combo.setToolTip("Fixed keeps the delay between page loads.\nAdaptive starts at the delay, shortens it while pages load fast and clean,\nand backs off on timeouts, empty pages and block pages.")
+        advanced_layout.addWidget(QLabel("Delay Mode:"), 5, 2, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.delay_mode_combo, 5, 3)
+        self.input_widgets.append(self.delay_mode_combo)
+
+        # Browser recycling
+        self.recycle_pages_entry = QLineEdit()
+        self.recycle_pages_entry.setFixedWidth(100)
+        self.recycle_pages_entry.setToolTip("Replace a Chrome browser after this many page loads (0 = never).\nChrome slows down as a long session grows; the replacement keeps the same cache folder.")
+        self.recycle_pages_entry.setValidator(QIntValidator(0, 100000)) # Set validator
+        self.recycle_pages_entry.textChanged.connect(lambda: self.validate_numeric_input(self.recycle_pages_entry, min_val=0)) # Connect validation
+        advanced_layout.addWidget(QLabel("Recycle After (pages):"), 6, 0, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.recycle_pages_entry, 6, 1)
+        self.input_widgets.append(self.recycle_pages_entry)
+        self.numeric_input_widgets.append(self.recycle_pages_entry)
+
+        self.browser_memory_entry = QLineEdit()
+        self.browser_memory_entry.setFixedWidth(100)
+        self.browser_memory_entry.setToolTip("Replace a Chrome browser once it uses more memory than this (0 = never).")
+        self.browser_memory_entry.setValidator(QIntValidator(0, 100000)) # Set validator
+        self.browser_memory_entry.textChanged.connect(lambda: self.validate_numeric_input(self.browser_memory_entry, min_val=0)) # Connect validation
+        advanced_layout.addWidget(QLabel("Browser Memory (MB):"), 6, 2, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.browser_memory_entry, 6, 3)
+        self.input_widgets.append(self.browser_memory_entry)
+        self.numeric_input_widgets.append(self.browser_memory_entry)
+
+        self.min_delay_entry = QLineEdit()
+        self.min_delay_entry.setFixedWidth(100)
+        self.min_delay_entry.setToolTip("Shortest delay the adaptive delay mode goes down to, in seconds.")
+        min_delay_validator = QDoubleValidator(0.1, 600.0, 2)
+        min_delay_validator.setNotation(QDoubleValidator.StandardNotation)
+        self.min_delay_entry.setValidator(min_delay_validator) # Set validator
+        self.min_delay_entry.textChanged.connect(lambda: self.validate_numeric_input(self.min_delay_entry, min_val=0.1)) # Connect validation
+        advanced_layout.addWidget(QLabel("Min Delay (sec):"), 7, 0, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.min_delay_entry, 7, 1)
+        self.input_widgets.append(self.min_delay_entry)
+        self.numeric_input_widgets.append(self.min_delay_entry)
+
+        self.max_delay_entry = QLineEdit()
+        self.max_delay_entry.setFixedWidth(100)
+        self.max_delay_entry.setToolTip("Longest delay the adaptive delay mode backs off to, in seconds.")
+        max_delay_validator = QDoubleValidator(0.1, 600.0, 2)
+        max_delay_validator.setNotation(QDoubleValidator.StandardNotation)
+        self.max_delay_entry.setValidator(max_delay_validator) # Set validator
+        self.max_delay_entry.textChanged.connect(lambda: self.validate_numeric_input(self.max_delay_entry, min_val=0.1)) # Connect validation
+        advanced_layout.addWidget(QLabel("Max Delay (sec):"), 7, 2, alignment=Qt.AlignRight)
+        advanced_layout.addWidget(self.max_delay_entry, 7, 3)
+        self.input_widgets.append(self.max_delay_entry)
+        self.numeric_input_widgets.append(self.max_delay_entry)
+
         advanced_layout.setColumnStretch(4, 1) # Add stretch to push advanced options left
 
         # input_layout.addWidget(self.advanced_options_group, 6, 0, 1, 4) # Add advanced group to main input layout
@@ -825,14 +402,22 @@ class MainWindow(QMainWindow):
         cleaning_group_box = QGroupBox("Content Cleaning")
         cleaning_layout = QVBoxLayout(cleaning_group_box)
 
-        cleaning_layout.addWidget(QLabel("Remove lines exactly matching (one per line):"))
+        cleaning_layout.addWidget(QLabel("Remove lines exactly matching, or contains:/re: rules (one per line):"))
         self.cleaning_patterns_edit = QTextEdit()
-        self.cleaning_patterns_edit.setToolTip("Enter text lines to be completely removed from the scraped content.\nEach line you enter here will be matched exactly (case-sensitive).\nExample: 'Translated by XYZ'\nExample: 'Please support the author!'")
+        self.cleaning_patterns_edit.setToolTip("Enter text lines to be completely removed from the scraped content.\nEach line you enter here will be matched exactly (case-sensitive).\nExample: 'Translated by XYZ'\nExample: 'Please support the author!'\n\nPrefix a rule with 'contains:' to cut that text out of any line (e.g. a watermark),\nor with 're:' to cut every match of a regular expression.\nExample: 'contains:Read at wtr-lab.com'\nExample: 're:\\s*\\(Visit [^)]*\\)'\nLines left empty are removed.")
         self.cleaning_patterns_edit.setAcceptRichText(False) # Ensure plain text
         # self.cleaning_patterns_edit.setFixedHeight(100) # Remove fixed height
         cleaning_layout.addWidget(self.cleaning_patterns_edit)
         self.input_widgets.append(self.cleaning_patterns_edit) # Add to input widgets
 
+        cleaning_layout.addWidget(QLabel("Extra title prefixes to strip (regex, one per line):"))
+        self.title_patterns_edit = QTextEdit()
+        self.title_patterns_edit.setToolTip("Regular expressions for chapter numbering this series uses, removed from titles\nbefore they are compared with the first lines of the text (case-insensitive).\n'#12', 'Chapter 12:' and '12 -' are always handled.\nExample: ^Ep\\.?\\s*\\d+\\s*\\|\\s*")
+        self.title_patterns_edit.setAcceptRichText(False) # Ensure plain text
+        self.title_patterns_edit.setMaximumHeight(70) # Usually empty or a line or two
+        cleaning_layout.addWidget(self.title_patterns_edit)
+        self.input_widgets.append(self.title_patterns_edit) # Add to input widgets
+
         # left_layout.addWidget(cleaning_group_box) # Add cleaning group to left layout (Moved)
 
         # --- Configuration Management ---
@@ -924,6 +509,11 @@ class MainWindow(QMainWindow):
         self.estimated_time_label.setAlignment(Qt.AlignRight)
         status_time_layout.addWidget(self.estimated_time_label, 1)
 
+        self.request_rate_label = QLabel("Request Rate: N/A")
+        self.request_rate_label.setAlignment(Qt.AlignRight)
+        self.request_rate_label.setToolTip("Page loads per minute over the last minute, and the current delay between them.")
+        status_time_layout.addWidget(self.request_rate_label)
+
 
         progress_status_layout.addLayout(status_time_layout)
 
@@ -934,6 +524,12 @@ class MainWindow(QMainWindow):
         self.status_text = QTextEdit()
         self.status_text.setReadOnly(True)
         self.status_text.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.TextSelectableByKeyboard)
+        self.status_text.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.status_text.document().setMaximumBlockCount(LOG_MAX_LINES) # Oldest lines are dropped, so long runs do not grow the view
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self.log_flush_timer.timeout.connect(self.flush_log)
+        self.log_flush_timer.start()
         # We will add this to the splitter later
 
         # --- Control Buttons ---
@@ -944,6 +540,12 @@ class MainWindow(QMainWindow):
         self.start_button.clicked.connect(self.start_scraping)
         control_layout.addWidget(self.start_button)
 
+        self.resume_button = QPushButton("Resume Job")
+        self.resume_button.setIcon(self.style().standardIcon(QStyle.SP_MediaSeekForward))
+        self.resume_button.setToolTip("Continue the job recorded in the output folder's journal:\nfinished chapters are skipped, the rest of the range and failed chapters are scraped.")
+        self.resume_button.clicked.connect(self.resume_scraping)
+        control_layout.addWidget(self.resume_button)
+
         self.stop_button = QPushButton("Stop Scraping")
         self.stop_button.setIcon(self.style().standardIcon(QStyle.SP_MediaStop))
         self.stop_button.setToolTip("Gracefully stop the scraping process after the current chapter/batch.")
@@ -1031,14 +633,14 @@ class MainWindow(QMainWindow):
                     color: #D1D5DB;
                     background-color: transparent; /* Ensure no unwanted background */
                 }
-                QLabel#extractedUrlLabel, QLabel#currentChapterStatusLabel, QLabel#estimatedTimeLabel {
+                QLabel#extractedUrlLabel, QLabel#currentChapterStatusLabel, QLabel#estimatedTimeLabel, QLabel#requestRateLabel {
                     color: #9CA3AF; /* Dimmer color for status/info labels */
                     font-size: 9pt;
                     font-style: italic;
                 }
 
                 /* Input Fields (LineEdit, ComboBox, Specific QTextEdit) */
-                QLineEdit, QComboBox, QTextEdit#cleaningPatternsEdit {
+                QLineEdit, QComboBox, QTextEdit#cleaningPatternsEdit, QTextEdit#titlePatternsEdit {
                     background-color: #2C313A; /* Distinct dark input background */
                     color: #E5E7EB; /* Slightly brighter text for inputs */
                     padding: 7px;
@@ -1209,6 +811,7 @@ class MainWindow(QMainWindow):
         # --- Set object names for specific styling and easy access ---
         self.browse_button.setObjectName("browseButton")
         self.start_button.setObjectName("startButton")
+        self.resume_button.setObjectName("resumeButton")
         self.stop_button.setObjectName("stopButton")
         self.open_output_dir_button.setObjectName("openOutputFolderButton")
         self.clear_log_button.setObjectName("clearLogButton")
@@ -1216,11 +819,13 @@ class MainWindow(QMainWindow):
         self.test_url_button.setObjectName("testUrlButton") # Object name
         self.current_chapter_status_label.setObjectName("currentChapterStatusLabel")
         self.estimated_time_label.setObjectName("estimatedTimeLabel")
+        self.request_rate_label.setObjectName("requestRateLabel")
         self.extracted_url_label.setObjectName("extractedUrlLabel") # Object name
         self.save_config_button.setObjectName("saveConfigButton")
         self.load_config_button.setObjectName("loadConfigButton")
         self.delete_config_button.setObjectName("deleteConfigButton")
         self.cleaning_patterns_edit.setObjectName("cleaningPatternsEdit") # Object name
+        self.title_patterns_edit.setObjectName("titlePatternsEdit")
 
         self.populate_profiles_combo() # Populate dropdown on startup
         # --- Load default settings (Call this LAST in __init__) ---
@@ -1324,6 +929,16 @@ class MainWindow(QMainWindow):
         except ValueError:
             pass # Individual validation will handle non-numeric
 
+        # Specific check: Max delay >= Min delay
+        try:
+            if float(self.max_delay_entry.text()) < float(self.min_delay_entry.text()):
+                self.max_delay_entry.setProperty("invalid", True)
+                self.max_delay_entry.setStyle(self.style())
+                self.log_message("Validation Error: Max Delay must be >= Min Delay.", WARNING)
+                all_valid = False
+        except ValueError:
+            pass # Individual validation will handle non-numeric
+
         # Check non-empty fields
         if not self.filename_entry.text().strip():
             self.filename_entry.setProperty("invalid", True); all_valid = False
@@ -1344,7 +959,16 @@ class MainWindow(QMainWindow):
 
     @Slot()
     def start_scraping(self):
-        """Initiates the scraping process based on UI input."""
+        """Initiates a new scraping job based on UI input."""
+        self.begin_scraping(resume=False)
+
+    @Slot()
+    def resume_scraping(self):
+        """Continues the job recorded in the output directory's journal."""
+        self.begin_scraping(resume=True)
+
+    def begin_scraping(self, resume):
+        """Validates the inputs and starts the worker, either as a new job or resuming the journaled one."""
         if self.worker_thread is not None and self.worker_thread.isRunning():
             QMessageBox.information(self, "Info", "Scraping is already running.")
             return
@@ -1367,6 +991,14 @@ class MainWindow(QMainWindow):
             batch_size = int(self.batch_size_entry.text().strip())
             max_retries = int(self.max_retries_entry.text().strip())
             delay_between_attempts = float(self.delay_entry.text().strip())
+            num_browsers = int(self.num_browsers_entry.text().strip())
+            cache_size_mb = int(self.cache_size_entry.text().strip())
+            cache_max_age_hours = int(self.cache_age_entry.text().strip())
+            title_match_threshold = int(self.title_threshold_entry.text().strip())
+            browser_recycle_pages = int(self.recycle_pages_entry.text().strip())
+            browser_memory_mb = int(self.browser_memory_entry.text().strip())
+            min_delay = float(self.min_delay_entry.text().strip())
+            max_delay = float(self.max_delay_entry.text().strip())
         except ValueError as e:
             # Should also be redundant, but safety check
             QMessageBox.critical(self, "Internal Error", f"Could not convert validated input to number: {e}")
@@ -1393,19 +1025,41 @@ class MainWindow(QMainWindow):
              QMessageBox.critical(self, "Error", f"Chromedriver executable ('{driver_location}') not found.\nPlease download it from the official site and place it in the script folder or your PATH.")
              return
 
+        # --- Check the job journal ---
+        job_journal_path = journal_path(output_directory, base_filename)
+        try:
+            journal_job, journal_chapters = load_journal(job_journal_path, include_content=False)
+        except Exception as e:
+            self.log_message(f"Could not read job journal {job_journal_path}: {e}", WARNING)
+            journal_job, journal_chapters = None, {}
+        if resume:
+            if journal_job is None:
+                QMessageBox.warning(self, "Resume Job", f"No job journal found for prefix '{base_filename}' in the output directory.")
+                return
+            if journal_job.get("base_url_pattern") != base_url_pattern:
+                QMessageBox.warning(self, "Resume Job", f"The journal belongs to a different series:\n{journal_job.get('base_url_pattern')}\nLoad the matching settings before resuming.")
+                return
+        elif journal_job is not None and journal_job.get("base_url_pattern") == base_url_pattern and journal_chapters:
+            reply = QMessageBox.question(self, "Unfinished Job", f"A journal with {len(journal_chapters)} finished chapters exists for this series and prefix.\n"
+                                         "Resume that job instead of starting over?", QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+            resume = reply == QMessageBox.Yes
+
+        self.log_buffer.drain() # Drop anything still queued from before the clear
         self.status_text.clear()
-        self.log_message("Validation successful. Starting scraping thread...", INFO)
+        self.log_message("Validation successful. Resuming journaled job..." if resume else "Validation successful. Starting scraping thread...", INFO)
 
         total_chapters = end_chapter - start_chapter + 1
         self.progress_bar.setMaximum(total_chapters)
         self.progress_bar.setValue(0)
         self.current_chapter_status_label.setText("Initializing...")
         self.estimated_time_label.setText("Estimated Time Remaining: Calculating...")
+        self.request_rate_label.setText("Request Rate: N/A")
 
 
         # Disable input fields, config controls and enable stop button
         self.set_input_enabled(False)
         self.start_button.setEnabled(False)
+        self.resume_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         self.open_output_dir_button.setEnabled(False)
         self.clear_log_button.setEnabled(False)
@@ -1414,15 +1068,28 @@ class MainWindow(QMainWindow):
         self.set_config_controls_enabled(False)
 
 
-        self.worker = ScrapingWorker(base_url_pattern, start_chapter, end_chapter, batch_size, base_filename, output_directory, max_retries, delay_between_attempts, cleaning_patterns)
+        if self.browser_service is None:
+            self.browser_service = BrowserService()
+        self.worker = ScrapingWorker(base_url_pattern, start_chapter, end_chapter, batch_size, base_filename, output_directory, max_retries, delay_between_attempts, cleaning_patterns, num_browsers=num_browsers,
+                                     log_buffer=self.log_buffer,
+                                     fetch_mode=self.fetch_mode_combo.currentData(),
+                                     extractor_mode=self.extractor_combo.currentData(),
+                                     cache_size_mb=cache_size_mb, cache_max_age_hours=cache_max_age_hours, resume=resume,
+                                     block_mode=self.block_mode_combo.currentData(),
+                                     block_rules=self.block_rules_entry.text().strip(),
+                                     title_patterns=self.title_patterns_edit.toPlainText(),
+                                     title_match_threshold=title_match_threshold,
+                                     browser_service=self.browser_service,
+                                     browser_recycle_pages=browser_recycle_pages,
+                                     browser_memory_mb=browser_memory_mb,
+                                     adaptive_delay=self.delay_mode_combo.currentData() == "adaptive",
+                                     min_delay=min_delay, max_delay=max_delay)
         self.worker_thread = QThread()
 
         self.worker.moveToThread(self.worker_thread)
 
         # Connect signals/slots
-        self.worker.log_message.connect(self._log_message_to_gui_and_file)
         self.worker.progress_updated.connect(self.progress_bar.setValue)
-        self.worker.chapter_scraped.connect(self.handle_chapter_scraped)
         self.worker.saving_error.connect(self.handle_saving_error)
         self.worker.critical_error.connect(self.handle_critical_error)
         self.worker.finished.connect(self.worker_thread.quit)
@@ -1430,38 +1097,43 @@ class MainWindow(QMainWindow):
         self.worker.current_chapter_status.connect(self.current_chapter_status_label.setText) # Connect status label update
         self.worker.scrape_summary.connect(self.display_scrape_summary)
         self.worker.estimated_time_updated.connect(self.estimated_time_label.setText)
+        self.worker.request_rate_updated.connect(self.update_request_rate)
         self.worker_thread.started.connect(self.worker.run)
         # Stop button connected in __init__ now
 
         self.worker_thread.start()
 
-    @Slot(str, int)
-    def _log_message_to_gui_and_file(self, message, severity):
-        timestamp = datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
-        formatted_message = f"{timestamp} {message}\n"
+    @Slot(float, float)
+    def update_request_rate(self, pages_per_minute, delay_seconds):
+        """Shows the live request rate and the current politeness delay."""
+        self.request_rate_label.setText(f"Request Rate: {pages_per_minute:.1f} pages/min (delay {delay_seconds:.1f}s)")
 
-        # Append to QTextEdit with color formatting
+    @Slot()
+    def flush_log(self):
+        """Writes the buffered log records to the log view as one edit and scrolls once."""
+        records, dropped = self.log_buffer.drain()
+        if not records and not dropped:
+            return
         cursor = self.status_text.textCursor()
         cursor.movePosition(QTextCursor.End)
-
-        format = QTextCharFormat()
-        color = self.log_colors.get(severity, self.log_colors[INFO])
-        format.setForeground(color)
-
-        cursor.insertText(formatted_message, format)
-        self.status_text.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
-        self.status_text.ensureCursorVisible()
+        cursor.beginEditBlock()
+        if dropped:
+            cursor.insertText(f"... {dropped} log messages skipped, the log view could not keep up ...\n", self.log_formats[WARNING])
+        for timestamp, message, severity in records:
+            cursor.insertText(f"{timestamp.strftime('[%Y-%m-%d %H:%M:%S]')} {message}\n", self.log_formats.get(severity, self.log_formats[INFO]))
+        cursor.endEditBlock()
+        scroll_bar = self.status_text.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
 
 
     @Slot(str)
     # Corrected method signature to accept optional severity
     def log_message(self, message, severity=INFO):
-         self._log_message_to_gui_and_file(message, severity)
-
+         if severity == DEBUG:
+             debug_logger().debug(message.strip())
+         else:
+             self.log_buffer.append(datetime.datetime.now(), message, severity)
 
-    @Slot(str, str, int)
-    def handle_chapter_scraped(self, title, content, chapter_num):
-        pass # Not currently used for GUI updates
 
     @Slot(str)
     def handle_saving_error(self, error_message):
@@ -1509,64 +1181,15 @@ class MainWindow(QMainWindow):
              self.log_message("Stop clicked, but worker is not running.", INFO)
              self.stop_button.setEnabled(False)
 
-    def write_batch_files(self, successful_content, start_chapter, end_chapter, batch_size, output_directory):
-        """Writes the final batch files from the collected content."""
-        if not successful_content:
-            self.log_message("No successful content collected, skipping final file writing.", WARNING)
-            return
-
-        self.log_message("\n--- Writing final batch files in correct order ---", INFO)
-        total_chapters_to_write = end_chapter - start_chapter + 1
-
-        for batch_start in range(start_chapter, end_chapter + 1, batch_size):
-            batch_end = min(batch_start + batch_size - 1, end_chapter)
-            batch_filename = f"{batch_start}-{batch_end}.txt"
-            safe_filename = re.sub(r'[\\/:*?"<>|]', '_', batch_filename)
-            filepath = os.path.join(output_directory, safe_filename)
-
-            chapters_in_this_batch = []
-            for chapter_num in range(batch_start, batch_end + 1):
-                if chapter_num in successful_content:
-                    chapters_in_this_batch.append(successful_content[chapter_num])
-                # else: # Optionally add placeholders for missing chapters in the final file
-                #     chapters_in_this_batch.append((f"Chapter {chapter_num} - Title Not Found", "Content Not Found"))
-
-            if chapters_in_this_batch:
-                try:
-                    with open(filepath, "w", encoding="utf-8") as f:
-                        for i, (title, content) in enumerate(chapters_in_this_batch):
-                            f.write(f"{title}\n\n{content}\n\n")
-                            # Add extra newline between chapters unless it's the last one
-                            # if i < len(chapters_in_this_batch) - 1:
-                            #     f.write("\n") # Already have \n\n at end of content
-                    self.log_message(f"  Successfully wrote batch file: {filepath}", INFO)
-                except Exception as e:
-                    self.log_message(f"  Error writing final batch file {filepath}: {e}", ERROR)
-                    self.saving_error.emit(f"Could not write final batch file {filepath}. Error: {e}")
-            else:
-                 self.log_message(f"  No successful content for batch {batch_start}-{batch_end}, skipping file: {filepath}", WARNING)
-
-
     @Slot()
     def on_scraping_finished(self):
         """Slot to handle GUI updates when the scraping thread finishes."""
+        self.flush_log() # Show the worker's last messages before the status is read back from the log
         self.log_message("Worker thread finished signal received. Updating GUI...", INFO)
         self.set_input_enabled(True)
         self.start_button.setEnabled(True)
+        self.resume_button.setEnabled(True)
 
-        # --- Write final files ---
-        if self.worker and hasattr(self.worker, 'successful_content') and self.worker.successful_content:
-            try:
-                # Get necessary parameters (ensure they are valid numbers)
-                start_ch = int(self.start_chapter_entry.text())
-                end_ch = int(self.end_chapter_entry.text())
-                batch_s = int(self.batch_size_entry.text())
-                output_dir = self.output_dir_entry.text()
-                self.write_batch_files(self.worker.successful_content, start_ch, end_ch, batch_s, output_dir)
-            except ValueError:
-                self.log_message("Error: Could not parse chapter range/batch size for final file writing.", ERROR)
-            except Exception as e:
-                 self.log_message(f"Error during final file writing process: {e}", ERROR)
         self.stop_button.setEnabled(False) # Ensure stop is disabled
         if self.output_dir_entry.text().strip():
              self.open_output_dir_button.setEnabled(True)
@@ -1575,6 +1198,7 @@ class MainWindow(QMainWindow):
         self.test_url_button.setEnabled(True) # Enable test url
         self.current_chapter_status_label.setText("Idle" if not self.status_text.toPlainText().strip().endswith("finished ---\n") else "Finished")
         self.estimated_time_label.setText("Estimated Time Remaining: N/A")
+        self.request_rate_label.setText("Request Rate: N/A")
         self.set_config_controls_enabled(True)
 
         # Clean up worker and thread
@@ -1642,11 +1266,25 @@ class MainWindow(QMainWindow):
         self.settings.setValue('batch_size', self.batch_size_entry.text().strip())
         self.settings.setValue('max_retries', self.max_retries_entry.text().strip())
         self.settings.setValue('delay_between_attempts', self.delay_entry.text().strip())
+        self.settings.setValue('num_browsers', self.num_browsers_entry.text().strip())
+        self.settings.setValue('fetch_mode', self.fetch_mode_combo.currentData())
+        self.settings.setValue('extractor_mode', self.extractor_combo.currentData())
+        self.settings.setValue('cache_size_mb', self.cache_size_entry.text().strip())
+        self.settings.setValue('cache_max_age_hours', self.cache_age_entry.text().strip())
+        self.settings.setValue('block_mode', self.block_mode_combo.currentData())
+        self.settings.setValue('block_rules', self.block_rules_entry.text().strip())
+        self.settings.setValue('title_match_threshold', self.title_threshold_entry.text().strip())
+        self.settings.setValue('browser_recycle_pages', self.recycle_pages_entry.text().strip())
+        self.settings.setValue('browser_memory_mb', self.browser_memory_entry.text().strip())
+        self.settings.setValue('delay_mode', self.delay_mode_combo.currentData())
+        self.settings.setValue('min_delay', self.min_delay_entry.text().strip())
+        self.settings.setValue('max_delay', self.max_delay_entry.text().strip())
         self.settings.setValue('base_filename', self.filename_entry.text().strip())
         self.settings.setValue('output_directory', self.output_dir_entry.text().strip())
         # self.settings.setValue('profile_name', profile_name) # No need to save profile name within its own group
         # self.settings.setValue('advanced_options_checked', self.advanced_options_group.isChecked()) # No longer checkable
         self.settings.setValue('cleaning_patterns', self.cleaning_patterns_edit.toPlainText()) # Save cleaning patterns
+        self.settings.setValue('title_patterns', self.title_patterns_edit.toPlainText())
         self.settings.endGroup()
 
         self.settings.sync()
@@ -1684,10 +1322,24 @@ class MainWindow(QMainWindow):
             self.batch_size_entry.setText(self.settings.value('batch_size', ""))
             self.max_retries_entry.setText(self.settings.value('max_retries', ""))
             self.delay_entry.setText(self.settings.value('delay_between_attempts', ""))
+            self.num_browsers_entry.setText(self.settings.value('num_browsers', DEFAULT_NUM_BROWSERS)) # Older profiles predate this field
+            self.set_combo_data(self.fetch_mode_combo, self.settings.value('fetch_mode', "auto"))
+            self.set_combo_data(self.extractor_combo, self.settings.value('extractor_mode', "auto"))
+            self.cache_size_entry.setText(self.settings.value('cache_size_mb', "500"))
+            self.cache_age_entry.setText(self.settings.value('cache_max_age_hours', "168"))
+            self.set_combo_data(self.block_mode_combo, self.settings.value('block_mode', "all"))
+            self.block_rules_entry.setText(self.settings.value('block_rules', ""))
+            self.title_threshold_entry.setText(self.settings.value('title_match_threshold', "85"))
+            self.recycle_pages_entry.setText(self.settings.value('browser_recycle_pages', "300"))
+            self.browser_memory_entry.setText(self.settings.value('browser_memory_mb', "1500"))
+            self.set_combo_data(self.delay_mode_combo, self.settings.value('delay_mode', "fixed"))
+            self.min_delay_entry.setText(self.settings.value('min_delay', "1.0"))
+            self.max_delay_entry.setText(self.settings.value('max_delay', "15.0"))
             self.filename_entry.setText(self.settings.value('base_filename', ""))
             self.output_dir_entry.setText(self.settings.value('output_directory', ""))
             self.profile_name_entry.setText(profile_name) # Set profile name field
             self.cleaning_patterns_edit.setPlainText(self.settings.value('cleaning_patterns', "")) # Load cleaning patterns
+            self.title_patterns_edit.setPlainText(self.settings.value('title_patterns', ""))
             # Load advanced options checkbox state, convert string 'true'/'false' to bool
             # is_checked = self.settings.value('advanced_options_checked', "false").lower() == 'true' # No longer checkable
             # self.advanced_options_group.setChecked(is_checked) # No longer checkable
@@ -1759,6 +1411,7 @@ class MainWindow(QMainWindow):
         # Clear fields not managed by load_settings
         self.profile_name_entry.clear()
         self.cleaning_patterns_edit.clear() # Clear cleaning patterns
+        self.title_patterns_edit.clear()
         # Reset combo box selection
         if self.profile_combo.count() > 0:
             self.profile_combo.setCurrentIndex(0)
@@ -1766,6 +1419,12 @@ class MainWindow(QMainWindow):
         self.validate_all_inputs()
         self.log_message("Input fields reset to defaults.", INFO)
 
+    def set_combo_data(self, combo, data):
+        """Selects the combo box item whose user data matches, keeping the current item if none does."""
+        index = combo.findData(data)
+        if index != -1:
+            combo.setCurrentIndex(index)
+
     def flash_widget_background(self, widget, color, duration=500):
         """Temporarily changes the background color of a widget."""
         original_style = widget.styleSheet()
@@ -1794,6 +1453,8 @@ class MainWindow(QMainWindow):
                 event.ignore()
         else:
             event.accept()
+        if event.isAccepted() and self.browser_service is not None:
+            self.browser_service.shutdown() # Browsers kept open between runs
 
     def save_settings(self):
         """Saves the current input settings as the default profile for next launch."""
@@ -1804,11 +1465,25 @@ class MainWindow(QMainWindow):
         self.settings.setValue('batch_size', self.batch_size_entry.text().strip())
         self.settings.setValue('max_retries', self.max_retries_entry.text().strip())
         self.settings.setValue('delay_between_attempts', self.delay_entry.text().strip())
+        self.settings.setValue('num_browsers', self.num_browsers_entry.text().strip())
+        self.settings.setValue('fetch_mode', self.fetch_mode_combo.currentData())
+        self.settings.setValue('extractor_mode', self.extractor_combo.currentData())
+        self.settings.setValue('cache_size_mb', self.cache_size_entry.text().strip())
+        self.settings.setValue('cache_max_age_hours', self.cache_age_entry.text().strip())
+        self.settings.setValue('block_mode', self.block_mode_combo.currentData())
+        self.settings.setValue('block_rules', self.block_rules_entry.text().strip())
+        self.settings.setValue('title_match_threshold', self.title_threshold_entry.text().strip())
+        self.settings.setValue('browser_recycle_pages', self.recycle_pages_entry.text().strip())
+        self.settings.setValue('browser_memory_mb', self.browser_memory_entry.text().strip())
+        self.settings.setValue('delay_mode', self.delay_mode_combo.currentData())
+        self.settings.setValue('min_delay', self.min_delay_entry.text().strip())
+        self.settings.setValue('max_delay', self.max_delay_entry.text().strip())
         self.settings.setValue('base_filename', self.filename_entry.text().strip())
         self.settings.setValue('output_directory', self.output_dir_entry.text().strip())
         self.settings.setValue('profile_name', self.profile_name_entry.text().strip()) # Save last profile name
         # self.settings.setValue('advanced_options_checked', self.advanced_options_group.isChecked()) # No longer checkable
         self.settings.setValue('cleaning_patterns', self.cleaning_patterns_edit.toPlainText()) # Save cleaning patterns
+        self.settings.setValue('title_patterns', self.title_patterns_edit.toPlainText())
         # Save window geometry
         self.settings.setValue("geometry", self.saveGeometry()) # Re-enable saving geometry
         self.settings.setValue("splitterSizes", self.centralWidget().saveState()) # Save splitter state
@@ -1825,11 +1500,25 @@ class MainWindow(QMainWindow):
         default_batch = "10"
         default_retries = "5"  # Changed default retries
         default_delay = "4.0"  # Changed default delay
+        default_browsers = DEFAULT_NUM_BROWSERS
+        default_fetch_mode = "auto"
+        default_extractor_mode = "auto"
+        default_cache_size = "500"
+        default_cache_age = "168"
+        default_block_mode = "all"
+        default_block_rules = ""
+        default_title_threshold = "85"
+        default_recycle_pages = "300"
+        default_browser_memory = "1500"
+        default_delay_mode = "fixed"
+        default_min_delay = "1.0"
+        default_max_delay = "15.0"
         default_filename = "scraped_chapters"
         default_output = os.path.join(os.path.expanduser("~"), "ScrapedChapters")
         default_profile_name = ""
         default_advanced_checked = False
         default_cleaning_patterns = "" # Default cleaning patterns is empty
+        default_title_patterns = ""
 
         if not use_defaults:
             self.settings.beginGroup("DefaultConfig")
@@ -1839,10 +1528,24 @@ class MainWindow(QMainWindow):
             self.batch_size_entry.setText(self.settings.value('batch_size', default_batch))
             self.max_retries_entry.setText(self.settings.value('max_retries', default_retries))
             self.delay_entry.setText(self.settings.value('delay_between_attempts', default_delay))
+            self.num_browsers_entry.setText(self.settings.value('num_browsers', default_browsers))
+            self.set_combo_data(self.fetch_mode_combo, self.settings.value('fetch_mode', default_fetch_mode))
+            self.set_combo_data(self.extractor_combo, self.settings.value('extractor_mode', default_extractor_mode))
+            self.cache_size_entry.setText(self.settings.value('cache_size_mb', default_cache_size))
+            self.cache_age_entry.setText(self.settings.value('cache_max_age_hours', default_cache_age))
+            self.set_combo_data(self.block_mode_combo, self.settings.value('block_mode', default_block_mode))
+            self.block_rules_entry.setText(self.settings.value('block_rules', default_block_rules))
+            self.title_threshold_entry.setText(self.settings.value('title_match_threshold', default_title_threshold))
+            self.recycle_pages_entry.setText(self.settings.value('browser_recycle_pages', default_recycle_pages))
+            self.browser_memory_entry.setText(self.settings.value('browser_memory_mb', default_browser_memory))
+            self.set_combo_data(self.delay_mode_combo, self.settings.value('delay_mode', default_delay_mode))
+            self.min_delay_entry.setText(self.settings.value('min_delay', default_min_delay))
+            self.max_delay_entry.setText(self.settings.value('max_delay', default_max_delay))
             self.filename_entry.setText(self.settings.value('base_filename', default_filename))
             self.output_dir_entry.setText(self.settings.value('output_directory', default_output))
             self.profile_name_entry.setText(self.settings.value('profile_name', default_profile_name))
             self.cleaning_patterns_edit.setPlainText(self.settings.value('cleaning_patterns', default_cleaning_patterns)) # Load cleaning patterns
+            self.title_patterns_edit.setPlainText(self.settings.value('title_patterns', default_title_patterns))
             # is_checked = self.settings.value('advanced_options_checked', default_advanced_checked, type=bool) # No longer checkable
             # self.advanced_options_group.setChecked(is_checked) # No longer checkable
             # Restore window geometry and splitter state
@@ -1859,10 +1562,24 @@ class MainWindow(QMainWindow):
             self.batch_size_entry.setText(default_batch)
             self.max_retries_entry.setText(default_retries)
             self.delay_entry.setText(default_delay)
+            self.num_browsers_entry.setText(default_browsers)
+            self.set_combo_data(self.fetch_mode_combo, default_fetch_mode)
+            self.set_combo_data(self.extractor_combo, default_extractor_mode)
+            self.cache_size_entry.setText(default_cache_size)
+            self.cache_age_entry.setText(default_cache_age)
+            self.set_combo_data(self.block_mode_combo, default_block_mode)
+            self.block_rules_entry.setText(default_block_rules)
+            self.title_threshold_entry.setText(default_title_threshold)
+            self.recycle_pages_entry.setText(default_recycle_pages)
+            self.browser_memory_entry.setText(default_browser_memory)
+            self.set_combo_data(self.delay_mode_combo, default_delay_mode)
+            self.min_delay_entry.setText(default_min_delay)
+            self.max_delay_entry.setText(default_max_delay)
             self.filename_entry.setText(default_filename)
             self.output_dir_entry.setText(default_output)
             self.profile_name_entry.setText(default_profile_name)
             self.cleaning_patterns_edit.setPlainText(default_cleaning_patterns) # Load default cleaning patterns
+            self.title_patterns_edit.setPlainText(default_title_patterns)
             # self.advanced_options_group.setChecked(default_advanced_checked) # No longer checkable
 
         # Ensure output directory exists after loading settings
@@ -1874,43 +1591,6 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 self.log_message(f"Warning: Could not create output directory '{output_dir}': {e}", WARNING)
 
-
-def check_chromedriver():
-    """Checks for chromedriver in common locations."""
-    chromedriver_name = "chromedriver"
-    if sys.platform.startswith('win'):
-        chromedriver_name += ".exe"
-
-    # 1. Check in the same directory as the script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    local_path = os.path.join(script_dir, chromedriver_name)
-    if os.path.exists(local_path):
-        return True, local_path
-
-    # 2. Check if it's in the system PATH
-    path_location = shutil.which(chromedriver_name)
-    if path_location:
-        return True, path_location
-
-    # 3. (Optional Windows Specific) Check common Selenium Manager location
-    if sys.platform.startswith('win'):
-        try:
-            # This path might change, relies on internal Selenium structure
-            import selenium
-            selenium_dir = os.path.dirname(selenium.__file__)
-            # Rough guess based on common structure, might need adjustment
-            manager_path_segment = os.path.join('webdriver', 'common', 'windows', chromedriver_name)
-            potential_path = os.path.join(selenium_dir, '..', 'selenium', manager_path_segment) # Navigate up and into potential manager dir
-            if os.path.exists(potential_path):
-                 # This path might be deep and version specific, maybe just return True and let Selenium find it?
-                 # For now, let's just indicate it *might* be found by Selenium itself.
-                 # return True, potential_path
-                 pass # Let Selenium handle it if it's in its manager path
-        except ImportError:
-            pass # Selenium not installed?
-
-    return False, chromedriver_name # Not found in script dir or PATH
-
 if __name__ == "__main__":
     # Check chromedriver before creating QApplication for potential error dialog
     driver_found, driver_location = check_chromedriver()
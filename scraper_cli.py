@@ -0,0 +1,282 @@
+"""
+Headless command line for the WTR-LAB scraper.
+
+Runs the same ScrapeEngine as the window, without PySide6, so jobs can run on a
+server or from cron:
+
+    python -m scraper_cli --profile MyNovel
+    python -m scraper_cli --url https://wtr-lab.com/en/serie-123/novel/chapter-1 --start 1 --end 200 --output-dir out
+
+Values from --profile are used as defaults and any flag given on the command
+line overrides them. Exit status is 0 when every chapter was scraped, 1 when
+some chapters failed and 2 when the job could not run.
+"""
+import argparse
+import datetime
+import os
+import re
+import signal
+import sys
+import threading
+
+from profile_store import DEFAULT_NUM_BROWSERS, PROFILE_DEFAULTS, list_profiles, load_profile
+from log_buffer import debug_logger
+from scraper_engine import DEBUG, INFO, WARNING, ERROR, CRITICAL, ScrapeEngine, ScrapeEvents, check_chromedriver
+from content_cleaner import parse_cleaning_rules
+from page_parsers import available_backends
+from title_normalizer import parse_title_patterns
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR", CRITICAL: "CRITICAL"}
+
+# Command line option -> profile key, for the options a profile can supply
+PROFILE_OPTIONS = {
+    "url": "url", "start": "start_chapter", "end": "end_chapter", "batch_size": "batch_size",
+    "max_retries": "max_retries", "delay": "delay_between_attempts", "browsers": "num_browsers",
+    "fetch_mode": "fetch_mode", "content_source": "extractor_mode", "cache_mb": "cache_size_mb",
+    "cache_max_age": "cache_max_age_hours", "prefix": "base_filename", "output_dir": "output_directory",
+    "block_mode": "block_mode", "block_rules": "block_rules", "title_threshold": "title_match_threshold",
+    "recycle_pages": "browser_recycle_pages", "browser_memory_mb": "browser_memory_mb",
+    "delay_mode": "delay_mode", "min_delay": "min_delay", "max_delay": "max_delay",
+}
+# Used when neither the command line nor a profile gives a value (same as the window's defaults)
+OPTION_DEFAULTS = {
+    "batch_size": "10", "max_retries": "5", "delay": "4.0", "browsers": DEFAULT_NUM_BROWSERS, "fetch_mode": "auto",
+    "content_source": "auto", "cache_mb": "500", "cache_max_age": "168", "prefix": "scraped_chapters", "block_mode": "all",
+    "title_threshold": "85", "recycle_pages": "300", "browser_memory_mb": "1500",
+    "delay_mode": "fixed", "min_delay": "1.0", "max_delay": "15.0",
+    "output_dir": os.path.join(os.path.expanduser("~"), "ScrapedChapters"),
+}
+
+
+class ConsoleEvents(ScrapeEvents):
+    """Prints engine events to the terminal and remembers how the job ended."""
+
+    def __init__(self, total_chapters, quiet=False, prefix="", verbose=False):
+        self.total_chapters = total_chapters
+        self.quiet = quiet
+        self.verbose = verbose # Print DEBUG records too instead of only writing them to the debug log
+        self._debug_log = debug_logger()
+        self.prefix = prefix # Tells the jobs apart when queue_cli runs several at once
+        self.failed_chapters = []
+        self.had_critical_error = False
+        self._eta_text = ""
+        self._rate_text = ""
+        self._print_lock = threading.Lock() # Events arrive from every browser thread
+
+    def _print(self, text, stream=sys.stdout):
+        with self._print_lock:
+            print(f"{self.prefix}{text}", file=stream, flush=True)
+
+    def log_message(self, message, severity):
+        if severity == DEBUG:
+            self._debug_log.debug(f"{self.prefix}{message.strip()}")
+            if not self.verbose:
+                return
+        if self.quiet and severity <= INFO:
+            return
+        timestamp = datetime.datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
+        self._print(f"{timestamp} {LEVEL_NAMES.get(severity, 'INFO')}: {message}",
+                    sys.stderr if severity >= ERROR else sys.stdout)
+
+    def progress_updated(self, chapters_processed):
+        self._print(f"Progress: {chapters_processed}/{self.total_chapters} chapters {self._eta_text} {self._rate_text}".rstrip())
+
+    def estimated_time_updated(self, text):
+        self._eta_text = "" if "N/A" in text or "Calculating" in text else f"({text})"
+
+    def request_rate_updated(self, pages_per_minute, delay_seconds):
+        self._rate_text = f"[{pages_per_minute:.1f} pages/min, delay {delay_seconds:.1f}s]"
+
+    def saving_error(self, message):
+        self._print(f"Saving error: {message}", sys.stderr)
+
+    def critical_error(self, message):
+        self.had_critical_error = True
+        self._print(f"Critical error: {message}", sys.stderr)
+
+    def scrape_summary(self, successful_count, failed_chapters):
+        self.failed_chapters = list(failed_chapters)
+        self._print(f"Scraped {successful_count} of {self.total_chapters} chapters successfully.")
+        if failed_chapters:
+            self._print(f"Failed chapters: {', '.join(map(str, sorted(failed_chapters)))}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m scraper_cli",
+                                     description="Scrape WTR-LAB chapters without the GUI.")
+    add_job_arguments(parser)
+    parser.add_argument("--list-profiles", action="store_true", help="List the saved profiles and exit.")
+    parser.add_argument("--resume", action="store_true", help="Continue the job recorded in the output directory's journal.")
+    parser.add_argument("--quiet", action="store_true", help="Only print warnings, errors and progress.")
+    parser.add_argument("--verbose", action="store_true", help="Also print per-page debug messages (always written to logs/scraper_debug.log).")
+    return parser
+
+
+def add_job_arguments(parser):
+    """Adds the options that describe one scrape job (shared with queue_cli's "add" command)."""
+    parser.add_argument("--profile", help="Load settings from a configuration profile saved in the GUI.")
+    parser.add_argument("--settings", metavar="PATH",
+                        help="Read profiles from this QSettings INI file instead of the current user's settings "
+                             "(e.g. a WTRScraper.conf copied to a server).")
+    parser.add_argument("--url", help="URL of any chapter of the novel, e.g. https://wtr-lab.com/en/serie-123/novel/chapter-1")
+    parser.add_argument("--start", help="First chapter number.")
+    parser.add_argument("--end", help="Last chapter number.")
+    parser.add_argument("--batch-size", help="Chapters per output file (default 10).")
+    parser.add_argument("--prefix", help="Output file prefix, used for the job journal (default 'scraped_chapters').")
+    parser.add_argument("--output-dir", help="Directory for the batch files (default ~/ScrapedChapters).")
+    parser.add_argument("--max-retries", help="Attempts per page (default 5).")
+    parser.add_argument("--delay", help="Seconds between attempts and between page loads to the site (default 4.0).")
+    parser.add_argument("--delay-mode", choices=["fixed", "adaptive"],
+                        help="'fixed' (default) keeps --delay between page loads; 'adaptive' starts at --delay and shortens it "
+                             "while pages load fast and clean, and backs off on timeouts, empty pages and block pages. "
+                             "Queued jobs use the queue's shared --rate limit instead.")
+    parser.add_argument("--min-delay", help="Shortest adaptive delay in seconds (default 1.0).")
+    parser.add_argument("--max-delay", help="Longest adaptive delay in seconds (default 15.0).")
+    parser.add_argument("--browsers", help="Chrome instances scraping in parallel (default 2).")
+    parser.add_argument("--fetch-mode", choices=["auto", "browser"], help="'auto' tries plain HTTP before Chrome.")
+    parser.add_argument("--content-source", choices=["auto", "dom", "payload"], help="Where chapter text is read from.")
+    parser.add_argument("--cache-mb", help="Chapter cache size in MB, 0 disables it (default 500).")
+    parser.add_argument("--cache-max-age", help="Hours before a cached chapter is revalidated (default 168).")
+    parser.add_argument("--html-parser", choices=["auto", "bs4", "bs4-lxml", "lxml", "selectolax"], default="auto",
+                        help="HTML backend for page parsing; 'auto' (default) uses the fastest one installed.")
+    parser.add_argument("--dom-extraction", choices=["in-page", "page-source"], default="in-page",
+                        help="How chapter parts are read from the browser: 'in-page' (default) runs one script in the page "
+                             "and returns only the title, text and next link; 'page-source' transfers and parses the full HTML.")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="Load the next page (and in browser mode the next chapter) in a second browser tab while the "
+                             "current one is parsed. The politeness delay still spaces the page loads.")
+    parser.add_argument("--block-mode", choices=["all", "media", "off"],
+                        help="Resources the browser never downloads: 'all' (images, fonts, media, ads, analytics; default), 'media' or 'off'.")
+    parser.add_argument("--block-rules", metavar="RULES",
+                        help="Extra URL patterns to block, separated by spaces; prefix a pattern with '!' to never block it.")
+    parser.add_argument("--clean", action="append", default=None, metavar="TEXT",
+                        help="Cleaning rule: a paragraph to remove (exact match), 'contains:TEXT' to cut TEXT out of paragraphs "
+                             "or 're:REGEX' to cut regex matches; may be repeated. Replaces the profile's patterns.")
+    parser.add_argument("--cleaning-file", metavar="PATH", help="Read cleaning patterns from a file, one per line.")
+    parser.add_argument("--title-threshold", help="Similarity (0-100) above which a leading line counts as a repeated title "
+                                                   "and is removed (default 85).")
+    parser.add_argument("--recycle-pages", help="Replace a Chrome browser after this many page loads, 0 never (default 300).")
+    parser.add_argument("--browser-memory-mb", help="Replace a Chrome browser once it uses more memory than this, 0 never (default 1500).")
+    parser.add_argument("--title-pattern", action="append", default=None, metavar="REGEX",
+                        help="Extra chapter-number prefix to strip from titles (e.g. '^Ep\\.\\s*\\d+\\s*'); may be repeated. "
+                             "Replaces the profile's title patterns.")
+
+
+def resolve_options(args, parser):
+    """Merges command line flags over the profile and defaults; returns the ScrapeEngine keyword arguments."""
+    profile = dict(PROFILE_DEFAULTS)
+    if args.profile:
+        loaded = load_profile(args.profile, args.settings)
+        if loaded is None:
+            parser.error(f"configuration profile '{args.profile}' not found")
+        profile = loaded
+
+    def value(option):
+        given = getattr(args, option)
+        if given is not None:
+            return given
+        return profile.get(PROFILE_OPTIONS[option]) or OPTION_DEFAULTS.get(option, "")
+
+    match = re.search(r"(.+/chapter-)\d+", value("url"))
+    if not match:
+        parser.error("--url must be a chapter URL ending in /chapter-<number>")
+
+    numbers = {}
+    for option, convert in (("start", int), ("end", int), ("batch_size", int), ("max_retries", int),
+                            ("delay", float), ("browsers", int), ("cache_mb", int), ("cache_max_age", int),
+                            ("title_threshold", int), ("recycle_pages", int), ("browser_memory_mb", int),
+                            ("min_delay", float), ("max_delay", float)):
+        try:
+            numbers[option] = convert(value(option))
+        except ValueError:
+            parser.error(f"--{option.replace('_', '-')} must be a number (got '{value(option)}')")
+    if numbers["end"] < numbers["start"]:
+        parser.error("the end chapter must be greater than or equal to the start chapter")
+    if numbers["batch_size"] < 1 or numbers["browsers"] < 1:
+        parser.error("--batch-size and --browsers must be at least 1")
+    if not 0 <= numbers["title_threshold"] <= 100:
+        parser.error("--title-threshold must be between 0 and 100")
+    if numbers["recycle_pages"] < 0 or numbers["browser_memory_mb"] < 0:
+        parser.error("--recycle-pages and --browser-memory-mb must be 0 or more")
+    if numbers["min_delay"] <= 0 or numbers["max_delay"] < numbers["min_delay"]:
+        parser.error("--min-delay must be greater than 0 and --max-delay at least --min-delay")
+
+    output_directory = value("output_dir")
+
+    if args.cleaning_file:
+        with open(args.cleaning_file, 'r', encoding='utf-8') as f:
+            cleaning_text = f.read()
+    elif args.clean is not None:
+        cleaning_text = "\n".join(args.clean)
+    else:
+        cleaning_text = profile.get("cleaning_patterns", "")
+    cleaning_patterns = set(line.strip() for line in cleaning_text.split('\n') if line.strip())
+    cleaning_errors = parse_cleaning_rules(cleaning_patterns)[3]
+    if cleaning_errors:
+        parser.error(f"invalid cleaning pattern {cleaning_errors[0]}")
+
+    title_patterns = "\n".join(args.title_pattern) if args.title_pattern is not None else profile.get("title_patterns", "")
+    title_pattern_errors = parse_title_patterns(title_patterns)[1]
+    if title_pattern_errors:
+        parser.error(f"invalid title pattern {title_pattern_errors[0]}")
+    if args.html_parser != "auto" and args.html_parser not in available_backends():
+        parser.error(f"--html-parser {args.html_parser} is not installed (available: {', '.join(available_backends())})")
+
+    return dict(base_url_pattern=match.group(1),
+                overall_start_chapter=numbers["start"], overall_end_chapter=numbers["end"],
+                batch_size=numbers["batch_size"], base_filename=value("prefix"),
+                output_directory=output_directory, max_retries=numbers["max_retries"],
+                delay_between_attempts=numbers["delay"], cleaning_patterns=cleaning_patterns,
+                num_browsers=numbers["browsers"], fetch_mode=value("fetch_mode"),
+                extractor_mode=value("content_source"), cache_size_mb=numbers["cache_mb"],
+                cache_max_age_hours=numbers["cache_max_age"], resume=getattr(args, "resume", False),
+                block_mode=value("block_mode"), block_rules=value("block_rules"), html_backend=args.html_parser,
+                dom_extraction=args.dom_extraction, title_patterns=title_patterns,
+                title_match_threshold=numbers["title_threshold"], browser_recycle_pages=numbers["recycle_pages"],
+                browser_memory_mb=numbers["browser_memory_mb"], prefetch=getattr(args, "prefetch", False),
+                adaptive_delay=value("delay_mode") == "adaptive", min_delay=numbers["min_delay"], max_delay=numbers["max_delay"])
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list_profiles:
+        for name in list_profiles(args.settings):
+            print(name)
+        return 0
+
+    options = resolve_options(args, parser)
+    os.makedirs(options["output_directory"], exist_ok=True)
+
+    driver_found, driver_location = check_chromedriver()
+    if not driver_found:
+        message = f"Chromedriver executable ('{driver_location}') not found. Place it next to the scraper or on your PATH."
+        if options["fetch_mode"] == "browser":
+            print(message, file=sys.stderr)
+            return 2
+        print(f"Warning: {message} Chapters that are not server-rendered need the browser and will be recorded as failed.",
+              file=sys.stderr)
+
+    events = ConsoleEvents(options["overall_end_chapter"] - options["overall_start_chapter"] + 1, quiet=args.quiet, verbose=args.verbose)
+    engine = ScrapeEngine(events=events, **options)
+
+    # The engine runs in a thread so Ctrl+C reaches the main thread promptly; the first one stops gracefully
+    def handle_interrupt(signum, frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler) # A second Ctrl+C aborts immediately
+        events.log_message("Interrupted. Stopping after the current chapters (Ctrl+C again to abort)...", WARNING)
+        engine.stop()
+
+    signal.signal(signal.SIGINT, handle_interrupt)
+    engine_thread = threading.Thread(target=engine.run, name="ScrapeEngine")
+    engine_thread.start()
+    while engine_thread.is_alive():
+        engine_thread.join(0.5)
+
+    if events.had_critical_error:
+        return 2
+    return 1 if events.failed_chapters else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1237 @@
+"""
+Scraping engine without any GUI dependency.
+
+ScrapeEngine runs a whole scrape job (browser pool, HTTP fast path, cache,
+journal and batch files) in the calling thread and reports progress through a
+ScrapeEvents object. The Qt window wraps it in a QThread that forwards the
+events to signals; scraper_cli.py drives it from a terminal.
+"""
+import requests
+from selenium.common.exceptions import TimeoutException as WebDriverTimeoutException
+import json
+import time
+import os
+import sys
+import shutil
+import threading
+import queue
+from urllib.parse import urlparse
+
+import re
+
+
+from extractors import PAYLOAD_SCRIPTS_JS, find_payload_scripts, extract_chapter_payload
+from chapter_cache import ChapterCache
+from scrape_journal import ScrapeJournal, journal_path, load_journal
+from batch_writer import BatchFileWriter
+from page_waits import READY_JS, STAGE_CONTAINER, STAGE_TEXT, AdaptiveWaitPolicy
+from page_parsers import PAGE_PARTS_JS, available_backends, get_backend
+from resource_blocking import PAGE_METRICS_JS, BlockingStats, apply_block_list, build_block_list
+from title_normalizer import DEFAULT_TITLE_MATCH_THRESHOLD, TitleMatcher, TitleNormalizer, parse_title_patterns
+from content_cleaner import ContentCleaner
+from chapter_states import FAILED, RETRIED_SUCCESS, SUCCESS, ChapterStates
+from phase_timings import PhaseTrace
+from browser_service import DEFAULT_MEMORY_LIMIT_MB, DEFAULT_RECYCLE_PAGES, USER_AGENT, BrowserService
+from page_prefetch import TabPrefetcher
+from retry_policy import AI_BLOCK, BROWSER_UNAVAILABLE, DRIVER_ERROR, EMPTY_BODY, MISSING_BODY, NO_PAYLOAD, TIMEOUT, UNKNOWN, RetryPolicy, RetryScheduler
+from chapter_result import ChapterResult, ChapterStatus
+from throttle import DEFAULT_MAX_DELAY, DEFAULT_MIN_DELAY, SERVER_BUSY, AdaptiveThrottle, HostThrottle
+# --- Severity Levels for Logging ---
+DEBUG = -1 # Per-page detail; the GUI and CLI write it to the rotating debug log rather than showing it
+INFO = 0
+WARNING = 1
+ERROR = 2
+CRITICAL = 3
+
+HTTP_TIMEOUT = 20 # Seconds to wait for a plain-HTTP chapter response
+
+
+# --- Progress Callbacks ---
+
+class ScrapeEvents:
+    """
+    Callback interface of ScrapeEngine. Subclass it and override the events you need;
+    every method is a no-op by default. Methods are called from the engine's threads.
+
+    chapter_finished reports each chapter outcome without its text. chapter_scraped, which
+    carries the full chapter content, is only called for subclasses that set wants_content.
+    """
+
+    wants_content = False # Set to True to receive chapter_scraped with each chapter's text
+
+    def log_message(self, message, severity): pass
+    def progress_updated(self, chapters_processed): pass
+    def chapter_finished(self, chapter_num, status, content_bytes, seconds): pass
+    def chapter_scraped(self, title, content, chapter_num): pass
+    def saving_error(self, message): pass
+    def critical_error(self, message): pass
+    def finished(self): pass
+    def current_chapter_status(self, status): pass
+    def scrape_summary(self, successful_count, failed_chapters): pass
+    def estimated_time_updated(self, text): pass
+    def request_rate_updated(self, pages_per_minute, delay_seconds): pass
+
+
+# --- Scraping Engine ---
+
+class ScrapeEngine:
+    """Runs one scrape job. Call run() in a worker thread (or the main thread) and stop() to cancel it."""
+
+
+    def __init__(self, base_url_pattern, overall_start_chapter, overall_end_chapter, batch_size, base_filename, output_directory, max_retries, delay_between_attempts, cleaning_patterns, num_browsers=1, fetch_mode="auto", extractor_mode="auto",
+                 cache_size_mb=0, cache_max_age_hours=168, resume=False, events=None, throttle=None,
+                 block_mode="all", block_rules="", html_backend="auto", dom_extraction="in-page", title_patterns="",
+                 title_match_threshold=DEFAULT_TITLE_MATCH_THRESHOLD, browser_service=None,
+                 browser_recycle_pages=DEFAULT_RECYCLE_PAGES, browser_memory_mb=DEFAULT_MEMORY_LIMIT_MB, prefetch=False,
+                 retry_policy=None, adaptive_delay=False, min_delay=DEFAULT_MIN_DELAY, max_delay=DEFAULT_MAX_DELAY):
+        self.events = events or ScrapeEvents() # Receives progress callbacks; the default ignores them
+        self.base_url_pattern = base_url_pattern
+        self.overall_start_chapter = overall_start_chapter
+        self.overall_end_chapter = overall_end_chapter
+        self.batch_size = batch_size
+        self.base_filename = base_filename
+        self.output_directory = output_directory
+        self.max_retries = max_retries
+        self.delay_between_attempts = delay_between_attempts
+        self.cleaning_patterns = cleaning_patterns # Store cleaning patterns
+        self.content_cleaner = ContentCleaner(cleaning_patterns) # Exact, 'contains:' and 're:' rules compiled once for the whole job
+        self._is_running = True
+        self.chapter_states = ChapterStates(overall_start_chapter, overall_end_chapter) # Status, attempts and timings per chapter
+        self._start_time = None
+        self.batch_writer = None # Streams each batch file to disk once all its chapters are resolved
+        self.num_browsers = max(1, num_browsers) # Number of Chrome instances scraping in parallel
+        self._browsers = [None] * self.num_browsers # One leased browser per pool slot, kept from chapter to chapter
+        self._browser_unavailable = [False] * self.num_browsers # Slots whose Chrome failed to start; in auto mode they go on over HTTP
+        # Browsers come from a service that outlives the run when one is passed in (the window, the job queue)
+        self.browser_service = browser_service or BrowserService()
+        self._owns_browser_service = browser_service is None
+        self.browser_recycle_pages = browser_recycle_pages # Replace a browser after this many page loads (0 never)
+        self.browser_memory_mb = browser_memory_mb # ... or once its memory passes this (0 never)
+        self.prefetch = prefetch # Load the next page in a second tab while the current one is parsed
+        self._prefetchers = [None] * self.num_browsers # The TabPrefetcher of each slot's browser
+        self.prefetch_stats = {"started": 0, "used": 0, "wasted": 0, "failed": 0} # Totals of the closed prefetchers
+        self.fetch_mode = fetch_mode # "auto" tries plain HTTP before the browser, "browser" always uses Selenium
+        self._sessions = [None] * self.num_browsers # One requests.Session per pool slot for the HTTP fast path
+        self.fetch_path_counts = {"http": 0, "browser": 0} # Which path produced each chapter scrape
+        self.extractor_mode = extractor_mode # "auto" prefers an embedded JSON payload, "dom" parses the page, "payload" requires a payload
+        self.extractor_counts = {"payload": 0, "dom": 0} # Which extractor produced each chapter scrape
+        self.fetch_path_counts["cache"] = 0
+        self.cache_size_mb = cache_size_mb # 0 disables the on-disk chapter cache
+        self.cache_max_age = cache_max_age_hours * 3600 # Older entries are revalidated with the server before use
+        self.cache = None
+        self.resume = resume # Continue the job recorded in the journal instead of starting over
+        self.journal_path = journal_path(output_directory, base_filename)
+        self.journal = None
+        self._state_lock = threading.Lock() # Guards the result collections shared by the pool threads
+        self._pool_lock = threading.Lock() # Makes taking a chapter and counting it in flight one step
+        self._chapters_in_flight = 0 # Chapters a pool thread is working on; one may still come back to the queue
+        self.block_patterns = build_block_list(block_mode, block_rules) # URL patterns the browsers never download
+        self.blocking_stats = BlockingStats(block_mode, self.block_patterns)
+        # Parses each page once. A backend that is not installed here (e.g. named by a job queued on another machine) falls back to the fastest one
+        self.requested_html_backend = html_backend
+        self.html_backend = get_backend(html_backend if html_backend in available_backends() else "auto")
+        self.dom_extraction = dom_extraction # "in-page" reads the chapter parts in the browser, "page-source" parses the full HTML in Python
+        self.dom_transfer = {"in_page": [0, 0], "page_source": [0, 0]} # [pages, characters] read from the browser per method
+        self.extra_title_patterns, self.title_pattern_errors = parse_title_patterns(title_patterns)
+        self.title_normalizer = TitleNormalizer(self.extra_title_patterns) # Strips 'Chapter 12:'-style prefixes, plus this series' own patterns
+        self.title_match_threshold = title_match_threshold # Similarity (0-100) a leading line must exceed to count as a repeated title
+        self.wait_policy = AdaptiveWaitPolicy() # Page readiness timeout from observed load times, plus the wait histogram
+        self.adaptive_delay = adaptive_delay and throttle is None # Steer the delay between min_delay and max_delay by the site's responses
+        if throttle is None:
+            throttle = AdaptiveThrottle(delay_between_attempts, min_delay, max_delay) if self.adaptive_delay else HostThrottle(delay_between_attempts)
+        self._throttle = throttle # Politeness delay shared by all browsers (a job queue passes one shared by all jobs)
+        self.retry_policy = retry_policy or RetryPolicy(delay_between_attempts) # Retries and backoff per failure class
+        self.retry_scheduler = RetryScheduler(self.retry_policy) # Failed chapters waiting for their retry
+        self._total_chapters = overall_end_chapter - overall_start_chapter + 1
+        self._chapters_processed_count = 0
+        self.timings = PhaseTrace() # Replaced in run() by one that also writes the JSONL trace
+
+
+    @property
+    def total_chapters(self):
+        """Number of chapters in the job's range."""
+        return self._total_chapters
+
+    @property
+    def successful_chapters_count(self):
+        return self.chapter_states.count(SUCCESS, RETRIED_SUCCESS)
+
+    @property
+    def failed_chapters(self):
+        """The chapters that are failed right now, in chapter order."""
+        return self.chapter_states.failed_chapters()
+
+    def _cache_settings_key(self):
+        """Digest of the settings that shape a chapter's cached text; entries made under other settings are misses."""
+        return ChapterCache.settings_digest({"cleaning_patterns": sorted(self.cleaning_patterns or ()),
+                                             "title_patterns": self.extra_title_patterns,
+                                             "title_match_threshold": self.title_match_threshold,
+                                             "extractor_mode": self.extractor_mode, "dom_extraction": self.dom_extraction})
+
+    def _summary_file(self, suffix):
+        """Path of a per-job report file (summary JSON, timing trace) in the summary directory, which is created."""
+        summary_dir = os.path.join(os.path.dirname(__file__), 'summary')
+        os.makedirs(summary_dir, exist_ok=True)
+        return os.path.join(summary_dir, re.sub(r'[\\/:*?"<>|]', '_', f"{self.base_filename}{suffix}"))
+
+    def run(self):
+        """The main logic that runs in the separate thread."""
+        self._start_time = time.time()
+        try:
+            try:
+                self.timings = PhaseTrace(self._summary_file("_trace.jsonl"))
+            except OSError as e:
+                self.events.log_message(f"Could not create the timing trace file: {e}. Timings only go to the summary.", WARNING)
+            if self.cache_size_mb > 0:
+                cache_path = os.path.join(os.path.dirname(__file__), 'cache', 'chapter_cache.sqlite3')
+                self.cache = ChapterCache(cache_path, self.cache_size_mb * 1024 * 1024, self._cache_settings_key())
+                self.events.log_message(f"Using chapter cache at {cache_path} (limit {self.cache_size_mb} MB).", INFO)
+
+            for error in self.content_cleaner.errors:
+                self.events.log_message(f"Ignoring invalid cleaning pattern {error}", WARNING)
+            for error in self.title_pattern_errors:
+                self.events.log_message(f"Ignoring invalid title pattern {error}", WARNING)
+            if self.requested_html_backend not in ("auto", self.html_backend.name):
+                self.events.log_message(f"HTML parser '{self.requested_html_backend}' is not installed; using {self.html_backend.name} instead.", WARNING)
+
+            self.events.log_message(f"Scraping chapters {self.overall_start_chapter} to {self.overall_end_chapter} using {self.num_browsers} browser(s) and the {self.html_backend.name} HTML parser{' (browser pages are read in-page)' if self.dom_extraction == 'in-page' else ''}...", INFO)
+
+            # --- Checkpoint journal: every finished chapter is appended so a crash loses nothing ---
+            chapters = range(self.overall_start_chapter, self.overall_end_chapter + 1)
+            job_info = {"base_url_pattern": self.base_url_pattern, "start_chapter": self.overall_start_chapter,
+                        "end_chapter": self.overall_end_chapter, "batch_size": self.batch_size, "base_filename": self.base_filename}
+            journal_chapters = load_journal(self.journal_path, include_content=False)[1] if self.resume else {}
+            self.journal = ScrapeJournal(self.journal_path, job_info, resume=self.resume)
+            self.batch_writer = BatchFileWriter(self.overall_start_chapter, self.overall_end_chapter, self.batch_size,
+                                                self.output_directory, self.journal)
+            if self.resume:
+                chapters = self._restore_from_journal(journal_chapters)
+
+            # --- Every browser takes chapters from one shared queue, and failed chapters come back after their backoff ---
+            unprocessed = self._run_pool(chapters)
+
+            if unprocessed and self._is_running: # Only browser mode leaves chapters behind when Chrome does not start
+                raise RuntimeError("Could not start any Chrome browser.")
+
+
+        except Exception as e:
+            self.events.log_message(f"\nAn unexpected error occurred during the scraping process: {e}", CRITICAL)
+            self.events.critical_error(f"An unexpected error occurred during scraping: {e}. See log for details.")
+
+        finally:
+            for slot in range(self.num_browsers):
+                self._close_prefetcher(slot) # Before the browsers are handed back, so none is left mid-navigation
+            active_browsers = [browser for browser in self._browsers if browser]
+            for browser in active_browsers:
+                self.browser_service.release(browser)
+            if self._owns_browser_service:
+                if active_browsers:
+                    self.events.log_message(f"\nClosing {len(active_browsers)} Chrome browser(s)...", INFO)
+                self.browser_service.shutdown()
+                self.events.log_message("Drivers quit successfully.", DEBUG)
+            elif active_browsers:
+                self.events.log_message(f"\nKeeping {len(active_browsers)} Chrome browser(s) running for the next run.", INFO)
+            for session in self._sessions:
+                if session:
+                    session.close()
+            if self.batch_writer:
+                try:
+                    for filepath in self.batch_writer.finish(): # Batches left open by a stop request or an error
+                        self.events.log_message(f"  Wrote incomplete batch file: {filepath}", WARNING)
+                except Exception as e:
+                    self.events.log_message(f"  Error writing remaining batch files: {e}", ERROR)
+                    self.events.saving_error(f"Could not write the remaining batch files. Error: {e}")
+                self.chapter_states.set_output_files(self.batch_writer.output_file)
+            if self.journal:
+                self.journal.close()
+
+            # --- Save Summary JSON ---
+            self.events.log_message("Attempting to save summary JSON...", DEBUG)
+            summary_filepath = self._summary_file("_summary.json") # Use base_filename from input for summary
+            self.timings.close()
+            failed_chapters = self.failed_chapters
+            summary_data = {
+                "total_chapters_attempted": self.overall_end_chapter - self.overall_start_chapter + 1,
+                "successful_count": self.successful_chapters_count,
+                "failed_count": len(failed_chapters),
+                "fetch_paths": self.fetch_path_stats(),
+                "extractors": self._extractor_stats(),
+                "cache": self.cache.summary() if self.cache else {"enabled": False},
+                "page_waits": self.wait_policy.summary(),
+                "resource_blocking": self.blocking_stats.summary(),
+                "title_normalizer": self._title_normalizer_stats(),
+                "cleaning": self.content_cleaner.summary(),
+                "timings": self.timings.summary(),
+                "browsers": {"recycle_pages": self.browser_recycle_pages, "memory_limit_mb": self.browser_memory_mb,
+                             **self.browser_service.summary()},
+                "prefetch": {"enabled": self.prefetch, **self.prefetch_stats},
+                "retries": self.retry_scheduler.summary(),
+                "politeness_delay": self._throttle.summary(),
+                "results": self.chapter_states.results() # Already in chapter order
+            }
+            try:
+                with open(summary_filepath, 'w', encoding='utf-8') as f:
+                    json.dump(summary_data, f, indent=4)
+                self.events.log_message(f"Saved scrape summary to {summary_filepath}", INFO)
+            except Exception as e:
+                self.events.log_message(f"Error saving summary JSON to {summary_filepath}: {e}", ERROR)
+            self.events.log_message("Finished saving summary JSON.", DEBUG)
+            # --- End Save Summary JSON ---
+            if self.cache:
+                self.cache.close()
+
+            # Emit scrape summary data
+            self.events.log_message("Emitting scrape_summary signal...", DEBUG)
+            self.events.scrape_summary(self.successful_chapters_count, failed_chapters) # Keep summary signal
+            self.events.estimated_time_updated("Estimated Time Remaining: N/A")
+
+            self.events.log_message("Emitting finished signal...", DEBUG)
+            self.events.log_message("\n--- Scraping process finished ---", INFO)
+            self.events.finished()
+
+
+    def stop(self):
+        """Requests a graceful stop; safe to call from any thread."""
+        self.events.log_message("Stop signal received. Attempting graceful shutdown...", INFO)
+        self._is_running = False
+
+    def _run_pool(self, chapters):
+        """
+        Scrapes the given chapters with one thread per browser and waits for all of them,
+        including the retries the failed chapters are given by the retry scheduler.
+        """
+        chapter_queue = queue.Queue()
+        for chapter_num in chapters:
+            chapter_queue.put(chapter_num)
+
+        pool_size = min(self.num_browsers, chapter_queue.qsize())
+        threads = []
+        for slot in range(pool_size):
+            thread = threading.Thread(target=self._pool_worker, args=(slot, chapter_queue),
+                                      name=f"ScrapeBrowser-{slot + 1}", daemon=True)
+            threads.append(thread)
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return chapter_queue.qsize() # Chapters left over because no browser could take them
+
+    def _next_chapter(self, chapter_queue, reserved):
+        """
+        Picks a pool thread's next chapter: a reserved (prefetched) one, then a retry that is due, then a new chapter,
+        else waits for the next retry to come due. Returns (chapter, retry) with retry None for a first attempt,
+        or (None, None) when nothing is left. The chapter counts as in flight until _chapter_done().
+        """
+        while self._is_running:
+            if reserved:
+                return reserved.pop(), None # Counted in flight when it was reserved
+            with self._pool_lock:
+                retry = self.retry_scheduler.pop_due()
+                if retry is not None:
+                    self._chapters_in_flight += 1
+                    return retry[0], retry
+                try:
+                    chapter_num = chapter_queue.get_nowait()
+                    self._chapters_in_flight += 1
+                    return chapter_num, None
+                except queue.Empty:
+                    pass
+                busy = self._chapters_in_flight > 0
+            wait = self.retry_scheduler.next_due_in()
+            if wait is None:
+                if not busy:
+                    break
+                wait = 0.25 # Another thread may still schedule a retry or hand its chapter back to the queue
+            time.sleep(min(wait, 0.25)) # Short steps so a stop request is not delayed by a long backoff
+        return None, None
+
+    def _chapter_done(self):
+        with self._pool_lock:
+            self._chapters_in_flight -= 1
+
+    def _pool_worker(self, slot, chapter_queue):
+        """Owns one browser (and HTTP session) and scrapes chapters and due retries until none are left."""
+        reserved = [] # A chapter taken from the queue early so its first page could be prefetched
+
+        def reserve_next_chapter():
+            with self._pool_lock:
+                try:
+                    reserved.append(chapter_queue.get_nowait())
+                except queue.Empty:
+                    return None
+                self._chapters_in_flight += 1
+            return self._chapter_url(reserved[-1])
+
+        # Chapters only go to the browser in browser mode, where a prefetched first page is never wasted on a cache hit
+        next_chapter_url = reserve_next_chapter if self.prefetch and self.fetch_mode == "browser" and self.cache_size_mb <= 0 else None
+        while self._is_running:
+            chapter_num, retry = self._next_chapter(chapter_queue, reserved)
+            if chapter_num is None:
+                break
+            try:
+                if not self._pool_chapter(slot, chapter_num, retry, next_chapter_url):
+                    # Browser mode without a browser: leave the chapters to a slot whose Chrome did start
+                    if retry:
+                        self.retry_scheduler.requeue(*retry)
+                    else:
+                        chapter_queue.put(chapter_num)
+                    while reserved:
+                        chapter_queue.put(reserved.pop())
+                        self._chapter_done()
+                    return
+            finally:
+                self._chapter_done() # After any requeue, so no idle thread exits before it sees the chapter
+
+    def _pool_chapter(self, slot, chapter_num, retry, next_chapter_url):
+        """Scrapes and records one chapter (or retry) for a pool thread. Returns False if it needs a browser that did not start."""
+        if retry:
+            self.events.current_chapter_status(f"Browser {slot + 1}: Retrying Chapter {chapter_num}...")
+            self.events.log_message(f"  Retrying chapter {chapter_num} (retry {retry[2]}, after {retry[1]})...", INFO)
+        else:
+            with self._state_lock:
+                done_count = self._chapters_processed_count
+            self.events.current_chapter_status(f"Browser {slot + 1}: Chapter {chapter_num} ({done_count} of {self._total_chapters} done)...")
+
+        chapter_url = self._chapter_url(chapter_num)
+        self.chapter_states.begin(chapter_num, time.monotonic())
+        with self.timings.chapter(chapter_num, retry=retry[2] if retry else 0) as chapter_timing:
+            scraped = self._scrape_chapter(slot, chapter_url, chapter_num, next_chapter_url)
+            chapter_timing["fetch_path"] = scraped.fetch_path if scraped else None
+        if scraped is None:
+            self.chapter_states.abandon(chapter_num)
+            return False
+        if scraped.fetch_path: # None when the chapter needed a browser that could not start
+            with self._state_lock:
+                self.fetch_path_counts[scraped.fetch_path] += 1
+                self.extractor_counts[scraped.extractor] += 1
+
+        if retry:
+            self._record_retry_result(chapter_num, scraped)
+            if scraped.complete:
+                self.retry_scheduler.record_recovered(retry[1])
+        else:
+            self._record_chapter_result(chapter_num, chapter_url, scraped)
+        if not scraped.complete:
+            self._schedule_retry(chapter_num, scraped.failure, retry[2] + 1 if retry else 1)
+        return True
+
+    def _schedule_retry(self, chapter_num, failure, retry_number):
+        """Defers the next retry of a failed chapter, or gives up when its failure class has no retries left."""
+        backoff = self.retry_scheduler.schedule(chapter_num, failure, retry_number)
+        if backoff is not None:
+            self.events.log_message(f"  Chapter {chapter_num} failed ({failure}); retry {retry_number} of "
+                                    f"{self.retry_scheduler.policy.max_retries(failure)} in {backoff:.1f}s.", INFO)
+        elif retry_number > 1:
+            self.events.log_message(f"  Giving up on chapter {chapter_num} after {retry_number - 1} retries ({failure}).", WARNING)
+        else:
+            self.events.log_message(f"  Chapter {chapter_num} failed ({failure}), which retrying cannot fix.", WARNING)
+
+    def _chapter_url(self, chapter_num):
+        return f"{self.base_url_pattern}{chapter_num}?service=google" # Append Google Translate parameter
+
+    def _build_http_session(self):
+        """Creates a keep-alive requests session (gzip is negotiated by requests) for the plain-HTTP fast path."""
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=2)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'User-Agent': USER_AGENT,
+                                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                                'Accept-Encoding': 'gzip, deflate'})
+        return session
+
+    def _get_driver(self, slot):
+        """
+        Returns the driver of the browser leased by a pool slot, leasing one on first use and replacing it
+        when it is due for recycling or fails its health check. Returns None if Chrome fails to start.
+        """
+        browser = self._browsers[slot]
+        if browser is not None:
+            if self._prefetchers[slot] is not None:
+                self._prefetchers[slot].settle() # The checks below send the driver commands; its prefetch thread must be done with it
+            reason = self.browser_service.recycle_reason(browser, self.browser_recycle_pages, self.browser_memory_mb)
+            if reason is None:
+                return browser.driver
+            detail = {"pages": f"{browser.pages} pages loaded", "memory": f"{browser.memory_mb} MB in use",
+                      "unhealthy": "not responding"}[reason]
+            self.events.log_message(f"Recycling Chrome browser {slot + 1} ({detail})...", INFO)
+            self._close_prefetcher(slot)
+            self.browser_service.retire(browser, reason)
+            self._browsers[slot] = None
+        try:
+            browser = self.browser_service.acquire()
+            self.events.log_message(f"{'Attached to running' if browser.reused else 'Started'} Chrome browser {slot + 1}"
+                                    f"{' (profile ' + browser.profile_dir + ')' if browser.profile_dir else ''}.", INFO)
+            browser.driver.set_script_timeout(self.wait_policy.max_timeout + 10) # READY_JS enforces the real, adaptive timeout itself
+        except Exception as e:
+            self.events.log_message(f"Could not start Chrome browser {slot + 1}: {e}", ERROR if self.fetch_mode == "browser" else WARNING)
+            return None
+        self._browsers[slot] = browser
+        if self.block_patterns or browser.reused: # A reused browser may still block what an earlier run chose
+            try:
+                apply_block_list(browser.driver, self.block_patterns)
+            except Exception as e:
+                self.events.log_message(f"Could not enable resource blocking in browser {slot + 1}: {e}", WARNING)
+        if self.prefetch:
+            self._prefetchers[slot] = TabPrefetcher(browser.driver, self._throttle, lambda: self._is_running,
+                                                    on_page_load=self.browser_service.page_loaded,
+                                                    on_new_tab=(lambda driver: apply_block_list(driver, self.block_patterns)) if self.block_patterns else None)
+        return browser.driver
+
+    def _close_prefetcher(self, slot):
+        """Closes the prefetch tab of a slot's browser and adds its counters to the run's totals."""
+        prefetcher = self._prefetchers[slot]
+        if prefetcher is not None:
+            prefetcher.close()
+            with self._state_lock:
+                for key, count in prefetcher.stats.items():
+                    self.prefetch_stats[key] += count
+            self._prefetchers[slot] = None
+
+    def _scrape_chapter(self, slot, chapter_url, chapter_num, next_chapter_url=None):
+        """
+        Scrapes one chapter, trying the plain-HTTP fast path first when enabled. next_chapter_url, when given,
+        returns the URL of the slot's next chapter so the browser can prefetch it.
+        Returns a ChapterResult with its fetch_path set, or None in browser mode if the slot's browser could not be started.
+        In auto mode a chapter that needs a browser the slot could not start fails with BROWSER_UNAVAILABLE (fetch_path None).
+        """
+        if self.cache:
+            with self.timings.timed("cache_lookup"):
+                cached = self._lookup_cache(slot, chapter_url, chapter_num)
+            if cached:
+                # The cached text is already joined, so it stays one page rather than being split and joined again
+                scraped = ChapterResult.from_pages(cached["title"], [cached["content"]], extractor=cached["extractor"] or "dom")
+                scraped.fetch_path = "cache"
+                return scraped
+
+        fetch_info = {} # Raw HTML and HTTP validators captured for the cache
+        scraped = None
+        if self.fetch_mode == "auto":
+            scraped = self._scrape_chapter_http(self._get_session(slot), chapter_url, chapter_num, self.content_cleaner, fetch_info)
+            if scraped:
+                scraped.fetch_path = "http"
+
+        if scraped is None:
+            driver = None if self._browser_unavailable[slot] else self._get_driver(slot)
+            if driver is None:
+                if self.fetch_mode == "browser":
+                    return None
+                if not self._browser_unavailable[slot]:
+                    self._browser_unavailable[slot] = True # Starting Chrome again for every chapter would only fail again
+                    self.events.log_message(f"Browser {slot + 1} goes on over plain HTTP only; chapters that need the browser "
+                                            f"are recorded as failed ({BROWSER_UNAVAILABLE}).", WARNING)
+                return ChapterResult("Title Not Found", ChapterStatus.FAILED, failure=BROWSER_UNAVAILABLE)
+            fetch_info = {} # The browser has no raw HTML or validators to offer
+            if self.blocking_stats.claim_calibration():
+                self._calibrate_blocking(driver, chapter_url)
+            scraped = self.scrape_single_chapter(driver, chapter_url, chapter_num,
+                                                 max_retries=self.max_retries,
+                                                 delay_between_attempts=self.delay_between_attempts,
+                                                 cleaning_patterns=self.content_cleaner, # Pass the compiled rules
+                                                 prefetcher=self._prefetchers[slot], next_chapter_url=next_chapter_url)
+            scraped.fetch_path = "browser"
+
+        # Only complete chapters are cached, so failed and partial ones always go back to the network
+        if self.cache and scraped.complete:
+            try:
+                self.cache.put(chapter_url, scraped.title, scraped.text(), scraped.extractor, html=fetch_info.get("html"),
+                               etag=fetch_info.get("etag"), last_modified=fetch_info.get("last_modified"))
+            except Exception as e:
+                self.events.log_message(f"  Could not store chapter {chapter_num} in the cache: {e}", WARNING)
+        return scraped
+
+    def _calibrate_blocking(self, driver, chapter_url):
+        """Loads one page without resource blocking, as the baseline for the bytes/time saved in the summary."""
+        try:
+            apply_block_list(driver, [])
+            driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+            self._throttle.wait(chapter_url, lambda: self._is_running)
+            load_start = time.monotonic()
+            driver.get(chapter_url)
+            self.browser_service.page_loaded(driver)
+            driver.execute_async_script(READY_JS, int(self.wait_policy.initial_timeout * 1000))
+            load_seconds = time.monotonic() - load_start
+            self.blocking_stats.record_calibration(driver.execute_script(PAGE_METRICS_JS) or {}, load_seconds)
+            self.events.log_message(f"  Resource blocking calibration: unblocked page took {load_seconds:.2f}s.", INFO)
+        except Exception as e:
+            self.events.log_message(f"  Resource blocking calibration failed: {e}", WARNING)
+        finally:
+            try:
+                driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+                if not self.browser_service.persistent_profiles: # A persistent profile's cache is warm on purpose
+                    driver.execute_cdp_cmd("Network.clearBrowserCache", {}) # Keep the calibration load from warming the measured pages
+                apply_block_list(driver, self.block_patterns)
+            except Exception as e:
+                self.events.log_message(f"  Could not restore resource blocking after calibration: {e}", WARNING)
+
+    def _get_session(self, slot):
+        """Returns the HTTP session owned by a pool slot, creating it on first use."""
+        if self._sessions[slot] is None:
+            self._sessions[slot] = self._build_http_session()
+        return self._sessions[slot]
+
+    def _lookup_cache(self, slot, chapter_url, chapter_num):
+        """Returns the cached chapter if it is fresh or still valid on the server, otherwise None (a miss)."""
+        try:
+            cached = self.cache.get(chapter_url)
+            if cached is not None:
+                if time.time() - cached["fetched_at"] <= self.cache_max_age:
+                    self.cache.record_hit(chapter_url)
+                    self.events.log_message(f"  Served chapter {chapter_num} from cache.", INFO)
+                    return cached
+                if self._revalidate_cached(slot, chapter_url, cached):
+                    self.cache.record_hit(chapter_url, revalidated=True)
+                    self.events.log_message(f"  Cached chapter {chapter_num} is unchanged on the server, serving it from cache.", INFO)
+                    return cached
+            self.cache.record_miss()
+        except Exception as e:
+            self.events.log_message(f"  Chapter cache lookup failed for chapter {chapter_num}: {e}", WARNING)
+        return None
+
+    def _revalidate_cached(self, slot, chapter_url, cached):
+        """Asks the server whether a stale cache entry changed, using ETag/Last-Modified or the stored HTML digest."""
+        if not (cached["etag"] or cached["last_modified"] or cached["html_sha256"]):
+            return False # Browser-scraped entries carry nothing to compare against
+        headers = {}
+        if cached["etag"]:
+            headers['If-None-Match'] = cached["etag"]
+        if cached["last_modified"]:
+            headers['If-Modified-Since'] = cached["last_modified"]
+        self._throttle.wait(chapter_url, lambda: self._is_running)
+        try:
+            response = self._get_session(slot).get(chapter_url, headers=headers, timeout=HTTP_TIMEOUT)
+        except requests.RequestException:
+            return False
+        if response.status_code == 304:
+            return True
+        return response.status_code == 200 and ChapterCache.html_digest(response.text) == cached["html_sha256"]
+
+    def _scrape_chapter_http(self, session, url, chapter_num, cleaning_patterns, fetch_info=None):
+        """
+        Scrapes a chapter from its server-rendered HTML without a browser, following the chapter pager.
+        Returns a complete ChapterResult, or None when the static HTML has no usable content and the browser is needed.
+        """
+        chapter_title_text = "Title Not Found"
+        pages = []
+        current_url = url
+        page_number = 1
+
+        while self._is_running:
+            self.timings.set_page(page_number)
+            with self.timings.timed("throttle"):
+                self._throttle.wait(current_url, lambda: self._is_running)
+            fetch_start = time.monotonic()
+            try:
+                with self.timings.timed("http_fetch") as fetch_timing:
+                    response = session.get(current_url, timeout=HTTP_TIMEOUT)
+                    fetch_timing.update(status=response.status_code, bytes=len(response.content))
+            except requests.RequestException as e:
+                self._throttle.record(current_url, time.monotonic() - fetch_start, TIMEOUT)
+                self.events.log_message(f"  HTTP fast path failed for chapter {chapter_num} (Page {page_number}): {e}. Falling back to browser.", INFO)
+                return None
+            busy = response.status_code == 429 or response.status_code >= 500
+            if busy or response.status_code == 200:
+                self._throttle.record(current_url, time.monotonic() - fetch_start, SERVER_BUSY if busy else None)
+            if response.status_code != 200:
+                self.events.log_message(f"  HTTP fast path got status {response.status_code} for chapter {chapter_num} (Page {page_number}). Falling back to browser.", INFO)
+                return None
+
+            page_source = response.text
+            if page_number == 1 and fetch_info is not None:
+                fetch_info.update(html=page_source, etag=response.headers.get('ETag'),
+                                  last_modified=response.headers.get('Last-Modified'))
+            if self.extractor_mode != "dom":
+                with self.timings.timed("payload_check"):
+                    payload = extract_chapter_payload(find_payload_scripts(page_source))
+                if payload:
+                    with self.timings.timed("parse", extractor="payload"):
+                        chapter_title_text, page_content, failure = self._parse_payload_page(payload, page_number, current_url, cleaning_patterns)
+                    result = ChapterResult.from_pages(f"Chapter {chapter_num} - {chapter_title_text}", [page_content] if page_content else [],
+                                                      failure, "payload")
+                    if not result.complete:
+                        return None
+                    self.events.log_message(f"  Scraped chapter {chapter_num} over plain HTTP from its embedded JSON payload.", INFO)
+                    return result
+                if self.extractor_mode == "payload":
+                    return None # Let the browser path look for a payload injected at runtime
+
+            with self.timings.timed("parse", extractor="dom"):
+                parts = self.html_backend.extract(page_source)
+                # Content rendered client-side shows up as a missing chapter body, or a body holding the loading skeleton
+                server_rendered = parts["has_body"] and not parts["has_placeholder"]
+                if server_rendered:
+                    chapter_title_text, page_content, failure, next_page_link = self._parse_chapter_page(
+                        parts, page_number, chapter_title_text, current_url, url, cleaning_patterns, f"{self.html_backend.name} parser")
+            if not server_rendered:
+                self.events.log_message(f"  Chapter {chapter_num} (Page {page_number}) is not server-rendered. Falling back to browser.", INFO)
+                return None
+            if not page_content:
+                self.events.log_message(f"  No usable static content for chapter {chapter_num} (Page {page_number}). Falling back to browser.", INFO)
+                return None
+            pages.append(page_content)
+
+            if not next_page_link:
+                break
+            current_url = next_page_link
+            page_number += 1
+
+        if not self._is_running:
+            return None
+        result = ChapterResult.from_pages(f"Chapter {chapter_num} - {chapter_title_text}", pages)
+        if not result.complete:
+            return None # Only whitespace after cleaning; let the browser try
+        self.events.log_message(f"  Scraped chapter {chapter_num} over plain HTTP ({page_number} page(s)).", INFO)
+        return result
+
+    def _resolve_in_batch(self, chapter_num, title=None, content=None, journaled=False):
+        """Hands a finished chapter to the batch writer, which writes the batch file once the batch is complete."""
+        try:
+            filepath = self.batch_writer.resolve(chapter_num, title, content, journaled=journaled)
+            if filepath:
+                self.events.log_message(f"  Successfully wrote batch file: {filepath}", INFO)
+        except Exception as e:
+            self.events.log_message(f"  Error writing batch file for chapter {chapter_num}: {e}", ERROR)
+            self.events.saving_error(f"Could not write the batch file for chapter {chapter_num}. Error: {e}")
+
+    def _restore_from_journal(self, journal_chapters):
+        """Takes over the chapters an earlier run of this job completed and returns the chapters still to scrape."""
+        remaining = []
+        for chapter_num in range(self.overall_start_chapter, self.overall_end_chapter + 1):
+            record = journal_chapters.get(chapter_num)
+            if record and record["status"] == "success":
+                self._resolve_in_batch(chapter_num, journaled=True) # Text stays in the journal until its batch is written
+                self.chapter_states.finish(chapter_num, SUCCESS, title=record["title"], output_file=None,
+                                           fetch_path="journal", extractor=record.get("extractor"))
+                self._chapters_processed_count += 1
+            else:
+                remaining.append(chapter_num) # Never reached, failed or only partially scraped
+        self.events.log_message(f"Resuming job: {self.successful_chapters_count} chapters restored from the journal, {len(remaining)} left to scrape.", INFO)
+        self.events.progress_updated(self._chapters_processed_count)
+        return remaining
+
+    def _record_chapter_result(self, chapter_num, chapter_url, result):
+        """Stores the outcome (a ChapterResult) of a first-pass chapter scrape and updates progress/ETA."""
+        title, fetch_path, extractor = result.title, result.fetch_path, result.extractor
+        content = result.text() # Joined once for the journal, the batch file and the events
+        if result.complete:
+            self.events.log_message(f"  Successfully scraped: {title}", INFO)
+            record = self.chapter_states.finish(chapter_num, SUCCESS, time.monotonic(), title=title, output_file=None, # Placeholder for filename
+                                                fetch_path=fetch_path, extractor=extractor, content_bytes=result.content_bytes)
+            self.journal.record_chapter(chapter_num, "success", title, content, fetch_path=fetch_path, extractor=extractor)
+            self._resolve_in_batch(chapter_num, title, content)
+        else:
+            if result.has_text:
+                self.events.log_message(f"  Scraping incomplete for chapter {chapter_num} ({title}). Adding to failed list, saving partial content.", WARNING)
+                self.journal.record_chapter(chapter_num, "partial", title, content, fetch_path=fetch_path, extractor=extractor)
+                self._resolve_in_batch(chapter_num, title, content) # Save partial content too
+            else:
+                self.events.log_message(f"  Content not found for chapter {chapter_num} ({title}, {result.failure}). Adding to failed list.", WARNING)
+                self.journal.record_chapter(chapter_num, "failed", title, fetch_path=fetch_path, extractor=extractor)
+                self._resolve_in_batch(chapter_num) # Nothing to write, but the batch no longer waits for it
+            record = self.chapter_states.finish(chapter_num, FAILED, time.monotonic(), title=title, url=chapter_url,
+                                                fetch_path=fetch_path, extractor=extractor, failure=result.failure)
+        self._chapter_finished(record, result, content)
+
+        # Chapters finish out of order across browsers, so progress and ETA are based on the completed count only
+        with self._state_lock:
+            self._chapters_processed_count += 1
+            chapters_processed_count = self._chapters_processed_count
+        self.events.progress_updated(chapters_processed_count)
+
+        elapsed_time = time.time() - self._start_time
+        time_per_chapter = elapsed_time / chapters_processed_count
+        remaining_chapters = self._total_chapters - chapters_processed_count
+        estimated_remaining_time = time_per_chapter * remaining_chapters
+        self.events.estimated_time_updated(f"Estimated Time Remaining: {self.format_time(estimated_remaining_time)}")
+
+    def _record_retry_result(self, chapter_num, result):
+        """Stores the outcome of a retried chapter scrape; a recovered chapter keeps the failure it recovered from."""
+        title = result.title
+        if result.complete:
+            self.events.log_message(f"    Successfully retried: {title}", INFO)
+            content = result.text()
+            # output_file is filled in from the batch writer when the summary is saved
+            record = self.chapter_states.finish(chapter_num, RETRIED_SUCCESS, time.monotonic(), title=title, output_file=None,
+                                                fetch_path=result.fetch_path, extractor=result.extractor, content_bytes=result.content_bytes)
+            self._chapter_finished(record, result, content)
+            self.journal.record_chapter(chapter_num, "success", title, content, fetch_path=result.fetch_path, extractor=result.extractor)
+            try:
+                filepath = self.batch_writer.update(chapter_num, title, content) # Fills the gap in an already written batch
+                if filepath:
+                    self.events.log_message(f"  Rewrote batch file with retried chapter {chapter_num}: {filepath}", INFO)
+            except Exception as e:
+                self.events.log_message(f"  Error rewriting batch file for chapter {chapter_num}: {e}", ERROR)
+                self.events.saving_error(f"Could not rewrite the batch file for chapter {chapter_num}. Error: {e}")
+        else:
+            # Log failure again, maybe with less detail
+            self.events.log_message(f"    Retry failed for chapter {chapter_num} ({title}, {result.failure}).", WARNING)
+            self._chapter_finished(self.chapter_states.finish(chapter_num, FAILED, time.monotonic(), failure=result.failure), result)
+
+    def _chapter_finished(self, record, result, content=None):
+        """Reports a chapter outcome; the chapter text itself only goes to events that asked for it."""
+        self.events.request_rate_updated(self._throttle.rate_meter.per_minute(), self._throttle.interval(urlparse(self.base_url_pattern).netloc))
+        if record["status"] == FAILED:
+            self.events.chapter_finished(record["chapter"], FAILED, 0, record["seconds"]) # Partial text is not reported as chapter content
+            return
+        self.events.chapter_finished(record["chapter"], record["status"], result.content_bytes, record["seconds"])
+        if self.events.wants_content:
+            self.events.chapter_scraped(result.title, content if content is not None else result.text(), record["chapter"])
+
+    def fetch_path_stats(self):
+        """Summarises how many chapter scrapes were served by the HTTP fast path versus the browser."""
+        total = self.fetch_path_counts["http"] + self.fetch_path_counts["browser"] # Network fetches only
+        stats = dict(self.fetch_path_counts)
+        stats["http_hit_rate"] = round(self.fetch_path_counts["http"] / total, 3) if total else 0.0
+        return stats
+
+    def _extractor_stats(self):
+        """Summarises how many chapter scrapes came from an embedded JSON payload versus the page DOM."""
+        total = self.extractor_counts["payload"] + self.extractor_counts["dom"]
+        stats = {"mode": self.extractor_mode, "html_backend": self.html_backend.name, **self.extractor_counts}
+        stats["payload_hit_rate"] = round(self.extractor_counts["payload"] / total, 3) if total else 0.0
+        stats["dom_extraction"] = self.dom_extraction
+        with self._state_lock:
+            for method, (pages, chars) in self.dom_transfer.items():
+                if pages:
+                    stats[f"{method}_pages"] = pages
+                    stats[f"{method}_avg_chars"] = round(chars / pages)
+        return stats
+
+    def _title_normalizer_stats(self):
+        """Reports the title patterns in use and how often the memo answered a title lookup."""
+        info = self.title_normalizer.cache_info()
+        lookups = info.hits + info.misses
+        return {"patterns": len(self.title_normalizer.patterns), "lookups": lookups,
+                "memo_hit_rate": round(info.hits / lookups, 3) if lookups else 0.0}
+
+    def _clean_title_prefix(self, title_str):
+        """Removes common prefixes like 'Chapter X:', '#X', etc. for comparison."""
+        return self.title_normalizer.normalize(title_str)
+
+    def _read_page_parts(self, driver, page_number):
+        """
+        Reads the title, body text and pager link of the page loaded in a browser.
+        Returns (parts, source) where source names how they were read, for the log.
+        """
+        if self.dom_extraction == "in-page":
+            try:
+                parts = driver.execute_script(PAGE_PARTS_JS)
+                if isinstance(parts, dict):
+                    with self._state_lock:
+                        transfer = self.dom_transfer["in_page"]
+                        transfer[0] += 1
+                        transfer[1] += sum(len(value) for value in parts.values() if isinstance(value, str))
+                    return parts, "in-page script"
+                self.events.log_message(f"    In-page extraction returned nothing on Page {page_number}. Parsing the page source instead.", WARNING)
+            except Exception as e:
+                self.events.log_message(f"    In-page extraction failed on Page {page_number}: {e}. Parsing the page source instead.", WARNING)
+        page_source = driver.page_source
+        with self._state_lock:
+            transfer = self.dom_transfer["page_source"]
+            transfer[0] += 1
+            transfer[1] += len(page_source)
+        return self.html_backend.extract(page_source), f"{self.html_backend.name} parser"
+
+    def _parse_chapter_page(self, parts, page_number, chapter_title_text, current_url, url, cleaning_patterns, source):
+        """
+        Builds the title (page 1 only), cleaned content and next page link from one page's extracted parts.
+        Returns (chapter_title_text, page_content, failure, next_page_link); page_content is None when
+        the page failed, and failure its class (AI_BLOCK, EMPTY_BODY or MISSING_BODY).
+        """
+        page_content = None
+        failure = None
+        next_page_link = None
+
+        # Extract Title (only need this from the first page)
+        # --- Prioritize H3 title, then breadcrumb, clean immediately ---
+        if page_number == 1:
+            if parts["title"] is not None:
+                # Clean the H3 title immediately
+                chapter_title_text = self._clean_title_prefix(parts["title"])
+            elif chapter_title_text == "Title Not Found": # Check if still not found
+                # Fallback to breadcrumb if H3 not found
+                if parts["breadcrumb"] is not None:
+                    # Try cleaning the breadcrumb text too
+                    chapter_title_text = self._clean_title_prefix(parts["breadcrumb"])
+            # If still not found after both, it remains "Title Not Found"
+
+            self.events.log_message(f"    Extracted/Cleaned Title (Page 1): '{chapter_title_text}'", DEBUG) # Log the final title used
+
+
+        # Extract Content for the current page
+        if parts["has_body"]:
+            # --- The backend already removed the duplicated title element from within content ---
+            if parts["inner_title"] is not None:
+                self.events.log_message(f"    Found and removing inner title element: {parts['inner_title']}", DEBUG)
+
+            # All text nodes, one per line
+            page_content = parts["body_text"]
+
+            # --- Attempt to remove duplicated title from first line of content ---
+            # Use a loop to remove potentially multiple title lines at the start
+            if page_content and chapter_title_text != "Title Not Found":
+                lines = page_content.split('\n')
+                # Clean the main chapter title ONCE before the loop
+                core_chapter_title = self._clean_title_prefix(chapter_title_text)
+                title_matcher = TitleMatcher(core_chapter_title, self.title_match_threshold) # Processes the title once for all lines
+                removed_count = 0
+                while lines: # Loop while there are lines left
+                    current_first_line_cleaned = lines[0].strip()
+                    if not current_first_line_cleaned: # Skip empty lines at the start
+                        lines.pop(0); continue
+
+                    # Remove potential prefix like '#21' before comparison
+                    # Use the helper function for cleaning
+                    core_first_line = self._clean_title_prefix(current_first_line_cleaned)
+
+                    # Compare core text: Use fuzzy matching after cleaning
+                    match_found = False
+                    if core_first_line and core_chapter_title:
+                        # token_set_ratio allows for word order/minor diffs; lines sharing no words are skipped cheaply
+                        similarity_ratio = title_matcher.match(core_first_line)
+                        if similarity_ratio is not None: # Above the profile's threshold
+                            match_found = True
+                            self.events.log_message(f"    Fuzzy Match Success (Ratio: {similarity_ratio}): Line='{core_first_line}' | Title='{core_chapter_title}'", DEBUG)
+                    if match_found:
+                        self.events.log_message(f"    Found and removing duplicated title line: {lines[0]}", DEBUG)
+                        lines.pop(0) # Remove the first line
+                        removed_count += 1
+                    else:
+                        break # Stop if the first line doesn't match
+                if removed_count > 0:
+                    page_content = '\n'.join(lines) # Reassemble content only if lines were removed
+            # --- End duplicated title removal loop ---
+            # --- Check for AI Translation/Registration Block ---
+            if self._is_ai_block(page_content):
+                self.events.log_message(f"    Detected 'AI Translation Requires Registration' block on Page {page_number} ({current_url}). Treating as content not found.", WARNING)
+                page_content, failure = None, AI_BLOCK
+            # --- End AI Block Check ---
+            elif page_content: # Check if get_text actually returned something
+                self.events.log_message(f"    Scraped content from Page {page_number} using the {source}", DEBUG)
+                page_content = self._apply_cleaning_patterns(page_content, cleaning_patterns)
+            else:
+                self.events.log_message(f"    Content container found, but it has no text on Page {page_number} ({current_url}).", WARNING)
+                page_content, failure = None, EMPTY_BODY
+
+        else:
+            self.events.log_message(f"    Content container not found on Page {page_number} ({current_url}).", WARNING)
+            failure = MISSING_BODY
+
+
+        # --- Check for Pagination Links ---
+        if parts["has_pager"]:
+            if parts["next_href"] is not None:
+                next_page_link = self._resolve_next_page_link(parts["next_href"], url)
+                self.events.log_message(f"    Found/Adjusted next page link: {next_page_link}", DEBUG)
+            else:
+                self.events.log_message(f"    No next page link found in pagination container on Page {page_number}. Assuming end of chapter.", DEBUG)
+        else:
+            self.events.log_message(f"    No pagination container found on Page {page_number}. Assuming end of chapter.", DEBUG)
+
+        return chapter_title_text, page_content, failure, next_page_link
+
+    def _resolve_next_page_link(self, next_page_url_relative, url):
+        """Turns a pager href into the absolute URL of the next page, with the Google Translate parameter."""
+        if not next_page_url_relative.startswith('http'):
+             scheme_netloc_match = re.match(r"(https?://[^/]+)", url)
+             base_url_parts = scheme_netloc_match.group(1) if scheme_netloc_match else ""
+
+             if base_url_parts and next_page_url_relative.startswith('/'):
+                  next_page_link = base_url_parts + next_page_url_relative
+             else:
+                  base_path = url.rsplit('/', 1)[0]
+                  next_page_link = base_path + '/' + next_page_url_relative.lstrip('/')
+
+        else:
+             next_page_link = next_page_url_relative
+
+        # --- Ensure Google Translate parameter is on next page link ---
+        if 'service=google' not in next_page_link:
+            if '?' in next_page_link:
+                next_page_link += '&service=google'
+            else:
+                next_page_link += '?service=google'
+        return next_page_link
+
+    def _start_prefetch(self, prefetcher, parts, url, next_chapter_url):
+        """Starts loading what follows a page that was just read: its next page, or else the slot's next chapter."""
+        if parts is not None and parts["has_pager"] and parts["next_href"] is not None:
+            next_url = self._resolve_next_page_link(parts["next_href"], url)
+        else:
+            next_url = next_chapter_url() if next_chapter_url else None
+        if next_url and prefetcher.start(next_url):
+            self.events.log_message(f"    Prefetching {next_url} while this page is parsed.", DEBUG)
+
+    def _driver_responds(self, driver):
+        """One cheap WebDriver round trip; False when the browser crashed or hung up."""
+        try:
+            driver.execute_script("return document.readyState;")
+            return True
+        except Exception:
+            return False
+
+    def _is_ai_block(self, page_content):
+        """Detects the 'AI Translation Requires Registration' block that replaces the chapter text."""
+        ai_block_keywords = ["AI Translation Requires Registration", "Sign up for free", "Google Translation"]
+        return bool(page_content) and all(keyword in page_content for keyword in ai_block_keywords)
+
+    def _apply_cleaning_patterns(self, page_content, cleaning_patterns):
+        """Applies the user's cleaning rules (a ContentCleaner): exact lines, substrings and regexes."""
+        with self.timings.timed("clean"):
+            return cleaning_patterns.clean(page_content)
+
+    def _parse_payload_page(self, payload, page_number, current_url, cleaning_patterns):
+        """
+        Builds the title and page content from a decoded JSON payload.
+        The payload already separates title and body, so no duplicate-title heuristics are needed.
+        Returns (chapter_title_text, page_content, failure) like _parse_chapter_page.
+        """
+        chapter_title_text = self._clean_title_prefix(payload["title"]) if payload["title"] else "Title Not Found"
+        page_content = '\n'.join(payload["paragraphs"])
+        if self._is_ai_block(page_content):
+            self.events.log_message(f"    Detected 'AI Translation Requires Registration' block in the JSON payload on Page {page_number} ({current_url}). Treating as content not found.", WARNING)
+            return chapter_title_text, None, AI_BLOCK
+        return chapter_title_text, self._apply_cleaning_patterns(page_content, cleaning_patterns), None
+
+    # --- Corrected scrape_single_chapter with pagination handling ---
+    def scrape_single_chapter(self, driver, url, chapter_num, max_retries, delay_between_attempts, cleaning_patterns,
+                              prefetcher=None, next_chapter_url=None):
+        """
+        Scrapes a single chapter, including handling pagination within the chapter.
+        With a TabPrefetcher the page after each one (or next_chapter_url() after the last) loads while it is parsed.
+        Returns a ChapterResult with the scraped pages and the extractor used for the first page.
+        """
+        chapter_title_text = "Title Not Found"
+        pages = [] # Text of the pages scraped so far
+        chapter_failure = None # Class of the last page that failed
+        current_url = url # Start with the initial chapter URL
+        page_number = 1 # Track page number within the chapter
+        chapter_fully_scraped = False # Flag to indicate if all pages were successfully scraped
+        extractor_used = "payload" if self.extractor_mode == "payload" else "dom" # Extractor behind the first page
+
+
+        while self._is_running: # Outer loop for iterating through pages
+            page_content = None # Content for the current page
+            page_failure = None # Failure class of the current page
+            page_successfully_loaded = False # Flag to indicate if the current page was loaded successfully after retries
+            next_page_link = None # Reset for each page iteration
+
+
+            self.timings.set_page(page_number)
+            for attempt in range(1, max_retries + 1): # Inner loop for retrying the current page load
+                if not self._is_running: break # Stop if requested during retries
+
+                try:
+                    self.events.log_message(f"  Attempt {attempt}/{max_retries} for chapter {chapter_num} (Page {page_number}: {current_url})...", DEBUG)
+                    attempt_start = time.monotonic()
+                    prefetched = False
+                    if attempt == 1 and prefetcher is not None and prefetcher.pending:
+                        with self.timings.timed("navigate", attempt=attempt, prefetched=True) as navigate_timing:
+                            prefetched = prefetcher.take(current_url, self.wait_policy.current_timeout())
+                            navigate_timing["prefetched"] = prefetched
+                    if prefetched:
+                        load_start = prefetcher.started_at
+                    else:
+                        with self.timings.timed("throttle"):
+                            self._throttle.wait(current_url, lambda: self._is_running) # Keep the per-host politeness delay across the pool
+                        load_start = time.monotonic()
+                        with self.timings.timed("navigate", attempt=attempt):
+                            driver.get(current_url)
+                        self.browser_service.page_loaded(driver)
+
+                    # --- Embedded JSON payload: skips the DOM waits and HTML parse entirely ---
+                    if self.extractor_mode != "dom":
+                        with self.timings.timed("payload_check"):
+                            payload = extract_chapter_payload(driver.execute_script(PAYLOAD_SCRIPTS_JS) or [])
+                        if payload:
+                            self._throttle.record(current_url, time.monotonic() - load_start)
+                            if prefetcher is not None:
+                                self._start_prefetch(prefetcher, None, url, next_chapter_url) # The payload is the whole chapter
+                            with self.timings.timed("parse", extractor="payload"):
+                                chapter_title_text, page_content, page_failure = self._parse_payload_page(payload, page_number, current_url, cleaning_patterns)
+                            self.events.log_message(f"    Extracted chapter {chapter_num} (Page {page_number}) from embedded JSON payload.", DEBUG)
+                            page_successfully_loaded = True
+                            if page_number == 1:
+                                extractor_used = "payload"
+                            break # The payload carries the whole chapter, so there is no pager to follow
+                        if self.extractor_mode == "payload":
+                            self.events.log_message(f"    No embedded JSON payload found for chapter {chapter_num} (Page {page_number}).", WARNING)
+                            page_failure = NO_PAYLOAD
+                            break # Retrying will not make a payload appear
+
+                    try:
+                        # --- One injected MutationObserver script waits for the container, its text and the placeholder to clear ---
+                        timeout = self.wait_policy.current_timeout()
+                        with self.timings.timed("ready_wait") as wait_timing:
+                            wait_result = driver.execute_async_script(READY_JS, int(timeout * 1000)) or {}
+                            wait_timing.update(state=wait_result.get("state"), stage=wait_result.get("stage"))
+                        waited = wait_result.get("elapsed_ms", timeout * 1000) / 1000
+                        stage = wait_result.get("stage")
+                        if wait_result.get("state") == "ready":
+                            self.wait_policy.record(waited, "ready")
+                            self.events.log_message(f"    Content ready for chapter {chapter_num} (Page {page_number}) after {waited:.2f}s.", DEBUG)
+                            page_successfully_loaded = True
+                        else:
+                            self.wait_policy.record(waited, f"timeout_{stage}")
+                            if stage == STAGE_CONTAINER:
+                                self.events.log_message(f"  Timed out after {timeout:.1f}s waiting for chapter-body container on {current_url} for chapter {chapter_num}.", WARNING)
+                                page_successfully_loaded = False # Failed to find the main container
+                            elif stage == STAGE_TEXT:
+                                self.events.log_message(f"    Timed out after {timeout:.1f}s waiting for content paragraph to appear for chapter {chapter_num} (Page {page_number}). Content might be missing or still loading.", WARNING)
+                                page_successfully_loaded = True # The container is there, it might still have content
+                            else:
+                                self.events.log_message(f"    Placeholder HTML might still be present after {timeout:.1f}s for chapter {chapter_num} (Page {page_number}).", WARNING)
+                                page_successfully_loaded = True # Mark page as loaded even if placeholder didn't disappear (might still have content)
+                    except Exception as e:
+                         self.events.log_message(f"  Error loading page {page_number} on attempt {attempt}: {e}", ERROR)
+                         page_successfully_loaded = False
+                    load_seconds = time.monotonic() - load_start # Until the content was ready, for the adaptive delay
+
+
+                    if page_successfully_loaded:
+                         if self.block_patterns:
+                             try:
+                                 with self.timings.timed("page_metrics"):
+                                     self.blocking_stats.record_page(driver.execute_script(PAGE_METRICS_JS) or {}, time.monotonic() - load_start)
+                             except Exception as e:
+                                 self.events.log_message(f"    Could not read page load metrics: {e}", WARNING)
+                         with self.timings.timed("transfer") as transfer_timing:
+                             parts, source = self._read_page_parts(driver, page_number) # Only the chapter parts cross the WebDriver wire
+                             transfer_timing["source"] = source
+                         if prefetcher is not None:
+                             self._start_prefetch(prefetcher, parts, url, next_chapter_url) # The browser is free until the next page
+                         with self.timings.timed("parse", extractor="dom"):
+                             chapter_title_text, page_content, page_failure, next_page_link = self._parse_chapter_page(
+                                 parts, page_number, chapter_title_text, current_url, url, cleaning_patterns, source)
+                         self._throttle.record(current_url, load_seconds, page_failure) # An empty container or a block page counts against the site like a timeout
+
+                         break # Break the retry loop if page loaded successfully
+
+
+                    else:
+                         self.events.log_message(f"  Page {page_number} failed to load successfully after {attempt} attempts.", ERROR)
+                         page_failure = TIMEOUT
+                         next_page_link = None
+                         self._throttle.record(current_url, load_seconds, TIMEOUT)
+                         if attempt == max_retries or not self._is_running:
+                              break
+                         else:
+                              with self.timings.timed("sleep", reason="retry"):
+                                  time.sleep(self.retry_policy.page_backoff(attempt, delay_between_attempts))
+                              continue
+
+
+                except Exception as e:
+                    # Format the error message string first
+                    error_msg = f"  Error scraping page {page_number} on attempt {attempt} for chapter {chapter_num}: {e}"
+                    # --- Re-enable emit, root cause should be fixed ---
+                    self.events.log_message(error_msg, ERROR)
+                    # --- End wrap ---
+                    browser_alive = self._driver_responds(driver) # A crashed browser fails every attempt; defer the chapter instead
+                    if browser_alive and isinstance(e, WebDriverTimeoutException):
+                        self._throttle.record(current_url, time.monotonic() - attempt_start, TIMEOUT)
+                    if attempt < max_retries and self._is_running and browser_alive:
+                        with self.timings.timed("sleep", reason="retry"):
+                            time.sleep(self.retry_policy.page_backoff(attempt, delay_between_attempts))
+                        continue
+                    else:
+                        if not browser_alive:
+                            self.events.log_message(f"  Browser is not responding; leaving chapter {chapter_num} for a retry in a fresh browser.", WARNING)
+                        self.events.log_message(f"  Max retries reached or stop requested for chapter {chapter_num} (Page {page_number}: {current_url}). Could not scrape page content.", ERROR)
+                        page_content, page_failure = None, DRIVER_ERROR
+                        page_successfully_loaded = False
+                        next_page_link = None
+                        break
+
+
+            if not self._is_running:
+                 self.events.log_message(f"  Stop requested. Stopping pagination for chapter {chapter_num}.", INFO)
+                 break
+
+
+            if page_failure is not None:
+                 chapter_failure = page_failure
+            elif page_content is not None:
+                 pages.append(page_content)
+
+
+            if next_page_link and page_successfully_loaded:
+                current_url = next_page_link
+                page_number += 1
+                # A prefetch already waited on the host throttle, and the adaptive delay is the throttle's own
+                if not self.adaptive_delay and (prefetcher is None or not prefetcher.pending):
+                    with self.timings.timed("sleep", reason="next_page"):
+                        time.sleep(delay_between_attempts) # Add delay between page loads within a chapter
+            else:
+                # Determine if the chapter scrape was fully successful
+                if not page_successfully_loaded and not pages:
+                     # Failed to load even the first page
+                     self.events.log_message(f"  Could not load the first page ({url}) for chapter {chapter_num}. Chapter scrape failed.", ERROR)
+                     chapter_fully_scraped = False
+                elif page_successfully_loaded and next_page_link is None:
+                     # Last page loaded successfully, and no 'next' link was found
+                     self.events.log_message(f"  Finished scraping chapter {chapter_num} (last page was {page_number}).", INFO)
+                     chapter_fully_scraped = True
+                else: # page_successfully_loaded is False OR next_page_link existed but we stopped (e.g., error, stop request)
+                     self.events.log_message(f"  Finished scraping chapter {chapter_num}, but the last page ({page_number}) had issues loading or finding the next link. Chapter scrape incomplete.", WARNING)
+                     chapter_fully_scraped = False
+
+                break # Exit the while loop (pagination loop)
+
+
+        final_chapter_title = f"Chapter {chapter_num} - {chapter_title_text}"
+        if not chapter_fully_scraped and chapter_failure is None:
+            chapter_failure = UNKNOWN # Stopped before the last page
+        result = ChapterResult.from_pages(final_chapter_title, pages, chapter_failure, extractor_used)
+        if result.status is ChapterStatus.INCOMPLETE:
+            self.events.log_message(f"  Returning partial content for chapter {chapter_num} due to incomplete scrape.", WARNING)
+        elif not result.complete:
+            self.events.log_message(f"  Could not scrape any content for chapter {chapter_num} ({result.failure}).", WARNING)
+        return result
+
+
+    def format_time(self, seconds):
+        """Helper to format time in H:M:S."""
+        if seconds is None:
+            return "N/A"
+        if seconds < 0:
+             seconds = 0
+        m, s = divmod(seconds, 60)
+        h, m = divmod(m, 60)
+        return f"{int(h):02d}h {int(m):02d}m {int(s):02d}s"
+
+
+def check_chromedriver():
+    """Checks for chromedriver in common locations."""
+    chromedriver_name = "chromedriver"
+    if sys.platform.startswith('win'):
+        chromedriver_name += ".exe"
+
+    # 1. Check in the same directory as the script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    local_path = os.path.join(script_dir, chromedriver_name)
+    if os.path.exists(local_path):
+        return True, local_path
+
+    # 2. Check if it's in the system PATH
+    path_location = shutil.which(chromedriver_name)
+    if path_location:
+        return True, path_location
+
+    # 3. (Optional Windows Specific) Check common Selenium Manager location
+    if sys.platform.startswith('win'):
+        try:
+            # This path might change, relies on internal Selenium structure
+            import selenium
+            selenium_dir = os.path.dirname(selenium.__file__)
+            # Rough guess based on common structure, might need adjustment
+            manager_path_segment = os.path.join('webdriver', 'common', 'windows', chromedriver_name)
+            potential_path = os.path.join(selenium_dir, '..', 'selenium', manager_path_segment) # Navigate up and into potential manager dir
+            if os.path.exists(potential_path):
+                 # This path might be deep and version specific, maybe just return True and let Selenium find it?
+                 # For now, let's just indicate it *might* be found by Selenium itself.
+                 # return True, potential_path
+                 pass # Let Selenium handle it if it's in its manager path
+        except ImportError:
+            pass # Selenium not installed?
+
+    return False, chromedriver_name # Not found in script dir or PATH
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules live at the top of the repository (and the fixture site in benchmarks/), not in a package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, 'benchmarks')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from batch_writer import BatchFileWriter
+from scrape_journal import ScrapeJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = ScrapeJournal(str(tmp_path / "job_journal.jsonl"), {"start_chapter": 1, "end_chapter": 5})
+    yield journal
+    journal.close()
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_batch_is_written_once_every_chapter_is_resolved(tmp_path, journal):
+    writer = BatchFileWriter(1, 5, 3, str(tmp_path), journal)
+    assert writer.resolve(1, "Chapter 1", "one") is None
+    assert writer.resolve(3, "Chapter 3", "three") is None
+    path = writer.resolve(2) # A failure still closes the batch
+    assert path == os.path.join(str(tmp_path), "1-3.txt")
+    assert read(path) == "Chapter 1\n\none\n\nChapter 3\n\nthree\n\n"
+    assert writer.output_file(2) == path
+    assert writer.output_file(4) is None
+
+
+def test_closed_batch_is_rebuilt_from_the_journal(tmp_path, journal):
+    writer = BatchFileWriter(1, 5, 3, str(tmp_path), journal)
+    for chapter, content in ((1, "one"), (3, "three")):
+        journal.record_chapter(chapter, "success", f"Chapter {chapter}", content)
+        writer.resolve(chapter, f"Chapter {chapter}", content)
+    journal.record_chapter(2, "failed", "Chapter 2")
+    path = writer.resolve(2)
+    assert "Chapter 2" not in read(path)
+
+    # A retry recovers chapter 2 after its batch was written: the other chapters come back from the journal
+    journal.record_chapter(2, "success", "Chapter 2", "two")
+    assert writer.update(2, "Chapter 2", "two") == path
+    assert read(path) == "Chapter 1\n\none\n\nChapter 2\n\ntwo\n\nChapter 3\n\nthree\n\n"
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_journaled_chapters_are_read_back_at_write_time(tmp_path, journal):
+    journal.record_chapter(4, "success", "Chapter 4", "four")
+    writer = BatchFileWriter(1, 5, 3, str(tmp_path), journal)
+    writer.resolve(4, journaled=True) # Restored by a resumed job, its text stays on disk
+    path = writer.resolve(5, "Chapter 5", "five")
+    assert path == os.path.join(str(tmp_path), "4-5.txt") # The last batch is cut short at the end chapter
+    assert read(path) == "Chapter 4\n\nfour\n\nChapter 5\n\nfive\n\n"
+
+
+def test_finish_writes_open_batches_and_skips_empty_ones(tmp_path, journal):
+    writer = BatchFileWriter(1, 5, 3, str(tmp_path), journal)
+    writer.resolve(1, "Chapter 1", "one")
+    writer.resolve(4) # Failed, nothing to write
+    assert writer.finish() == [os.path.join(str(tmp_path), "1-3.txt")]
+    assert not os.path.exists(tmp_path / "4-5.txt")
@@ -0,0 +1,167 @@
+import itertools
+import sqlite3
+import types
+
+import pytest
+import requests
+
+import chapter_cache
+from chapter_cache import ChapterCache
+from scraper_engine import ScrapeEngine
+
+URL = "https://example.com/novel/chapter-{}"
+PAGE = "<html><body><div class='chapter-body'><p>Text</p></div></body></html>"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Makes every time.time() call in the cache one second later than the previous one, so LRU order is exact."""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(chapter_cache, "time", types.SimpleNamespace(time=lambda: next(ticks)))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache" / "chapters.sqlite3")
+
+
+def entry_size(content, title):
+    return len(content.encode('utf-8')) + len(title.encode('utf-8'))
+
+
+def test_put_and_get_round_trip(db_path):
+    cache = ChapterCache(db_path, 1024 * 1024, "key")
+    cache.put(URL.format(1), "Chapter 1", "Text", "dom", html=PAGE, etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    cached = cache.get(URL.format(1))
+    assert (cached["title"], cached["content"], cached["extractor"], cached["etag"]) == ("Chapter 1", "Text", "dom", '"abc"')
+    assert cached["html_sha256"] == ChapterCache.html_digest(PAGE)
+    assert cache.get(URL.format(2)) is None
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(db_path, clock):
+    size = entry_size("x" * 100, "Chapter 1")
+    cache = ChapterCache(db_path, 3 * size, "key")
+    for chapter in (1, 2, 3):
+        cache.put(URL.format(chapter), f"Chapter {chapter}", "x" * 100, "dom")
+    cache.record_hit(URL.format(1)) # Chapter 2 is now the least recently used
+    cache.put(URL.format(4), "Chapter 4", "x" * 100, "dom")
+    assert cache.get(URL.format(2)) is None
+    assert all(cache.get(URL.format(chapter)) for chapter in (1, 3, 4))
+    summary = cache.summary()
+    assert summary["evictions"] == 1 and summary["size_bytes"] == 3 * size
+    cache.close()
+
+
+def test_replacing_an_entry_does_not_count_it_twice(db_path):
+    cache = ChapterCache(db_path, 1024 * 1024, "key")
+    cache.put(URL.format(1), "Chapter 1", "old text", "dom")
+    cache.put(URL.format(1), "Chapter 1", "new", "dom")
+    assert cache.summary()["size_bytes"] == entry_size("new", "Chapter 1")
+    cache.close()
+    assert ChapterCache(db_path, 1024 * 1024, "key").summary()["size_bytes"] == entry_size("new", "Chapter 1")
+
+
+def test_entries_are_kept_per_settings_key(db_path):
+    old_settings = ChapterCache(db_path, 1024 * 1024, ChapterCache.settings_digest({"cleaning_patterns": []}))
+    old_settings.put(URL.format(1), "Chapter 1", "Text with ads", "dom")
+    old_settings.close()
+    new_settings = ChapterCache(db_path, 1024 * 1024, ChapterCache.settings_digest({"cleaning_patterns": ["ads"]}))
+    assert new_settings.get(URL.format(1)) is None
+    new_settings.close()
+
+
+def test_settings_digest_ignores_key_order():
+    assert ChapterCache.settings_digest({"a": 1, "b": [2]}) == ChapterCache.settings_digest({"b": [2], "a": 1})
+    assert ChapterCache.settings_digest({"a": 1}) != ChapterCache.settings_digest({"a": 2})
+
+
+def test_cache_made_before_settings_keys_is_dropped(db_path, tmp_path):
+    (tmp_path / "cache").mkdir()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE chapters (url TEXT PRIMARY KEY, title TEXT, content TEXT, size INTEGER)")
+        conn.execute("INSERT INTO chapters VALUES (?, 'Chapter 1', 'Text', 13)", (URL.format(1),))
+    cache = ChapterCache(db_path, 1024 * 1024, "key")
+    assert cache.get(URL.format(1)) is None
+    assert cache.summary()["size_bytes"] == 0
+    cache.close()
+
+
+# --- Revalidation of stale entries by the engine ---
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    """Answers every request with one response and records the request headers."""
+
+    def __init__(self, response):
+        self.response = response
+        self.headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.headers.append(headers)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+@pytest.fixture
+def engine(tmp_path, db_path):
+    engine = ScrapeEngine(URL, 1, 1, 10, "novel", str(tmp_path), 1, 0, [], cache_max_age_hours=1)
+    engine.cache = ChapterCache(db_path, 1024 * 1024, engine._cache_settings_key())
+    yield engine
+    engine.cache.close()
+
+
+def make_stale(engine, url):
+    engine.cache._conn.execute("UPDATE chapters SET fetched_at = fetched_at - 7200 WHERE url = ?", (url,))
+
+
+def lookup(engine, response):
+    session = FakeSession(response)
+    engine._sessions[0] = session
+    return engine._lookup_cache(0, URL.format(1), 1), session
+
+
+def test_fresh_entry_is_served_without_a_request(engine):
+    engine.cache.put(URL.format(1), "Chapter 1", "Text", "dom", html=PAGE, etag='"v1"')
+    cached, session = lookup(engine, FakeResponse(200, PAGE))
+    assert cached["content"] == "Text"
+    assert session.headers == []
+    assert engine.cache.stats["hits"] == 1 and engine.cache.stats["revalidated"] == 0
+
+
+def test_stale_entry_is_revalidated_with_its_validators(engine):
+    engine.cache.put(URL.format(1), "Chapter 1", "Text", "dom", html=PAGE, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    make_stale(engine, URL.format(1))
+    cached, session = lookup(engine, FakeResponse(304))
+    assert cached["content"] == "Text"
+    assert session.headers == [{"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}]
+    assert engine.cache.stats["revalidated"] == 1
+    cached, session = lookup(engine, FakeResponse(200, PAGE))
+    assert session.headers == [] # Revalidating made it fresh again
+
+
+@pytest.mark.parametrize("response, hit", [
+    (FakeResponse(200, PAGE), True), # Same HTML digest although the server ignores the validators
+    (FakeResponse(200, PAGE.replace("Text", "Edited")), False),
+    (FakeResponse(503), False),
+    (requests.ConnectionError("down"), False),
+])
+def test_stale_entry_without_a_304(engine, response, hit):
+    engine.cache.put(URL.format(1), "Chapter 1", "Text", "dom", html=PAGE)
+    make_stale(engine, URL.format(1))
+    cached, _ = lookup(engine, response)
+    assert (cached is not None) == hit
+    assert engine.cache.stats["misses"] == (0 if hit else 1)
+
+
+def test_stale_browser_entry_is_a_miss(engine):
+    engine.cache.put(URL.format(1), "Chapter 1", "Text", "dom") # Scraped in the browser: no HTML or validators
+    make_stale(engine, URL.format(1))
+    cached, session = lookup(engine, FakeResponse(304))
+    assert cached is None and session.headers == []
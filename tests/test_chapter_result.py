@@ -0,0 +1,36 @@
+from chapter_result import INCOMPLETE_MARKER, PAGE_BREAK, ChapterResult, ChapterStatus
+from retry_policy import INCOMPLETE, TIMEOUT, UNKNOWN
+
+
+def test_pages_without_failure_are_complete():
+    result = ChapterResult.from_pages("Chapter 1", ["first page", "second page"])
+    assert result.status is ChapterStatus.COMPLETE
+    assert result.complete and result.has_text
+    assert result.failure is None
+    assert result.content_bytes == len("first page") + len("second page")
+    assert result.text() == "first page" + PAGE_BREAK + "second page"
+
+
+def test_text_before_a_failed_page_is_incomplete():
+    result = ChapterResult.from_pages("Chapter 2", ["first page"], failure=TIMEOUT)
+    assert result.status is ChapterStatus.INCOMPLETE
+    assert not result.complete and result.has_text
+    assert result.failure == INCOMPLETE # Retried as a whole chapter, whatever failed
+    assert result.text() == "first page" + INCOMPLETE_MARKER
+
+
+def test_no_text_is_failed_with_the_failure_class():
+    result = ChapterResult.from_pages("Chapter 3", ["", "  \n"], failure=TIMEOUT)
+    assert result.status is ChapterStatus.FAILED
+    assert not result.has_text
+    assert result.failure == TIMEOUT
+    assert result.pages == [] and result.content_bytes == 0
+    assert result.text() == ""
+
+
+def test_failed_without_a_class_is_unknown():
+    assert ChapterResult.from_pages("Chapter 4", []).failure == UNKNOWN
+
+
+def test_content_bytes_counts_utf8():
+    assert ChapterResult.from_pages("Chapter 5", ["é"]).content_bytes == 2
@@ -0,0 +1,66 @@
+import pytest
+
+from chapter_states import FAILED, PENDING, RETRIED_SUCCESS, RUNNING, SUCCESS, ChapterStates
+
+
+def test_chapter_goes_through_a_failed_attempt_and_a_retry():
+    states = ChapterStates(1, 3)
+    states.begin(2, now=10.0)
+    assert states.status(2) == RUNNING
+    states.finish(2, FAILED, now=11.5, failure="timeout")
+    assert states.failed_chapters() == [2]
+
+    states.begin(2, now=20.0)
+    record = states.finish(2, RETRIED_SUCCESS, now=20.5)
+    assert states.failed_chapters() == []
+    assert record["attempts"] == 2
+    assert record["seconds"] == 2.0
+    assert record["failure"] == "timeout" # Kept from the failed attempt
+    assert states.count(SUCCESS, RETRIED_SUCCESS) == 1
+    assert states.count(PENDING) == 2
+
+
+def test_abandon_restores_the_previous_status():
+    states = ChapterStates(1, 2)
+    states.begin(1, now=0.0)
+    states.abandon(1)
+    assert states.status(1) == PENDING
+    states.begin(1, now=0.0)
+    states.finish(1, FAILED, now=1.0)
+    states.begin(1, now=2.0)
+    states.abandon(1)
+    assert states.status(1) == FAILED
+    assert states.failed_chapters() == [1]
+
+
+def test_restored_chapter_goes_straight_to_success():
+    states = ChapterStates(1, 1)
+    states.finish(1, SUCCESS, title="From the journal")
+    assert states.results() == [{"chapter": 1, "status": SUCCESS, "attempts": 0, "seconds": 0.0, "title": "From the journal"}]
+
+
+@pytest.mark.parametrize("setup, status", [
+    ((), FAILED), # A chapter must be running to fail
+    ((RUNNING, SUCCESS), RUNNING), # A scraped chapter is never scraped again
+    ((RUNNING, SUCCESS), FAILED),
+])
+def test_invalid_transitions_raise(setup, status):
+    states = ChapterStates(1, 1)
+    for step in setup:
+        if step == RUNNING:
+            states.begin(1, now=0.0)
+        else:
+            states.finish(1, step, now=1.0)
+    with pytest.raises(ValueError):
+        if status == RUNNING:
+            states.begin(1, now=2.0)
+        else:
+            states.finish(1, status, now=2.0)
+
+
+def test_results_leave_out_chapters_not_reached():
+    states = ChapterStates(1, 3)
+    states.begin(3, now=0.0)
+    states.finish(3, SUCCESS, now=1.0)
+    states.begin(1, now=0.0)
+    assert [record["chapter"] for record in states.results()] == [3]
@@ -0,0 +1,67 @@
+import pytest
+
+import content_cleaner
+from content_cleaner import ContentCleaner, _literal_prefix, parse_cleaning_rules
+
+
+def test_rules_are_sorted_by_prefix():
+    exact, substrings, regexes, errors = parse_cleaning_rules([
+        "Translated by XYZ", "contains:wtr-lab.com", "contains:wtr-lab.com", "re:\\s*\\(Visit .*?\\)", "contains:"])
+    assert exact == {"Translated by XYZ"}
+    assert substrings == ["wtr-lab.com"] # Duplicates dropped; an empty 'contains:' is ignored
+    assert regexes == ["\\s*\\(Visit .*?\\)"]
+    assert errors == []
+
+
+def test_invalid_regex_is_reported_and_left_out():
+    exact, substrings, regexes, errors = parse_cleaning_rules(["re:(unclosed", "re:ok+"])
+    assert regexes == ["ok+"]
+    assert len(errors) == 1 and errors[0].startswith("'re:(unclosed'")
+    assert ContentCleaner(["re:(unclosed"]).errors == errors
+
+
+def test_prefixes_are_case_sensitive_and_only_at_the_start():
+    exact, substrings, regexes, _ = parse_cleaning_rules(["Contains:Ads", "see re:this"])
+    assert exact == {"Contains:Ads", "see re:this"}
+    assert substrings == [] and regexes == []
+
+
+@pytest.mark.parametrize("pattern, prefix", [
+    ("\\(Visit .*?\\)", "(Visit "),
+    ("^Chapter \\d+", "Chapter "),
+    ("abc?", "ab"),
+    ("a|b", ""),
+    ("(?i)ads", ""),
+    ("\\s+ads", ""),
+])
+def test_literal_prefix(pattern, prefix):
+    assert _literal_prefix(pattern) == prefix
+
+
+@pytest.fixture(params=["installed", "fallback"])
+def literal_matcher(request, monkeypatch):
+    """Runs a test with the Aho-Corasick automaton (when pyahocorasick is installed) and with the regex fallback."""
+    if request.param == "fallback":
+        monkeypatch.setattr(content_cleaner, "ahocorasick", None)
+    elif content_cleaner.ahocorasick is None:
+        pytest.skip("pyahocorasick is not installed")
+
+
+def test_clean_applies_every_kind_of_rule(literal_matcher):
+    cleaner = ContentCleaner(["Translated by XYZ", "contains:wtr-lab.com", "re:\\s*\\(Visit .*?\\)"])
+    text = "  Translated by XYZ  \nRead it on wtr-lab.com today\nThe end. (Visit us)\nwtr-lab.com\n\nKept"
+    assert cleaner.clean(text) == "Read it on  today\nThe end.\n\nKept"
+    summary = cleaner.summary()
+    assert summary["lines_removed"] == 2
+    assert summary["hits"] == {"Translated by XYZ": 1, "contains:wtr-lab.com": 2, "re:\\s*\\(Visit .*?\\)": 1}
+
+
+def test_overlapping_substrings_remove_the_longest_match(literal_matcher):
+    cleaner = ContentCleaner(["contains:ads", "contains:ads by"])
+    assert cleaner.clean("text ads by someone") == "text  someone"
+
+
+def test_no_rules_leave_the_text_untouched():
+    cleaner = ContentCleaner([])
+    assert not cleaner
+    assert cleaner.clean("  indented\n") == "  indented\n"
@@ -0,0 +1,56 @@
+import json
+
+from extractors import MIN_PAYLOAD_CHARS, extract_chapter_payload, find_payload_scripts
+
+CHAPTER_TEXT = "<p>" + "The sect gates opened at dawn. " * 10 + "</p><p>Second paragraph.</p>"
+COMMENT_TEXT = "What a great chapter, " * 12 # As long as a short chapter
+
+
+def next_data(page_props):
+    return json.dumps({"props": {"pageProps": page_props}, "page": "/[locale]/serie-[id]/[slug]/chapter-[no]"})
+
+
+def test_reads_the_chapter_object():
+    payload = extract_chapter_payload([next_data({"chapter": {"title": "The Gates", "body": CHAPTER_TEXT}})])
+    assert payload["title"] == "The Gates"
+    assert payload["paragraphs"][0].startswith("The sect gates opened at dawn.")
+    assert payload["paragraphs"][-1] == "Second paragraph."
+
+
+def test_decoy_outside_a_chapter_key_is_ignored():
+    assert len(COMMENT_TEXT) >= MIN_PAYLOAD_CHARS
+    script = next_data({"comments": [{"name": "bob", "content": COMMENT_TEXT}]})
+    assert extract_chapter_payload([script]) is None
+
+
+def test_decoy_inside_the_chapter_object_is_ignored():
+    script = next_data({"chapter": {"title": "The Gates", "body": "<p>Short teaser.</p>",
+                                    "comments": [{"name": "bob", "content": COMMENT_TEXT}]}})
+    assert extract_chapter_payload([script]) is None # The chapter's own body is too short; the comment never counts
+
+
+def test_decoy_does_not_beat_the_chapter():
+    script = next_data({"chapter": {"title": "The Gates", "body": CHAPTER_TEXT},
+                        "related": [{"name": "Other Novel", "text": COMMENT_TEXT * 3}]})
+    assert extract_chapter_payload([script])["title"] == "The Gates"
+
+
+def test_chapter_body_key_and_json_ld_chapter():
+    script = json.dumps({"data": {"name": "Chapter 3", "chapter_body": CHAPTER_TEXT}})
+    assert extract_chapter_payload([script])["title"] == "Chapter 3"
+    ld_json = json.dumps({"@type": "Chapter", "headline": "Chapter 4", "articleBody": CHAPTER_TEXT})
+    assert extract_chapter_payload([ld_json])["title"] == "Chapter 4"
+    article = json.dumps({"@type": "Article", "headline": "Site news", "articleBody": CHAPTER_TEXT})
+    assert extract_chapter_payload([article]) is None
+
+
+def test_short_or_broken_payloads_are_ignored():
+    assert extract_chapter_payload([next_data({"chapter": {"body": "<p>Teaser</p>"}})]) is None
+    assert extract_chapter_payload(["{not json"]) is None
+
+
+def test_find_payload_scripts():
+    page = ('<html><script id="__NEXT_DATA__" type="application/json">{"a": 1}</script>'
+            '<script type="application/ld+json">{"b": 2}</script><script>var c = 3;</script></html>')
+    assert find_payload_scripts(page) == ['{"a": 1}', '{"b": 2}']
+    assert find_payload_scripts("<html><p>No payload</p></html>") == []
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+import job_queue
+from job_queue import JobQueue, JobScheduler, TokenBucketLimiter
+
+OPTIONS = {"base_url_pattern": "https://example.com/chapter-{}", "overall_start_chapter": 1, "overall_end_chapter": 2,
+           "num_browsers": 1, "cleaning_patterns": []}
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "queue" / "jobs.json")
+
+
+class FakeEngine:
+    """Stands in for ScrapeEngine: 'scrapes' every chapter at once and records the order jobs started in."""
+    started = []
+
+    def __init__(self, events=None, throttle=None, browser_service=None, **options):
+        self.options = options
+        self.total_chapters = options["overall_end_chapter"] - options["overall_start_chapter"] + 1
+        self.successful_chapters_count = 0
+        self.failed_chapters = set()
+
+    def run(self):
+        FakeEngine.started.append(self.options["base_filename"])
+        self.successful_chapters_count = self.total_chapters
+
+    def stop(self):
+        pass
+
+
+class FakeBrowserService:
+    def shutdown(self):
+        pass
+
+
+def make_scheduler(queue, max_browsers=1):
+    return JobScheduler(queue, max_browsers, TokenBucketLimiter(0), poll_interval=0.01, browser_service=FakeBrowserService())
+
+
+def test_jobs_are_listed_by_priority_then_age(state_path):
+    queue = JobQueue(state_path)
+    low, high, low_too = (queue.add(name, OPTIONS, priority) for name, priority in (("a", 0), ("b", 5), ("c", 0)))
+    assert [job["id"] for job in queue.jobs()] == [high, low, low_too]
+
+
+def test_concurrent_adds_from_separate_handles_keep_every_job(state_path):
+    def add_jobs(worker):
+        queue = JobQueue(state_path) # Its own handle, as another process would have
+        for number in range(10):
+            queue.add(f"{worker}-{number}", OPTIONS)
+
+    threads = [threading.Thread(target=add_jobs, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    jobs = JobQueue(state_path).jobs()
+    assert len(jobs) == 40
+    assert sorted(job["id"] for job in jobs) == list(range(1, 41))
+
+
+def test_claim_only_takes_a_queued_job(state_path):
+    queue = JobQueue(state_path)
+    job_id = queue.add("a", OPTIONS)
+    owner = queue.open_owner()
+    queue.pause(job_id)
+    assert queue.claim(job_id, owner) is None
+    assert queue.get(job_id)["status"] == "paused"
+    queue.resume(job_id)
+    job = queue.claim(job_id, owner)
+    assert job["status"] == "running" and job["owner"] == owner
+    assert queue.claim(job_id, owner) is None # Already running
+    queue.close_owner(owner)
+
+
+def test_update_with_expected_status_keeps_a_pause(state_path):
+    queue = JobQueue(state_path)
+    job_id = queue.add("a", OPTIONS)
+    queue.pause(job_id)
+    assert queue.update(job_id, expected_status="queued", status="running") is None
+    assert queue.get(job_id)["status"] == "paused"
+
+
+def test_recover_leaves_jobs_of_a_live_scheduler_running(state_path):
+    other_process = JobQueue(state_path)
+    live_owner, dead_owner = other_process.open_owner(), other_process.open_owner()
+    live, dead, legacy = (other_process.add(name, OPTIONS) for name in ("live", "dead", "legacy"))
+    other_process.claim(live, live_owner)
+    other_process.claim(dead, dead_owner)
+    other_process.close_owner(dead_owner) # As if its scheduler had exited without reaping the job
+    other_process.update(legacy, status="running") # Saved before owners were recorded
+
+    queue = JobQueue(state_path)
+    queue.recover()
+    assert queue.get(live)["status"] == "running"
+    assert queue.get(dead)["status"] == "queued" and queue.get(dead)["owner"] is None
+    assert queue.get(legacy)["status"] == "queued"
+    other_process.close_owner(live_owner)
+
+
+def test_scheduler_runs_jobs_by_priority_within_the_budget(state_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "ScrapeEngine", FakeEngine)
+    monkeypatch.setattr(FakeEngine, "started", [])
+    queue = JobQueue(state_path)
+    for name, priority in (("low", 0), ("high", 9), ("middle", 4)):
+        queue.add(name, dict(OPTIONS, base_filename=name), priority)
+    make_scheduler(queue).run()
+    assert FakeEngine.started == ["high", "middle", "low"]
+    assert all(job["status"] == "done" and job["owner"] is None for job in queue.jobs())
+    assert all(job["result"] == {"successful": 2, "failed": [], "total": 2} for job in queue.jobs())
+
+
+def test_engine_that_cannot_be_built_fails_its_job(state_path):
+    queue = JobQueue(state_path)
+    broken = queue.add("broken", dict(OPTIONS, no_such_option=True))
+    make_scheduler(queue).run() # Returns instead of dying with the job left running
+    job = queue.get(broken)
+    assert job["status"] == "failed" and job["owner"] is None
+    assert "no_such_option" in job["result"]["error"]
@@ -0,0 +1,70 @@
+import pytest
+
+import page_parsers
+import scraper_engine
+from fixture_server import FixtureSite
+from page_parsers import available_backends, get_backend
+from scraper_engine import ScrapeEngine
+
+SITE = FixtureSite()
+FIXTURE_PAGES = [(chapter, page) for chapter in range(1, 21) for page in range(1, SITE.page_count(chapter) + 1)]
+
+PAGER_PAGES = {
+    "rel": '<div class="chapter-pager"><a href="/1">Prev</a><a rel="nofollow next" href="/3">Go</a></div>',
+    "text": '<div class="chapter-pager"><a href="/1">Prev</a><a href="/3"><span>Next</span></a></div>',
+    "class": '<div class="chapter-pager"><a class="btn pager-next" href="/3"><i></i> <b>Go</b></a></div>',
+    "arrow": '<div class="chapter-pager"><a href="/3">&gt;&gt;</a></div>',
+    "none": '<div class="chapter-pager"><a href="/1">Prev</a><a>Next</a></div>',
+}
+
+
+@pytest.fixture(params=[name for name in available_backends() if name != "bs4"])
+def backend(request):
+    return get_backend(request.param)
+
+
+@pytest.mark.parametrize("chapter, page", FIXTURE_PAGES)
+def test_backends_match_beautifulsoup_on_fixture_pages(backend, chapter, page):
+    page_source = SITE.render(chapter, page)
+    assert backend.extract(page_source) == get_backend("bs4").extract(page_source)
+
+
+@pytest.mark.parametrize("kind", sorted(PAGER_PAGES))
+def test_backends_pick_the_same_next_link(backend, kind):
+    page_source = f"<html><body>{PAGER_PAGES[kind]}</body></html>"
+    assert backend.extract(page_source) == get_backend("bs4").extract(page_source)
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_body_text_skips_scripts_comments_and_the_inner_title(name):
+    page_source = ('<html><head><style>.placeholder-glow{opacity:.5}</style></head><body>'
+                   '<h3 class="chapter-title"> Chapter 2: <em>Dawn</em> </h3>'
+                   '<div class="chapter-body"><h3>Chapter 2: Dawn</h3>tail<p>One <b>two</b></p>'
+                   '<script>var x = 1;</script><!-- ad --><p>  </p><p>Three</p></div></body></html>')
+    parts = get_backend(name).extract(page_source)
+    assert parts["title"] == "Chapter 2:Dawn"
+    assert parts["inner_title"] == "Chapter 2: Dawn"
+    assert parts["body_text"] == "tail\nOne\ntwo\nThree"
+    assert parts["has_body"] and not parts["has_placeholder"] # The stylesheet rule is not a skeleton
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_placeholder_is_only_looked_for_inside_the_body(name):
+    skeleton = get_backend(name).extract(SITE.render(6, 1)) # A chapter rendered by script after load
+    assert skeleton["has_body"] and skeleton["has_placeholder"]
+    outside = get_backend(name).extract('<div class="placeholder-glow"></div><div class="chapter-body"><p>Text</p></div>')
+    assert not outside["has_placeholder"]
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_backend("html5lib")
+
+
+def test_engine_falls_back_from_a_backend_that_is_not_installed(tmp_path, monkeypatch):
+    for module in (page_parsers, scraper_engine):
+        monkeypatch.setattr(module, "available_backends", lambda: ["bs4"]) # As without lxml and selectolax
+    engine = ScrapeEngine("https://example.com/chapter-{}", 1, 2, 10, "novel", str(tmp_path), 1, 0, [],
+                          html_backend="selectolax")
+    assert engine.requested_html_backend == "selectolax"
+    assert engine.html_backend.name == "bs4" # run() warns that it is used instead
@@ -0,0 +1,58 @@
+import pytest
+
+from retry_policy import (AI_BLOCK, BROWSER_UNAVAILABLE, MIN_BASE_DELAY, NO_PAYLOAD, PAGE_BACKOFF_CAP, TIMEOUT,
+                          DEFAULT_RETRY_CLASSES, RetryPolicy, RetryScheduler)
+
+
+@pytest.mark.parametrize("failure", [TIMEOUT, AI_BLOCK])
+def test_backoff_doubles_up_to_the_cap_with_equal_jitter(failure):
+    policy = RetryPolicy(base_delay=2.0, seed=1)
+    _, factor, cap = DEFAULT_RETRY_CLASSES[failure]
+    for retry in range(1, 8):
+        delay = min(cap, 2.0 * factor * 2 ** (retry - 1))
+        for _ in range(50):
+            assert delay / 2 <= policy.backoff(failure, retry) <= delay
+
+
+def test_jitter_spreads_chapters_that_failed_together():
+    policy = RetryPolicy(base_delay=4.0, seed=7)
+    assert len({round(policy.backoff(TIMEOUT, 1), 6) for _ in range(20)}) > 1
+
+
+def test_base_delay_has_a_floor():
+    assert RetryPolicy(base_delay=0).base_delay == MIN_BASE_DELAY
+
+
+def test_unknown_class_falls_back_to_unknown():
+    policy = RetryPolicy(base_delay=1.0)
+    assert policy.max_retries("made_up") == policy.max_retries("unknown")
+
+
+def test_page_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1.0, seed=3)
+    assert PAGE_BACKOFF_CAP / 2 <= policy.page_backoff(attempt=20, delay=5.0) <= PAGE_BACKOFF_CAP
+    assert policy.page_backoff(attempt=1, delay=0) == 0
+
+
+def test_scheduler_gives_up_when_the_class_has_no_retries_left():
+    scheduler = RetryScheduler(RetryPolicy(base_delay=1.0))
+    assert scheduler.schedule(5, NO_PAYLOAD, 1) is None
+    assert scheduler.schedule(6, BROWSER_UNAVAILABLE, 1) is None
+    retries = DEFAULT_RETRY_CLASSES[TIMEOUT][0]
+    assert scheduler.schedule(7, TIMEOUT, retries + 1) is None
+    assert scheduler.next_due_in() is None
+    assert scheduler.summary()["gave_up"] == {NO_PAYLOAD: 1, BROWSER_UNAVAILABLE: 1, TIMEOUT: 1}
+
+
+def test_scheduler_hands_out_retries_once_due():
+    scheduler = RetryScheduler(RetryPolicy(base_delay=1.0, classes={TIMEOUT: (2, 100, 100)}))
+    delay = scheduler.schedule(3, TIMEOUT, 1)
+    assert 50 <= delay <= 100
+    assert scheduler.pop_due() is None
+    assert 0 < scheduler.next_due_in() <= delay
+
+    scheduler.requeue(4, TIMEOUT, 2) # Due at once, ahead of the waiting retry
+    assert scheduler.next_due_in() == 0
+    assert scheduler.pop_due() == (4, TIMEOUT, 2)
+    assert scheduler.summary()["scheduled"] == {TIMEOUT: 1} # A requeued retry is not counted again
+    assert scheduler.summary()["still_waiting"] == 1
@@ -0,0 +1,127 @@
+import re
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from browser_service import BrowserService
+from fixture_server import FixtureSite, chapter_url, make_server
+from scrape_journal import ScrapeJournal, journal_path, load_journal
+from scraper_engine import ScrapeEngine
+
+JOB_INFO = {"start_chapter": 1, "end_chapter": 5}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "out" / "novel_journal.jsonl")
+
+
+def test_journal_path_is_made_safe_for_the_file_system(tmp_path):
+    assert journal_path(str(tmp_path), 'a/b:c') == str(tmp_path / "a_b_c_journal.jsonl")
+
+
+def test_best_record_of_each_chapter_is_kept(path):
+    journal = ScrapeJournal(path, JOB_INFO)
+    journal.record_chapter(1, "failed", "Chapter 1")
+    journal.record_chapter(1, "success", "Chapter 1", "one") # A retry succeeded
+    journal.record_chapter(2, "success", "Chapter 2", "two")
+    journal.record_chapter(2, "partial", "Chapter 2", "tw") # A later, worse record does not replace it
+    journal.record_chapter(3, "partial", "Chapter 3", "thr", extractor="dom")
+    journal.record_chapter(3, "failed", "Chapter 3")
+    journal.close()
+    job_info, chapters = load_journal(path)
+    assert (job_info["start_chapter"], job_info["end_chapter"]) == (1, 5)
+    assert {chapter: (record["status"], record["content"]) for chapter, record in chapters.items()} == {
+        1: ("success", "one"), 2: ("success", "two"), 3: ("partial", "thr")}
+    assert chapters[3]["extractor"] == "dom"
+
+
+def test_load_without_content_keeps_only_whether_there_was_some(path):
+    journal = ScrapeJournal(path, JOB_INFO)
+    journal.record_chapter(1, "success", "Chapter 1", "one")
+    journal.record_chapter(2, "failed", "Chapter 2")
+    journal.close()
+    chapters = load_journal(path, include_content=False)[1]
+    assert "content" not in chapters[1]
+    assert chapters[1]["has_content"] and not chapters[2]["has_content"]
+
+
+def test_missing_journal_loads_empty(path):
+    assert load_journal(path) == (None, {})
+
+
+def test_read_chapter_returns_the_best_record_with_content(path):
+    journal = ScrapeJournal(path, JOB_INFO)
+    journal.record_chapter(1, "partial", "Chapter 1", "on")
+    journal.record_chapter(1, "success", "Chapter 1", "one")
+    journal.record_chapter(1, "failed", "Chapter 1")
+    assert journal.read_chapter(1) == ("Chapter 1", "one")
+    assert journal.read_chapter(2) is None
+    journal.close()
+
+
+def test_resume_skips_a_torn_line_and_indexes_earlier_records(path):
+    journal = ScrapeJournal(path, JOB_INFO)
+    journal.record_chapter(1, "success", "Chapter 1", "one")
+    journal.close()
+    with open(path, 'ab') as f:
+        f.write(b'{"type": "chapter", "chapter": 2, "sta') # Crashed in the middle of a write
+
+    journal = ScrapeJournal(path, JOB_INFO, resume=True)
+    assert journal.read_chapter(1) == ("Chapter 1", "one")
+    journal.record_chapter(2, "success", "Chapter 2", "two")
+    journal.close()
+    job_info, chapters = load_journal(path)
+    assert job_info["end_chapter"] == 5 # Resuming keeps the original job record
+    assert sorted(chapters) == [1, 2] and chapters[2]["content"] == "two"
+
+
+def test_starting_over_truncates_the_journal(path):
+    journal = ScrapeJournal(path, JOB_INFO)
+    journal.record_chapter(1, "success", "Chapter 1", "one")
+    journal.close()
+    ScrapeJournal(path, JOB_INFO).close()
+    assert load_journal(path)[1] == {}
+
+
+# --- Resuming a job in the engine ---
+
+@pytest.fixture
+def fixture_site():
+    """Every 4th chapter has two pages and every 5th is rendered client-side, which needs a browser."""
+    site = FixtureSite(multipage_every=4, placeholder_every=5, ai_block_every=0, missing_body_every=0,
+                       latency_ms=0, jitter_ms=0)
+    server = make_server(site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield site, re.search(r"(.+/chapter-)\d+", chapter_url(server)).group(1)
+    server.shutdown()
+    server.server_close()
+
+
+def test_resumed_job_only_scrapes_the_chapters_left(fixture_site, tmp_path, monkeypatch):
+    site, base_url = fixture_site
+
+    def no_chrome(self):
+        raise WebDriverException("chromedriver not found")
+
+    monkeypatch.setattr(BrowserService, "acquire", no_chrome)
+    monkeypatch.setattr(ScrapeEngine, "_summary_file", lambda engine, suffix: str(tmp_path / f"run{suffix}"))
+    output_dir = tmp_path / "out"
+
+    def run(resume):
+        engine = ScrapeEngine(base_url, 1, 6, 10, "run", str(output_dir), 1, 0, set(), cache_size_mb=0, resume=resume)
+        engine.run()
+        return engine
+
+    first = run(resume=False)
+    assert sorted(first.failed_chapters) == [5] # Client-side only, and Chrome is not available
+
+    site.kinds = (("multipage", 4),) # Chapter 5 is now server-rendered
+    requests_before = site.requests
+    second = run(resume=True)
+    assert not second.failed_chapters and second.successful_chapters_count == 6
+    assert site.requests - requests_before == 1 # Only chapter 5 was fetched again
+    assert second.chapter_states.results()[3]["fetch_path"] == "journal" # Chapter 4, restored from the journal
+    text = (output_dir / "1-6.txt").read_text(encoding='utf-8')
+    assert all(f"The {chapter}th Trial" in text for chapter in range(1, 7))
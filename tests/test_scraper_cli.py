@@ -0,0 +1,51 @@
+import json
+import logging
+import signal
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import scraper_cli
+from browser_service import BrowserService
+from fixture_server import FixtureSite, chapter_url, make_server
+from scraper_engine import ScrapeEngine
+
+
+@pytest.fixture
+def fixture_site():
+    """The local fixture site with every 4th chapter multi-page and every 5th rendered client-side (browser only)."""
+    site = FixtureSite(multipage_every=4, placeholder_every=5, ai_block_every=0, missing_body_every=0,
+                       latency_ms=0, jitter_ms=0)
+    server = make_server(site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield site, chapter_url(server)
+    server.shutdown()
+    server.server_close()
+
+
+def test_cli_without_chromedriver_scrapes_server_rendered_chapters(fixture_site, tmp_path, monkeypatch, capsys):
+    site, url = fixture_site
+
+    def no_chrome(self):
+        raise WebDriverException("chromedriver not found")
+
+    monkeypatch.setattr(scraper_cli, "check_chromedriver", lambda: (False, "chromedriver"))
+    monkeypatch.setattr(BrowserService, "acquire", no_chrome)
+    monkeypatch.setattr(ScrapeEngine, "_summary_file", lambda engine, suffix: str(tmp_path / f"run{suffix}"))
+    monkeypatch.setattr(scraper_cli, "debug_logger", lambda: logging.getLogger("wtr_scraper.test"))
+    monkeypatch.setattr(signal, "signal", lambda signum, handler: None)
+
+    exit_code = scraper_cli.main(["--url", url, "--start", "1", "--end", "12", "--browsers", "2", "--delay", "0",
+                                  "--cache-mb", "0", "--output-dir", str(tmp_path / "out"), "--prefix", "run", "--quiet"])
+
+    assert exit_code == 1 # The client-side chapters fail, but the run is not aborted
+    assert "will be recorded as failed" in capsys.readouterr().err
+    with open(tmp_path / "run_summary.json", encoding='utf-8') as f:
+        summary = json.load(f)
+    results = {record["chapter"]: record for record in summary["results"]}
+    server_rendered = [chapter for chapter in range(1, 13) if site.kind(chapter) != "placeholder"]
+    assert sorted(chapter for chapter, record in results.items() if record["status"] == "success") == server_rendered
+    assert sorted(chapter for chapter, record in results.items() if record["status"] == "failed") == [5, 10]
+    assert {results[chapter]["failure"] for chapter in (5, 10)} == {"browser_unavailable"}
+    assert (tmp_path / "out" / "1-10.txt").exists() and (tmp_path / "out" / "11-12.txt").exists()
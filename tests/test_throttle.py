@@ -0,0 +1,65 @@
+import pytest
+
+from retry_policy import MISSING_BODY, TIMEOUT
+from throttle import MIN_INTERVAL, RATE_DECREASE, RATE_INCREASE, SERVER_BUSY, AdaptiveThrottle, HostThrottle
+
+URL = "https://wtr-lab.com/en/serie-1/novel/chapter-1"
+HOST = "wtr-lab.com"
+
+
+def test_clean_pages_raise_the_rate_additively_down_to_the_floor():
+    throttle = AdaptiveThrottle(initial_interval=4.0, min_interval=1.0, max_interval=15.0)
+    throttle.record(URL, 0.5)
+    assert throttle.interval(HOST) == pytest.approx(1 / (1 / 4.0 + RATE_INCREASE))
+    for _ in range(200):
+        throttle.record(URL, 0.5)
+    assert throttle.interval(HOST) == 1.0
+    assert throttle.changes["speedups"] == 201
+
+
+@pytest.mark.parametrize("failure", [TIMEOUT, SERVER_BUSY])
+def test_struggling_site_halves_the_rate_up_to_the_ceiling(failure):
+    throttle = AdaptiveThrottle(initial_interval=4.0, min_interval=1.0, max_interval=15.0)
+    throttle.record(URL, 20.0, failure)
+    assert throttle.interval(HOST) == pytest.approx(4.0 / RATE_DECREASE)
+    for _ in range(5):
+        throttle.record(URL, 20.0, failure)
+    assert throttle.interval(HOST) == 15.0
+    assert throttle.changes["backoffs"] == 6
+
+
+def test_slow_page_holds_the_rate():
+    throttle = AdaptiveThrottle(initial_interval=4.0, min_interval=1.0, max_interval=15.0)
+    throttle.record(URL, 1.0)
+    interval = throttle.interval(HOST)
+    throttle.record(URL, 10.0) # Far slower than the host's usual second
+    assert throttle.interval(HOST) == interval
+    assert throttle.changes["holds"] == 1
+
+
+def test_failures_unrelated_to_load_leave_the_rate_alone():
+    throttle = AdaptiveThrottle(initial_interval=4.0)
+    throttle.record(URL, 1.0, MISSING_BODY)
+    assert throttle.interval(HOST) == 4.0
+    assert throttle.changes == {"speedups": 0, "backoffs": 0, "holds": 0}
+
+
+def test_hosts_are_steered_separately():
+    throttle = AdaptiveThrottle(initial_interval=4.0, min_interval=1.0, max_interval=15.0)
+    throttle.record(URL, 1.0, TIMEOUT)
+    assert throttle.interval(HOST) == 8.0
+    assert throttle.interval("example.com") == 4.0
+
+
+def test_bounds_are_sanitised():
+    throttle = AdaptiveThrottle(initial_interval=100.0, min_interval=0.0, max_interval=0.0)
+    assert throttle.floor == MIN_INTERVAL
+    assert throttle.ceiling == MIN_INTERVAL
+    assert throttle.interval(HOST) == MIN_INTERVAL
+
+
+def test_fixed_delay_ignores_outcomes():
+    throttle = HostThrottle(2.0)
+    throttle.record(URL, 30.0, TIMEOUT)
+    assert throttle.interval(HOST) == 2.0
+    assert throttle.summary()["mode"] == "fixed"
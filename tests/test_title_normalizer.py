@@ -0,0 +1,48 @@
+import pytest
+
+from scraper_engine import ScrapeEngine
+from title_normalizer import TitleNormalizer, parse_title_patterns
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("#12 The Gates", "The Gates"),
+    ("Chapter 12: The Gates", "The Gates"),
+    ("Chapter 12 - 12 - The Gates", "The Gates"),
+    ("21 The Gates", "The Gates"),
+    ("The Gates", "The Gates"),
+])
+def test_default_prefixes(title, expected):
+    assert TitleNormalizer().normalize(title) == expected
+
+
+def test_inline_flag_pattern_is_applied_on_its_own():
+    normalizer = TitleNormalizer([r'(?i)^ep\.?\s*\d+\s*\|\s*'])
+    assert normalizer._any_prefix is None # '(?i)' is only allowed at the start of the whole expression
+    assert normalizer.normalize("EP. 12 | The Gates") == "The Gates"
+    assert normalizer.normalize("Chapter 3: The Gates") == "The Gates"
+    assert normalizer.normalize("The Gates") == "The Gates"
+
+
+def test_backreferences_keep_their_own_groups():
+    normalizer = TitleNormalizer([r'^(\w+)-\1\s+', r'^(\d+)\.(\d+)\s+'])
+    assert normalizer.normalize("Vol-Vol The Gates") == "The Gates"
+    assert normalizer.normalize("Vol-Book The Gates") == "Vol-Book The Gates"
+    assert normalizer.normalize("1.2 The Gates") == "The Gates"
+
+
+def test_plain_patterns_are_merged():
+    normalizer = TitleNormalizer([r'^Ep\.?\s*\d+\s*\|\s*'])
+    assert normalizer._any_prefix is not None
+    assert normalizer.normalize("ep 12 | The Gates") == "The Gates"
+
+
+def test_invalid_patterns_are_reported():
+    patterns, errors = parse_title_patterns("(?i)^ep\\d+\n\n(unclosed\n")
+    assert patterns == ["(?i)^ep\\d+"]
+    assert len(errors) == 1 and errors[0].startswith("'(unclosed'")
+
+
+def test_engine_accepts_an_inline_flag_pattern(tmp_path):
+    engine = ScrapeEngine("https://example.com/chapter-{}", 1, 2, 10, "novel", str(tmp_path), 1, 0, [],
+                          title_patterns="(?i)^ep\\d+\\s*")
+    assert engine.title_normalizer.normalize("EP12 The Gates") == "The Gates"
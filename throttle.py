@@ -0,0 +1,132 @@
+"""
+Politeness delay between page loads to the same host, fixed or adaptive.
+
+HostThrottle keeps the job's delay between any two page loads to a host.
+AdaptiveThrottle instead steers the delay by how the site responds, AIMD-style
+like TCP congestion control: every fast, clean page raises the request rate a
+little (additive increase), down to the minimum delay, and every timeout, empty
+chapter container, block page or "server busy" response halves it
+(multiplicative decrease), up to the maximum delay. A page much slower than the
+host's usual load time holds the rate where it is, so a struggling site is not
+pushed harder before it starts failing. A quiet site is read quickly while a
+busy one is backed off without the user tuning the delay by hand.
+
+Both throttles count the page loads they let through, for the live request-rate
+readout.
+"""
+import threading
+import time
+from urllib.parse import urlparse
+
+from retry_policy import AI_BLOCK, EMPTY_BODY, TIMEOUT
+
+DEFAULT_MIN_DELAY = 1.0 # Adaptive delay floor in seconds
+DEFAULT_MAX_DELAY = 15.0 # Adaptive delay ceiling in seconds
+MIN_INTERVAL = 0.1 # Lowest floor accepted: the adaptive delay works in requests per second
+RATE_INCREASE = 0.05 # Requests per second added after each fast, clean page
+RATE_DECREASE = 0.5 # Rate multiplier after a page that shows the site struggling
+SLOW_FACTOR = 2.0 # A page this many times slower than the host's usual load time holds the rate
+LATENCY_SMOOTHING = 0.2 # Weight of the newest page in the host's usual load time
+RATE_WINDOW_SECONDS = 60.0 # Page loads counted by the request-rate readout
+
+SERVER_BUSY = "server_busy" # HTTP 429 or 5xx response on the plain-HTTP path
+BACKOFF_FAILURES = frozenset((TIMEOUT, EMPTY_BODY, AI_BLOCK, SERVER_BUSY)) # Other failures say nothing about server load
+
+
+class RateMeter:
+    """Counts page loads over the last minute."""
+
+    def __init__(self, window=RATE_WINDOW_SECONDS):
+        self.window = window
+        self._times = [] # Monotonic times of the page loads (reserved slots, so some may lie ahead)
+        self._lock = threading.Lock()
+
+    def add(self, when):
+        with self._lock:
+            self._times.append(when)
+
+    def per_minute(self):
+        """Page loads per minute: the gaps between the loads of the window, up to now, so the rate falls when loads stop."""
+        now = time.monotonic()
+        with self._lock:
+            self._times = [t for t in self._times if t > now - self.window]
+            started = [t for t in self._times if t <= now] # Slots reserved for later have not happened yet
+        if len(started) < 2:
+            return 0.0
+        return (len(started) - 1) * 60.0 / max(now - min(started), 1.0)
+
+
+class HostThrottle:
+    """Spaces out page loads to the same host, shared by every browser in the pool."""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._next_allowed = {} # {host: earliest monotonic time for the next request}
+        self._lock = threading.Lock()
+        self.rate_meter = RateMeter()
+
+    def interval(self, host):
+        """Seconds between page loads to host."""
+        return self.min_interval
+
+    def wait(self, url, should_continue=lambda: True):
+        """Reserves the next free slot for the url's host and sleeps until it arrives."""
+        host = urlparse(url).netloc
+        with self._lock:
+            slot_time = max(time.monotonic(), self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = slot_time + self.interval(host)
+        self.rate_meter.add(slot_time)
+        # Sleep in short steps so a stop request is not delayed by a long politeness wait
+        while should_continue():
+            remaining = slot_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 0.25))
+
+    def record(self, url, seconds, failure=None):
+        """Reports how a page load went: its seconds and failure class (None when clean). A fixed delay ignores it."""
+
+    def summary(self):
+        return {"mode": "fixed", "delay_seconds": self.min_interval, "pages_per_minute": round(self.rate_meter.per_minute(), 1)}
+
+
+class AdaptiveThrottle(HostThrottle):
+    """HostThrottle whose per-host delay follows the site's load times and failures, between a floor and a ceiling."""
+
+    def __init__(self, initial_interval, min_interval=DEFAULT_MIN_DELAY, max_interval=DEFAULT_MAX_DELAY):
+        self.floor = max(min_interval, MIN_INTERVAL)
+        self.ceiling = max(max_interval, self.floor)
+        super().__init__(min(self.ceiling, max(self.floor, initial_interval))) # Delay of a host not seen yet
+        self._intervals = {} # {host: current delay in seconds}
+        self._latency = {} # {host: smoothed seconds per clean page}
+        self.changes = {"speedups": 0, "backoffs": 0, "holds": 0}
+
+    def interval(self, host):
+        return self._intervals.get(host, self.min_interval)
+
+    def record(self, url, seconds, failure=None):
+        host = urlparse(url).netloc
+        with self._lock:
+            interval = self.interval(host)
+            if failure in BACKOFF_FAILURES:
+                interval = min(self.ceiling, interval / RATE_DECREASE)
+                self.changes["backoffs"] += 1
+            elif failure is None:
+                usual = self._latency.get(host)
+                if usual is not None and seconds > usual * SLOW_FACTOR:
+                    self.changes["holds"] += 1
+                else:
+                    interval = max(self.floor, 1 / (1 / interval + RATE_INCREASE))
+                    self.changes["speedups"] += 1
+                self._latency[host] = seconds if usual is None else usual + LATENCY_SMOOTHING * (seconds - usual)
+            else:
+                return
+            self._intervals[host] = interval
+
+    def summary(self):
+        with self._lock:
+            delays = {host: round(interval, 2) for host, interval in self._intervals.items()}
+            usual = {host: round(seconds, 3) for host, seconds in self._latency.items()}
+        return {"mode": "adaptive", "min_delay_seconds": self.floor, "max_delay_seconds": self.ceiling,
+                "delay_seconds": delays, "usual_page_seconds": usual, **self.changes,
+                "pages_per_minute": round(self.rate_meter.per_minute(), 1)}
@@ -0,0 +1,140 @@
+"""
+Chapter title normalisation: strips numbering prefixes such as '#12', 'Chapter 12:'
+or '12 - ' so titles and candidate title lines can be compared.
+
+The prefix patterns are compiled once and also merged into one alternation that
+is checked first: most inputs (body lines tested by the duplicate-title check)
+carry no prefix at all and are returned after that single search. Patterns that
+cannot be merged without changing their meaning (capturing groups, whose
+backreferences would be renumbered, or inline flags such as '(?i)') are checked
+one by one instead. Results are kept in a bounded LRU memo, since the same title
+is normalised again for every page and candidate line of a chapter. Extra
+patterns can be added per series (profile), e.g. for a novel that numbers its
+chapters 'Ep. 12 |'.
+
+TitleMatcher decides whether a line of chapter text repeats the title, with
+RapidFuzz's token_set_ratio and a token/length bound that skips the scorer for
+lines that cannot reach the threshold.
+"""
+import functools
+import re
+
+from rapidfuzz import fuzz
+from rapidfuzz.utils import default_process
+
+# Applied in this order, repeatedly, until a full pass changes nothing
+DEFAULT_TITLE_PATTERNS = (
+    r'^#\s*\d+\s*',                 # Matches #123 at the start
+    r'^Chapter\s*\d+\s*[:\-–—]\s*', # Matches Chapter 123: or Chapter 123 -
+    r'^\d+\s*[:\-–—]\s*',           # Matches 123 -
+    r'^Chapter\s*\d+\s+',           # Matches Chapter 123 followed by space
+    r'^\d+\s+',                     # Matches 123 followed by space (e.g., "21 Title")
+)
+
+
+def parse_title_patterns(patterns_text):
+    """
+    Splits user title patterns (one regular expression per line) into valid patterns and error messages.
+    Returns (patterns, errors).
+    """
+    patterns, errors = [], []
+    for line in (patterns_text or "").split('\n'):
+        pattern = line.strip()
+        if not pattern:
+            continue
+        try:
+            re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            errors.append(f"'{pattern}': {e}")
+            continue
+        patterns.append(pattern)
+    return patterns, errors
+
+
+def _merge_patterns(compiled):
+    """One alternation of the compiled patterns, or None when merging them would not mean the same thing."""
+    if any(pattern.groups for pattern in compiled):
+        return None # Numbered groups and backreferences would be renumbered across the alternation
+    try:
+        return re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in compiled), re.IGNORECASE)
+    except re.error:
+        return None # E.g. an inline global flag, which is only allowed at the start of the whole expression
+
+
+class TitleNormalizer:
+    """Removes numbering prefixes from titles with precompiled patterns and a memo of recent results."""
+
+    def __init__(self, extra_patterns=(), cache_size=4096):
+        self.patterns = tuple(DEFAULT_TITLE_PATTERNS) + tuple(extra_patterns) # Series-specific patterns run after the defaults
+        self._compiled = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+        # One search tells whether any pattern can change the string at all
+        self._any_prefix = _merge_patterns(self._compiled)
+        self._cached_normalize = functools.lru_cache(maxsize=cache_size)(self._normalize)
+
+    def _normalize(self, title_str):
+        cleaned = title_str.strip()
+        if self._any_prefix is not None:
+            if not self._any_prefix.search(cleaned):
+                return cleaned
+        elif not any(pattern.search(cleaned) for pattern in self._compiled):
+            return cleaned
+        # Loop until no pattern makes a change in a full pass
+        while True:
+            previous_cleaned = cleaned
+            for pattern in self._compiled:
+                # Apply each pattern once per outer loop iteration
+                cleaned = pattern.sub('', cleaned, count=1).strip()
+            if cleaned == previous_cleaned:
+                return cleaned
+
+    def normalize(self, title_str):
+        """Returns the title without its numbering prefixes ("" for an empty or missing title)."""
+        if not title_str:
+            return ""
+        return self._cached_normalize(title_str)
+
+    def cache_info(self):
+        """Hit/miss counters of the memo, as functools.lru_cache reports them."""
+        return self._cached_normalize.cache_info()
+
+
+DEFAULT_TITLE_MATCH_THRESHOLD = 85 # A line whose score rounds above this repeats the title
+_LATIN1_CHARS = {code: None for code in range(128, 256)} # Dropped before scoring, as thefuzz's force_ascii did
+
+
+def _process_for_match(text):
+    """Lowercases and keeps only letters, digits and single spaces (thefuzz's full_process)."""
+    return default_process(text if text.isascii() else text.translate(_LATIN1_CHARS))
+
+
+class TitleMatcher:
+    """
+    Scores lines against one chapter title. The title is processed once; a line that shares no
+    word with it can at best score 200 * min(len) / (len sum), so it is rejected without scoring
+    when even that bound is not above the threshold.
+    """
+
+    def __init__(self, title, threshold=DEFAULT_TITLE_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._title = _process_for_match(title)
+        self._title_tokens = frozenset(self._title.split())
+        self._title_length = sum(map(len, self._title_tokens)) + len(self._title_tokens) - 1
+        self.lines_prefiltered = 0 # Lines rejected without running the scorer
+        self.lines_scored = 0
+
+    def match(self, line):
+        """Returns the line's similarity score (0-100) if it repeats the title, else None."""
+        processed = _process_for_match(line)
+        tokens = set(processed.split())
+        if not tokens or not self._title_tokens:
+            self.lines_prefiltered += 1
+            return None
+        if tokens.isdisjoint(self._title_tokens):
+            line_length = sum(map(len, tokens)) + len(tokens) - 1
+            best_possible = 200 * min(line_length, self._title_length) / (line_length + self._title_length)
+            if round(best_possible) <= self.threshold:
+                self.lines_prefiltered += 1
+                return None
+        self.lines_scored += 1
+        score = round(fuzz.token_set_ratio(processed, self._title, score_cutoff=self.threshold))
+        return score if score > self.threshold else None